@@ -0,0 +1,130 @@
+"""
+Async Data Service - runs database calls on worker threads and hands results back to Tk
+"""
+
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL_MS = 30
+MAX_WORKERS = 4
+
+
+class AsyncDataService:
+    """Thread pool for blocking Mongo calls.
+
+    Callbacks always run on the Tk main thread: workers only push finished futures onto a queue,
+    which is drained with root.after. A request submitted with a key supersedes the previous
+    request with the same key - its result is dropped even if the query already ran.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._poll_root = None
+
+    def submit(self, widget, func, *args, on_success=None, on_error=None, key=None, busy=False, **kwargs):
+        """Run func(*args, **kwargs) on a worker; call on_success(result) / on_error(exc) on the UI thread
+
+        widget anchors the callback - if it has been destroyed by then, the result is dropped.
+        busy shows the wait cursor on widget's window until the result is in (e.g. while the first call connects).
+        """
+        # Runs in a copy of the caller's context, so the worker's queries carry the caller's view tag
+        future = self._executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = future
+            if previous is not None:
+                previous.cancel()
+
+        window = None
+        if busy:
+            window = widget.winfo_toplevel()
+            window.configure(cursor="watch")
+        self._track(future, widget, on_success, on_error, key, window)
+        return future
+
+    def watch(self, widget, future, on_success=None, on_error=None):
+        """Deliver the result of a future started elsewhere (e.g. a process pool) the same way as submit()"""
+        self._track(future, widget, on_success, on_error, None)
+        return future
+
+    def _track(self, future, widget, on_success, on_error, key, busy_window=None):
+        self._pending += 1
+        future.add_done_callback(
+            lambda f: self._results.put((f, widget, on_success, on_error, key, busy_window))
+        )
+        self._schedule_poll(widget.winfo_toplevel())
+
+    def cancel(self, key):
+        """Cancel the outstanding request for key, if any"""
+        with self._lock:
+            future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def _is_current(self, key, future):
+        if key is None:
+            return True
+        with self._lock:
+            if self._latest.get(key) is not future:
+                return False
+            del self._latest[key]
+            return True
+
+    def _schedule_poll(self, root):
+        if self._poll_root is None:
+            self._poll_root = root
+            root.after(POLL_INTERVAL_MS, self._drain)
+
+    def _drain(self):
+        root, self._poll_root = self._poll_root, None
+        while True:
+            try:
+                future, widget, on_success, on_error, key, busy_window = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if busy_window is not None:
+                try:
+                    busy_window.configure(cursor="")
+                except Exception:
+                    pass  # Window closed
+
+            if future.cancelled() or not self._is_current(key, future):
+                continue
+            try:
+                if not widget.winfo_exists():
+                    continue
+            except Exception:
+                continue  # Widget's interpreter is gone
+
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"❌ Background query failed: {error}")
+                elif on_success:
+                    on_success(future.result())
+            except Exception as e:
+                print(f"❌ Error in UI callback: {e}")
+
+        if self._pending > 0:
+            try:
+                self._schedule_poll(root)
+            except Exception:
+                pass  # Window closed
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Create global async data service instance
+async_db = AsyncDataService()
@@ -0,0 +1,519 @@
+"""
+Benchmarks - times the app's hot paths on synthetic data in mongomock or a local mongod
+
+Usage:
+    python benchmarks.py [--backend mongomock|mongod] [--uri URI] [--size 10k|100k]
+                         [--repeat N] [--only NAME] [--output FILE]
+    python benchmarks.py --compare BASELINE.json RESULTS.json [--threshold PCT]
+
+Results are written as JSON (timings in seconds) to benchmark_results/ so runs from two versions
+can be compared.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from database_config import db_manager, DATABASE_NAME
+from package_utils import parse_package_lpa
+from search_utils import SEARCH_FIELDS, with_search_tokens
+from schema_migrations import SCHEMA_VERSION_FIELD, SCHEMA_VERSIONS
+from student_refs import STUDENT_ID_FIELD
+from local_store import UPDATED_AT_FIELD
+
+BENCHMARK_DB_NAME = "tp_benchmark"
+BENCHMARK_LETTERS_DB_NAME = "tp_benchmark_letters"
+INSERT_BATCH_SIZE = 5000
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 10  # Percent slower than the baseline before --compare flags a benchmark
+# Default --output location, beside this file and ignored by git
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+# Dataset sizes; pdfs are stored once per storage mode and linked to the first placements
+DATASETS = {
+    "10k": {"students": 10000, "companies": 2000, "placements": 50000, "pdfs": 100},
+    "100k": {"students": 100000, "companies": 2000, "placements": 50000, "pdfs": 200},
+}
+
+BRANCHES = ["CSE", "ECE", "EEE", "MECH", "CIVIL", "IT", "AIML", "CHEM"]
+SECTORS = ["IT", "CORE", "FINANCE", "CONSULTING", "PRODUCT", "ANALYTICS", "MANUFACTURING"]
+POSITIONS = ["SOFTWARE ENGINEER", "ANALYST", "GRADUATE ENGINEER TRAINEE", "DATA ENGINEER",
+             "ASSOCIATE CONSULTANT", "DESIGN ENGINEER", "QA ENGINEER"]
+FIRST_NAMES = ["AARAV", "ADITI", "ANIL", "ANJALI", "ARJUN", "DIVYA", "KIRAN", "LAKSHMI", "MANOJ",
+               "MEERA", "NIKHIL", "PRIYA", "RAHUL", "RAVI", "SAI", "SNEHA", "SURESH", "SWATHI",
+               "VARUN", "VIJAY"]
+LAST_NAMES = ["KUMAR", "REDDY", "SHARMA", "RAO", "NAIDU", "VARMA", "IYER", "PATEL", "GUPTA",
+              "SINGH", "MENON", "CHOWDARY"]
+COMPANY_WORDS = ["TECH", "SOLUTIONS", "SYSTEMS", "LABS", "SOFTWARE", "DIGITAL", "INFRA", "DATA",
+                 "NETWORKS", "ENERGY", "MOTORS", "ANALYTICS", "CLOUD", "GLOBAL", "BIO"]
+PDF_SIZES = {"inline": 60 * 1024, "gridfs": 400 * 1024}  # gridfs letters span two chunks
+SEARCH_FILTERS = {"student_name": "", "company_name": "TECH", "student_branch": "CSE", "hr_name": ""}
+SEARCH_PACKAGE = "10"
+
+
+class Skipped(Exception):
+    """Raised by a benchmark that cannot run here (no display, missing library)"""
+
+
+def _summary(runs, rows=None):
+    result = {
+        "runs": [round(run, 6) for run in runs],
+        "min": round(min(runs), 6),
+        "median": round(statistics.median(runs), 6),
+        "max": round(max(runs), 6),
+    }
+    if rows is not None:
+        result["rows"] = rows
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ---- backends ----
+
+def open_backend(backend, uri):
+    """Bind db_manager to a fresh benchmark database and return the client"""
+    if backend == "mongomock":
+        import mongomock
+        from mongomock.gridfs import enable_gridfs_integration
+        enable_gridfs_integration()
+        client = mongomock.MongoClient()
+    else:
+        from pymongo import MongoClient
+        client = MongoClient(uri, serverSelectionTimeoutMS=5000)
+        client.admin.command("ping")
+
+    if DATABASE_NAME in (BENCHMARK_DB_NAME, BENCHMARK_LETTERS_DB_NAME):
+        raise ValueError("Benchmark database names must differ from the application database")
+    client.drop_database(BENCHMARK_DB_NAME)
+    client.drop_database(BENCHMARK_LETTERS_DB_NAME)
+    db_manager.use_client(client, BENCHMARK_DB_NAME, BENCHMARK_LETTERS_DB_NAME)
+    if backend == "mongod":
+        # mongomock never uses indexes for reads and checks unique ones by scanning - skip them there
+        db_manager.ensure_indexes()
+    return client
+
+
+# ---- synthetic data ----
+
+class DatasetBuilder:
+    """Realistic documents, written the way the forms write them (normalized, tokenized, versioned)"""
+
+    def __init__(self, seed=42):
+        self.random = random.Random(seed)
+        self.now = datetime.datetime.now()
+
+    def _stamp(self, collection_name, doc):
+        doc[SCHEMA_VERSION_FIELD] = SCHEMA_VERSIONS[collection_name]
+        doc[UPDATED_AT_FIELD] = self.now
+        if collection_name in SEARCH_FIELDS:
+            with_search_tokens(collection_name, doc)
+        return doc
+
+    def _phone(self):
+        return str(self.random.randint(6000000000, 9999999999))
+
+    def students(self, count):
+        used = set()
+        for index in range(count):
+            name = f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+            if name in used:
+                name = f"{name} {index}"  # Placements are unique on student name + company
+            used.add(name)
+            branch = self.random.choice(BRANCHES)
+            yield self._stamp("student", {
+                "name": name,
+                "branch": branch,
+                "admission_year": self.random.randint(2016, 2024),
+                "email": f"{name.lower().replace(' ', '.')}{index}@college.edu",
+                "contact_info": self._phone(),
+            })
+
+    def companies(self, count):
+        for index in range(count):
+            name = f"{self.random.choice(COMPANY_WORDS)} {self.random.choice(COMPANY_WORDS)} {index}"
+            lpa = round(self.random.uniform(5, 30), 1)
+            yield self._stamp("company", {
+                "company_name": name,
+                "email": f"hr{index}@{name.split()[0].lower()}{index}.com",
+                "contact_info": self._phone(),
+                "hr_name": f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}",
+                "sector": self.random.choice(SECTORS),
+                "package": f"{lpa} LPA",
+                "package_lpa": lpa,
+                "website": f"https://{name.split()[0].lower()}{index}.com",
+                "address": "HYDERABAD",
+            })
+
+    def placements(self, count, students, companies):
+        """count placements, at most one per student and company"""
+        used = set()
+        while len(used) < count:
+            student = self.random.choice(students)
+            company = self.random.choice(companies)
+            if (student["_id"], company["_id"]) in used:
+                continue
+            used.add((student["_id"], company["_id"]))
+            year = student["admission_year"]
+            package = company["package"]
+            yield self._stamp("placed_student", {
+                "student_name": student["name"],
+                "student_branch": student["branch"],
+                STUDENT_ID_FIELD: student["_id"],
+                "batch": f"{year}-{year + 4}",
+                "company_name": company["company_name"],
+                "position": self.random.choice(POSITIONS),
+                "year_of_placement": str(year + 4),
+                "package": package,
+                "package_lpa": parse_package_lpa(package),
+                "hr_name": company["hr_name"],
+                "contact_info": student["contact_info"],
+                "email": student["email"],
+                "address": "HYDERABAD",
+                "placement_suggestion": "PRACTICE APTITUDE AND DSA",
+                "company_levels": "3",
+                "skills_required": "PYTHON, SQL",
+                "important_suggestions": "CARRY ID CARD",
+                "has_offer_letter": False,
+                "created_date": self.now,
+            })
+
+    def pdf_file(self, directory, index, size):
+        """A PDF-shaped file of about size bytes with unique content"""
+        path = os.path.join(directory, f"offer_{index}.pdf")
+        body = self.random.randbytes(size) if hasattr(self.random, "randbytes") else os.urandom(size)
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4\n" + body + b"\n%%EOF\n")
+        return path
+
+
+def _load_all_rows(table):
+    """Read every remaining page of a VirtualTable in place - blocks, so benchmarks only"""
+    if table._loading and table._inflight is not None:
+        # Take over the page already being read so no rows are skipped
+        page = table._inflight.result()
+        table._generation += 1
+        table._loading = False
+        if page:
+            table.docs.extend(page)
+        else:
+            table.exhausted = True
+    while not table.exhausted:
+        page = table._fetch_page(table._next_page)
+        if not page:
+            table.exhausted = True
+        table.docs.extend(page)
+    table.refresh()
+    return table.docs
+
+
+def _insert_all(collection, docs):
+    """insert_many in unordered batches; returns the inserted documents (with _id)"""
+    inserted, batch = [], []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            collection.insert_many(batch, ordered=False)
+            inserted.extend(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        inserted.extend(batch)
+    return inserted
+
+
+# ---- the harness ----
+
+class BenchmarkRunner:
+    def __init__(self, dataset, repeat=DEFAULT_REPEAT, only=None, workdir=None):
+        self.dataset = dataset
+        self.repeat = repeat
+        self.only = only
+        self.workdir = workdir or tempfile.mkdtemp(prefix="tp_benchmark_")
+        self.results = {}
+        self.pdf_keys = {}  # storage mode -> stored keys
+        self._placed_manager = None
+
+    def record(self, name, func, repeat=None):
+        """Time func() repeat times; its return value is recorded as the row count"""
+        if self.only and not any(part in name for part in self.only):
+            return
+        runs, rows = [], None
+        try:
+            for _ in range(repeat or self.repeat):
+                start = time.perf_counter()
+                rows = func()
+                runs.append(time.perf_counter() - start)
+            self.results[name] = _summary(runs, rows)
+            print(f"✅ {name}: median {self.results[name]['median']:.4f}s")
+        except Skipped as e:
+            self.results[name] = {"skipped": str(e)}
+            print(f"⚠️ {name}: skipped ({e})")
+        except Exception as e:
+            self.results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"❌ {name}: {e}")
+
+    @property
+    def placed_manager(self):
+        if self._placed_manager is None:
+            from placed_student import PlacedStudentManager
+            self._placed_manager = PlacedStudentManager()
+        return self._placed_manager
+
+    # ---- load ----
+
+    def load(self):
+        builder = DatasetBuilder()
+        timings = {}
+
+        start = time.perf_counter()
+        students = _insert_all(db_manager.get_collection("student"), builder.students(self.dataset["students"]))
+        timings["load_students"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        companies = _insert_all(db_manager.get_collection("company"),
+                                builder.companies(self.dataset["companies"]))
+        timings["load_companies"] = time.perf_counter() - start
+
+        placements = list(builder.placements(self.dataset["placements"], students, companies))
+        self.load_pdfs(builder, placements[:self.dataset["pdfs"] * 2])
+
+        start = time.perf_counter()
+        _insert_all(db_manager.get_collection("placed_student"), placements)
+        timings["load_placements"] = time.perf_counter() - start
+
+        for name, seconds in timings.items():
+            self.results[name] = _summary([seconds], self.dataset[name.split("_", 1)[1]])
+            print(f"✅ {name}: {seconds:.2f}s")
+
+    def load_pdfs(self, builder, placements):
+        """Store one letter per placement through PDFManager.store_pdf, half inline and half GridFS"""
+        from pdf_manager import PDFManager
+
+        pdf_dir = os.path.join(self.workdir, "pdfs")
+        os.makedirs(pdf_dir, exist_ok=True)
+        for offset, mode in enumerate(("inline", "gridfs")):
+            name = f"pdf_store_{mode}"
+            manager = PDFManager(storage_mode=mode)
+            keys, runs = [], []
+            self.pdf_keys[mode] = keys
+            try:
+                for index, placed in enumerate(placements[offset::2]):
+                    path = builder.pdf_file(pdf_dir, f"{mode}_{index}", PDF_SIZES[mode])
+                    start = time.perf_counter()
+                    key = manager.store_pdf(path, placed["student_name"], placed["company_name"],
+                                            raise_errors=True)
+                    runs.append(time.perf_counter() - start)
+                    placed["offer_letter_pdf_key"] = str(key)
+                    placed["has_offer_letter"] = True
+                    keys.append(str(key))
+                    os.remove(path)
+            except Exception as e:
+                # e.g. mongomock's GridFS does not support every pymongo release
+                self.results[name] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"❌ {name}: {e}")
+                continue
+            if runs:
+                self.results[name] = _summary(runs, len(runs))
+                print(f"✅ {name}: median {self.results[name]['median']:.4f}s per letter")
+
+    # ---- benchmarks ----
+
+    def run(self):
+        self.load()
+        self.record("stats_rebuild", self.stats_rebuild)
+        self.record("dashboard_students_vs_placed", self.dashboard_students_vs_placed)
+        self.record("dashboard_package_distribution", self.dashboard_package_distribution)
+        self.record("placed_search_first_page", self.placed_search_first_page)
+        self.record("placed_table_population", self.placed_table_population, repeat=1)
+        self.record("excel_export_placements", self.excel_export_placements, repeat=1)
+        self.record("csv_export_placements", self.csv_export_placements, repeat=1)
+        for mode in ("inline", "gridfs"):
+            self.record(f"pdf_view_{mode}_cold", lambda mode=mode: self.pdf_view(mode, cold=True))
+            self.record(f"pdf_view_{mode}_cached", lambda mode=mode: self.pdf_view(mode, cold=False))
+        return self.results
+
+    def stats_rebuild(self):
+        from stats_counters import stats_counters
+        summary = stats_counters.rebuild()
+        return summary["placement_total"] if summary else 0
+
+    def dashboard_students_vs_placed(self):
+        from main import TP_Manager
+        from dashboard_stats import dashboard_stats
+        branches, _, _ = TP_Manager.get_students_vs_placed_by_branch(None, dashboard_stats.compute())
+        return len(branches)
+
+    def dashboard_package_distribution(self):
+        from main import TP_Manager
+        from dashboard_stats import dashboard_stats
+        buckets, _, _ = TP_Manager.get_package_distribution(None, dashboard_stats.compute())
+        return len(buckets)
+
+    def _search_pager(self, page_size):
+        from pagination import KeysetPager
+        from placed_student import PLACED_SEARCH_PROJECTION
+        query = self.placed_manager.placed_search_query(SEARCH_FILTERS, SEARCH_PACKAGE)
+        return KeysetPager(self.placed_manager.collection, query, PLACED_SEARCH_PROJECTION, page_size=page_size)
+
+    def placed_search_first_page(self):
+        """Advanced search: query construction plus the first keyset page, offer letters marked"""
+        from virtual_table import PAGE_SIZE
+        pager = self._search_pager(PAGE_SIZE)
+        return len(self.placed_manager.mark_offer_letters(pager.next_page()))
+
+    def placed_table_population(self):
+        """create_professional_placed_table with every search result loaded (needs a display)"""
+        import tkinter
+        import customtkinter as ctk
+        from virtual_table import PAGE_SIZE, pager_source
+
+        try:
+            root = ctk.CTk()
+        except tkinter.TclError as e:
+            raise Skipped(f"no display: {e}")
+        root.withdraw()
+        manager = self.placed_manager
+        try:
+            manager.placed_results_frame = ctk.CTkFrame(root)
+
+            def placed_source(sort):
+                manager.placed_pager = self._search_pager(PAGE_SIZE)
+                return pager_source(manager.placed_pager, transform=manager.mark_offer_letters)
+
+            manager.create_professional_placed_table(placed_source, "benchmark")
+            rows = len(_load_all_rows(manager.placed_table))
+            root.update()
+            return rows
+        finally:
+            root.destroy()
+
+    def _export_rows(self):
+        from csv_export import query_cursor
+        from excel_export import column_projection
+        from placed_student import PLACED_EXPORT_COLUMNS
+        projection = column_projection(PLACED_EXPORT_COLUMNS, ("offer_letter_pdf_key",))
+        return PLACED_EXPORT_COLUMNS, query_cursor(self.placed_manager.collection, {}, projection,
+                                                   sort=[("_id", -1)])
+
+    def excel_export_placements(self):
+        from excel_export import ExportJob, write_table
+        columns, rows = self._export_rows()
+        result = write_table(os.path.join(self.workdir, "placements.xlsx"), "Placements", columns, rows,
+                             ExportJob(), prepare=self.placed_manager.mark_offer_letters)
+        return result["rows"]
+
+    def csv_export_placements(self):
+        from excel_export import ExportJob
+        from csv_export import write_csv
+        columns, rows = self._export_rows()
+        result = write_csv(os.path.join(self.workdir, "placements.csv"), columns, rows, ExportJob(),
+                           prepare=self.placed_manager.mark_offer_letters)
+        return result["rows"]
+
+    def pdf_view(self, mode, cold):
+        """PDFManager.view_pdf up to the point it hands the cached file to the system viewer"""
+        import pdf_manager as pdf_module
+        from pdf_cache import PDFCache
+
+        keys = self.pdf_keys.get(mode)
+        if not keys:
+            raise Skipped("no letters stored")
+        cache_dir = os.path.join(self.workdir, f"pdf_cache_{mode}")
+        if cold:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        pdf_module.pdf_cache = PDFCache(cache_dir=cache_dir)
+        manager = pdf_module.PDFManager(storage_mode=mode)
+        if not manager.connect():
+            raise ConnectionError("offer letters database unavailable")
+        for key in keys:
+            path, _, _ = manager._fetch_pdf_to_cache(key)
+            if not path:
+                raise LookupError(f"letter {key} not found")
+        return len(keys)
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Print median changes between two result files; returns the names that got slower"""
+    slower = []
+    print(f"{'benchmark':<34} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name, {})
+        if "median" not in result or "median" not in base:
+            continue
+        change = (result["median"] - base["median"]) / base["median"] * 100 if base["median"] else 0.0
+        flag = ""
+        if change > threshold:
+            slower.append(name)
+            flag = "  ⚠️ slower"
+        print(f"{name:<34} {base['median']:>10.4f} {result['median']:>10.4f} {change:>+7.1f}%{flag}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TP_Manager benchmarks")
+    parser.add_argument("--backend", choices=["mongomock", "mongod"], default="mongomock")
+    parser.add_argument("--uri", default="mongodb://localhost:27017", help="mongod URI (--backend mongod)")
+    parser.add_argument("--size", choices=sorted(DATASETS), default="10k")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--only", action="append", help="Run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--output",
+                        help="Results file (default benchmark_results/benchmark_<backend>_<size>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "RESULTS"),
+                        help="Compare two results files instead of running")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Percent slowdown flagged by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            current = json.load(f)
+        raise SystemExit(1 if compare(baseline, current, args.threshold) else 0)
+
+    dataset = DATASETS[args.size]
+    open_backend(args.backend, args.uri)
+    runner = BenchmarkRunner(dataset, args.repeat, args.only)
+    try:
+        results = runner.run()
+    finally:
+        from async_db import async_db
+        async_db.shutdown()
+        shutil.rmtree(runner.workdir, ignore_errors=True)
+
+    report = {
+        "revision": _git_revision(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "backend": args.backend,
+        "size": args.size,
+        "dataset": dataset,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"benchmark_{args.backend}_{args.size}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
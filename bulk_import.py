@@ -0,0 +1,357 @@
+"""
+Bulk Import - CSV/XLSX rows validated like the forms and upserted in unordered bulk_write batches
+
+Usage:
+    python bulk_import.py company FILE [--batch-size N]
+    python bulk_import.py placed_student FILE [--batch-size N]
+    python bulk_import.py student FILE [--batch-size N]
+"""
+
+import argparse
+import csv
+import datetime
+import os
+import re
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from database_config import db_manager
+from utils import validate_email, validate_phone
+from package_utils import parse_package_lpa
+from search_utils import with_search_tokens
+from schema_migrations import SCHEMA_VERSION_FIELD, SCHEMA_VERSIONS
+from student_refs import NAME_COLLATION, STUDENT_ID_FIELD, student_id_map, lookup_student_id
+from excel_export import ExportJob, iter_chunks
+from cache_sync import cache_sync
+from local_store import with_updated_at
+from stats_counters import COUNTERS, COUNTER_FIELDS, stats_counters
+
+IMPORT_BATCH_SIZE = 500
+
+# Per collection: field -> accepted column headers (compared lower-case, spaces as underscores).
+# The export headers are accepted, so an exported sheet can be edited and imported back.
+IMPORT_SPECS = {
+    "company": {
+        "columns": {
+            "company_name": ("company_name", "company"),
+            "email": ("email",),
+            "contact_info": ("contact_info", "contact", "contact_no", "phone"),
+            "hr_name": ("hr_name", "hr"),
+            "package": ("package",),
+            "website": ("website",),
+            "address": ("address",),
+        },
+        "required": ("company_name", "email", "contact_info", "hr_name", "package"),
+        "keep_case": ("email", "contact_info", "website"),
+        "key": ("company_name",),
+    },
+    "placed_student": {
+        "columns": {
+            "student_name": ("student_name", "student", "name"),
+            "student_branch": ("student_branch", "branch"),
+            "batch": ("batch",),
+            "company_name": ("company_name", "company"),
+            "position": ("position",),
+            "year_of_placement": ("year_of_placement", "year"),
+            "package": ("package",),
+            "email": ("email",),
+            "contact_info": ("contact_info", "contact", "phone"),
+            "hr_name": ("hr_name", "hr"),
+            "address": ("address",),
+            "placement_suggestion": ("placement_suggestion",),
+            "company_levels": ("company_levels",),
+            "skills_required": ("skills_required",),
+            "important_suggestions": ("important_suggestions", "important_notes"),
+        },
+        "required": ("student_name", "student_branch", "company_name", "email", "contact_info", "hr_name",
+                     "package", "year_of_placement", "position", "batch"),
+        "keep_case": ("email", "contact_info", "year_of_placement"),
+        "key": ("student_name", "company_name"),
+    },
+    "student": {
+        "columns": {
+            "name": ("name", "student_name"),
+            "branch": ("branch", "student_branch"),
+            "admission_year": ("admission_year",),
+            "email": ("email",),
+            "contact_info": ("contact_info", "contact", "phone"),
+        },
+        "required": ("name", "branch", "admission_year"),
+        "keep_case": ("email", "contact_info"),
+        "key": ("name", "branch"),
+        "collation": NAME_COLLATION,
+    },
+}
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.updated = 0
+        self.rejects = []  # (row number, reason, raw row)
+        self.reject_report = None
+
+    def summary(self):
+        text = (f"📋 Rows read: {self.rows}\n"
+                f"➕ Inserted: {self.inserted}\n"
+                f"🔄 Updated: {self.updated}\n"
+                f"❌ Rejected: {len(self.rejects)}")
+        if self.reject_report:
+            text += f"\n\nRejected rows written to:\n{self.reject_report}"
+        return text
+
+
+def _header_key(header):
+    return re.sub(r"[^a-z0-9]+", "_", str(header or "").strip().lower()).strip("_")
+
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # Spreadsheet numbers: 2024.0 -> "2024", phone numbers lose nothing
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat()
+    return str(value).strip()
+
+
+def read_rows(path):
+    """Yield (row number, {header: text}) from a .csv or .xlsx file without loading it whole"""
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            headers = [_cell_text(h) for h in next(rows, ())]
+            for number, values in enumerate(rows, start=2):
+                row = {header: _cell_text(value) for header, value in zip(headers, values) if header}
+                if any(row.values()):
+                    yield number, row
+        finally:
+            wb.close()
+        return
+
+    with open(path, newline="", encoding="utf-8-sig") as csvfile:
+        for number, row in enumerate(csv.DictReader(csvfile), start=2):
+            row = {header: _cell_text(value) for header, value in row.items() if header}
+            if any(row.values()):
+                yield number, row
+
+
+class BulkImporter:
+    """Validates rows with the form rules and upserts them on their natural key, chunk by chunk"""
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def column_map(self, collection_name, headers):
+        """{file header: field} for the headers this collection understands"""
+        aliases = {}
+        for field, names in IMPORT_SPECS[collection_name]["columns"].items():
+            for name in names:
+                aliases.setdefault(name, field)
+        return {header: aliases[_header_key(header)] for header in headers if _header_key(header) in aliases}
+
+    def normalize(self, collection_name, raw, columns):
+        """(document, None) for a valid row, (None, reason) otherwise - same rules as the add forms"""
+        spec = IMPORT_SPECS[collection_name]
+        doc = {}
+        for header, field in columns.items():
+            value = raw.get(header, "")
+            if value and not doc.get(field):
+                doc[field] = value if field in spec["keep_case"] else value.upper()
+
+        missing = [field for field in spec["required"] if not doc.get(field)]
+        if missing:
+            return None, f"Missing required field(s): {', '.join(missing)}"
+        if doc.get("email") and not validate_email(doc["email"]):
+            return None, f"Invalid email address: {doc['email']}"
+        if doc.get("contact_info") and not validate_phone(doc["contact_info"]):
+            return None, f"Invalid phone number: {doc['contact_info']}"
+
+        if collection_name == "student":
+            if not doc["admission_year"].isdigit():
+                return None, f"Invalid admission year: {doc['admission_year']}"
+            doc["admission_year"] = int(doc["admission_year"])
+        if "package" in doc:
+            doc["package_lpa"] = parse_package_lpa(doc["package"])
+
+        if collection_name in ("company", "placed_student"):
+            with_search_tokens(collection_name, doc)
+        return doc, None
+
+    def upsert(self, collection_name, doc):
+        spec = IMPORT_SPECS[collection_name]
+        # An existing record keeps its schema version (normalize-schema may still have work to do)
+        on_insert = {SCHEMA_VERSION_FIELD: SCHEMA_VERSIONS[collection_name]}
+        if collection_name == "placed_student":
+            # ...and a placement keeps its offer letter link
+            on_insert.update({"offer_letter_pdf_key": None, "has_offer_letter": False,
+                              "created_date": datetime.datetime.now()})
+        update = with_updated_at({"$set": doc, "$setOnInsert": on_insert})
+        return UpdateOne({field: doc[field] for field in spec["key"]}, update, upsert=True,
+                         collation=spec.get("collation"))
+
+    def _link_students(self, docs):
+        # One student lookup per chunk instead of one per placement
+        id_map = student_id_map(db_manager.get_collection("student"), {doc["student_name"] for doc in docs})
+        for doc in docs:
+            doc[STUDENT_ID_FIELD] = lookup_student_id(id_map, doc)
+
+    def _natural_key(self, collection_name, doc):
+        return tuple(doc.get(field) for field in IMPORT_SPECS[collection_name]["key"])
+
+    def _existing(self, collection, collection_name, docs):
+        """{natural key: counted fields} of the records this batch will update"""
+        key = IMPORT_SPECS[collection_name]["key"]
+        projection = dict(COUNTER_FIELDS[collection_name], **{field: 1 for field in key})
+        query = {"$or": [{field: doc[field] for field in key} for doc in docs]}
+        return {self._natural_key(collection_name, old): old for old in collection.find(query, projection)}
+
+    def _write(self, collection, collection_name, batch, result):
+        """batch is a list of (row number, raw row, document)"""
+        docs = [doc for _, _, doc in batch]
+        if collection_name == "placed_student":
+            self._link_students(docs)
+        counted = collection_name in COUNTERS
+        existing = self._existing(collection, collection_name, docs) if counted else {}
+        operations = [self.upsert(collection_name, doc) for doc in docs]
+        failed = set()
+        try:
+            outcome = collection.bulk_write(operations, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            # Unordered: every other operation in the batch was still applied
+            outcome = e.details
+            for error in outcome.get("writeErrors", []):
+                failed.add(error["index"])
+                number, raw, _ = batch[error["index"]]
+                if error.get("code") == 11000:
+                    reason = "Duplicate of an existing record (name or email already used)"
+                else:
+                    reason = f"Database error: {error.get('errmsg', error.get('code'))}"
+                result.rejects.append((number, reason, raw))
+        result.inserted += outcome.get("nUpserted", 0)
+        result.updated += outcome.get("nMatched", 0)
+
+        if counted:
+            # Upserts bypass the per-write $inc - move the counters by the batch's net change
+            changes = []
+            for index, doc in enumerate(docs):
+                if index not in failed:
+                    before = existing.get(self._natural_key(collection_name, doc))
+                    changes.append((before, dict(before or {}, **doc)))
+            stats_counters.apply_many(collection_name, changes)
+
+    def import_file(self, collection_name, path, job=None):
+        """Import every row of path into collection_name; returns an ImportResult"""
+        collection = db_manager.get_collection(collection_name)
+        if collection is None:
+            raise ConnectionError("Database connection failed")
+
+        job = job or ExportJob()
+        result = ImportResult()
+        columns = None
+        seen = {}  # natural key -> first row number, so a file cannot upsert the same record twice
+        spec = IMPORT_SPECS[collection_name]
+
+        for chunk in iter_chunks(read_rows(path), self.batch_size):
+            job.check()
+            if columns is None:
+                columns = self.column_map(collection_name, chunk[0][1].keys())
+                if not columns:
+                    raise ValueError(f"No recognised columns for {collection_name} in {os.path.basename(path)}")
+
+            batch = []
+            for number, raw in chunk:
+                result.rows += 1
+                doc, reason = self.normalize(collection_name, raw, columns)
+                if doc is not None:
+                    key = tuple(str(doc[field]).upper() for field in spec["key"])
+                    if key in seen:
+                        doc, reason = None, f"Duplicate of row {seen[key]}"
+                    else:
+                        seen[key] = number
+                if doc is None:
+                    result.rejects.append((number, reason, raw))
+                else:
+                    batch.append((number, raw, doc))
+            if batch:
+                self._write(collection, collection_name, batch, result)
+            job.written = result.rows
+
+        if result.rejects:
+            result.reject_report = self.write_reject_report(path, result.rejects)
+        print(f"✅ {collection_name} import: {result.rows} rows, {result.inserted} inserted, "
+              f"{result.updated} updated, {len(result.rejects)} rejected")
+        return result
+
+    def write_reject_report(self, path, rejects):
+        """CSV of the rejected rows with the reason, beside the imported file"""
+        report = f"{os.path.splitext(path)[0]}_rejects.csv"
+        headers = []
+        for _, _, raw in rejects:
+            headers.extend(header for header in raw if header not in headers)
+        with open(report, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Row", "Reason", *headers])
+            for number, reason, raw in sorted(rejects, key=lambda reject: reject[0]):
+                writer.writerow([number, reason, *(raw.get(header, "") for header in headers)])
+        return report
+
+    def import_from_dialog(self, parent, collection_name, title, on_done=None):
+        """Pick a file, import it on a worker with a progress window, then report the result"""
+        from tkinter import filedialog, messagebox
+        from async_db import async_db
+        from excel_export import ExportCancelled, progress_window, close_progress
+
+        path = filedialog.askopenfilename(
+            title=title,
+            filetypes=[("Spreadsheets", "*.xlsx *.csv"), ("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+        )
+        if not path:  # User cancelled
+            return None
+
+        job = ExportJob()
+        root = parent.winfo_toplevel()
+        window = progress_window(root, title, job, verb="Imported")
+
+        def on_success(result):
+            close_progress(window)
+            if on_done:
+                on_done(result)
+            messagebox.showinfo("Import Complete", result.summary())
+
+        def on_error(e):
+            close_progress(window)
+            if on_done:
+                on_done(None)  # Earlier chunks may already be written
+            if isinstance(e, ExportCancelled):
+                messagebox.showwarning("Import Cancelled", f"Import stopped after {job.written} rows.")
+            elif isinstance(e, ImportError):
+                messagebox.showerror("Error", "openpyxl library not installed. Install it using: pip install openpyxl")
+            else:
+                messagebox.showerror("Error", f"Failed to import: {e}")
+
+        return async_db.submit(root, self.import_file, collection_name, path, job,
+                               on_success=on_success, on_error=on_error)
+
+
+# Create global bulk importer instance
+bulk_importer = BulkImporter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TP_Manager bulk import")
+    parser.add_argument("collection", choices=sorted(IMPORT_SPECS))
+    parser.add_argument("file", help=".csv or .xlsx file with a header row")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    result = BulkImporter(args.batch_size).import_file(args.collection, args.file)
+    if result.inserted or result.updated:
+        cache_sync.publish(args.collection)  # Apps without change streams pick this up on their next poll
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Cache Sync - keeps local caches coherent with writes made by other T&P office machines
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure, PyMongoError
+from database_config import db_manager, COLLECTIONS
+from facets import facet_service
+from async_db import async_db
+from utils import invalidate_cache, get_cached_students, get_cached_companies, get_cached_placements
+
+CACHE_POLL_SECONDS = 5  # Version counter polling interval when change streams are unavailable
+CACHE_SETTLE_MS = 1000  # Dirty collections are handed to the UI at most this often
+STREAM_RETRY_SECONDS = 10
+STREAM_AWAIT_MS = 1000  # Longest a change stream read blocks, so stop() is noticed
+
+# Unauthorized, CommandNotSupported, unknown $changeStream stage, not a replica set
+CHANGE_STREAM_UNSUPPORTED = (13, 115, 40324, 40573)
+CHANGE_STREAM_HISTORY_LOST = 286
+
+# Collection -> (utils cache key, loader, limit), the same queries main.py preloads
+CACHED_QUERIES = {
+    "student": ("students", get_cached_students, 100),
+    "company": ("companies", get_cached_companies, 50),
+    "placed_student": ("placements", get_cached_placements, 50),
+}
+
+_COLLECTION_NAMES = {name: collection_name for collection_name, name in COLLECTIONS.items()}
+
+
+class CacheSync:
+    """Background watcher that marks caches dirty when any client writes.
+
+    A change stream on the main database is used where the server supports one; otherwise (a
+    standalone server, or a user without the changeStream privilege) the watcher polls the
+    per-collection counters in cache_versions, which every write path bumps via notify_write().
+    Dirty collections are invalidated and re-warmed one by one, and listeners are called with
+    the set of changed collections on the Tk thread.
+    """
+
+    def __init__(self, poll_seconds=CACHE_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self.mode = None  # "stream" or "poll" once the watcher is running
+        self._versions = {}
+        self._dirty = set()
+        self._resume_token = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._root = None
+        self._publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-version")
+
+    def start(self, root):
+        """Start watching - dirty collections are delivered through root.after"""
+        if self._thread is not None:
+            return
+        self._root = root
+        self._thread = threading.Thread(target=self._run, name="cache-sync", daemon=True)
+        self._thread.start()
+        root.after(CACHE_SETTLE_MS, self._drain)
+
+    def stop(self):
+        self._stop.set()
+        self._publisher.shutdown(wait=False, cancel_futures=True)
+
+    def add_listener(self, callback):
+        """callback(changed collection names) runs on the Tk thread after another client writes"""
+        self._listeners.append(callback)
+
+    def notify_write(self, collection_name):
+        """Call after a local write: drop the local caches now and tell the other clients"""
+        self._invalidate(collection_name)
+        try:
+            self._publisher.submit(self.publish, collection_name)
+        except RuntimeError:
+            pass  # Shutting down
+
+    def publish(self, collection_name):
+        """Bump the collection's version counter (blocking - the CLI tools call this directly)"""
+        versions = db_manager.get_cache_versions_collection()
+        if versions is None:
+            return
+        try:
+            doc = versions.find_one_and_update({"_id": collection_name}, {"$inc": {"version": 1}},
+                                               upsert=True, return_document=ReturnDocument.AFTER)
+        except PyMongoError as e:
+            print(f"⚠️ Could not publish {collection_name} change to other clients: {e}")
+            return
+        with self._lock:
+            # Our own bump is not a remote change - unless another client bumped in between
+            if self._versions.get(collection_name) == doc["version"] - 1:
+                self._versions[collection_name] = doc["version"]
+
+    def _invalidate(self, collection_name):
+        invalidate_cache(CACHED_QUERIES[collection_name][0])
+        facet_service.invalidate(collection_name)
+
+    def _mark_dirty(self, collection_names):
+        with self._lock:
+            self._dirty.update(collection_names)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.mode == "poll":
+                self._poll_versions()
+                self._stop.wait(self.poll_seconds)
+                continue
+            try:
+                self._watch_stream()
+                continue
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED:
+                    print(f"⚠️ Change streams unavailable, polling cache versions every {self.poll_seconds}s")
+                    self.mode = "poll"
+                    continue
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    self._resume_token = None
+                print(f"⚠️ Cache change stream stopped: {e}")
+            except PyMongoError as e:
+                print(f"⚠️ Cache change stream stopped: {e}")
+            # Changes may have been missed while the stream was down
+            self._mark_dirty(COLLECTIONS)
+            self._stop.wait(STREAM_RETRY_SECONDS)
+
+    def _watch_stream(self):
+        if not db_manager.connect(show_errors=False):
+            self._stop.wait(STREAM_RETRY_SECONDS)
+            return
+        pipeline = [{"$match": {"ns.coll": {"$in": list(_COLLECTION_NAMES)}}}]
+        with db_manager.db.watch(pipeline, resume_after=self._resume_token,
+                                 max_await_time_ms=STREAM_AWAIT_MS) as stream:
+            if self.mode is None:
+                print("✅ Watching for changes from other clients")
+            self.mode = "stream"
+            while not self._stop.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is not None:
+                    collection_name = _COLLECTION_NAMES.get(change.get("ns", {}).get("coll"))
+                    # drop/rename/invalidate events carry no usable collection - refresh everything
+                    self._mark_dirty([collection_name] if collection_name else COLLECTIONS)
+                self._resume_token = stream.resume_token
+
+    def _poll_versions(self):
+        versions = db_manager.get_cache_versions_collection()
+        if versions is None:
+            return
+        try:
+            current = {doc["_id"]: doc.get("version", 0)
+                       for doc in versions.find({"_id": {"$in": list(COLLECTIONS)}})}
+        except PyMongoError as e:
+            print(f"⚠️ Could not poll cache versions: {e}")
+            return
+        changed = []
+        with self._lock:
+            for collection_name in COLLECTIONS:
+                version = current.get(collection_name, 0)
+                seen = self._versions.get(collection_name)
+                if seen is not None and version != seen:
+                    changed.append(collection_name)
+                self._versions[collection_name] = version
+        self._mark_dirty(changed)
+
+    def _drain(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        if dirty:
+            for collection_name in dirty:
+                self._invalidate(collection_name)
+            async_db.submit(self._root, self._rewarm, dirty)
+            for listener in list(self._listeners):
+                try:
+                    listener(dirty)
+                except Exception as e:
+                    print(f"❌ Error in cache listener: {e}")
+        if not self._stop.is_set():
+            try:
+                self._root.after(CACHE_SETTLE_MS, self._drain)
+            except Exception:
+                pass  # Window closed
+
+    @staticmethod
+    def _rewarm(collection_names):
+        """Reload only the dirty caches"""
+        for collection_name in collection_names:
+            _, loader, limit = CACHED_QUERIES[collection_name]
+            collection = db_manager.get_collection(collection_name)
+            if collection is not None:
+                loader(collection, limit=limit)
+
+
+# Create global cache sync instance
+cache_sync = CacheSync()
@@ -0,0 +1,247 @@
+"""
+Chart Plots - the drawing code for every analytics chart
+
+Plain functions of (fig, ax, title, chart_type, data) with no Tk dependency, so the same code
+draws the interactive TkAgg canvases and the Agg images rendered in worker processes.
+"""
+
+from matplotlib.patches import Circle
+from utils import create_autopct_function, CHART_COLORS
+from chart_registry import label_bars, pie_artists
+
+
+def make_value_autopct(values):
+    """Pie label showing both value and percentage"""
+    def autopct(pct):
+        total = sum(values)
+        val = int(round(pct * total / 100.0))
+        return f'{val}\n({pct:.1f}%)'
+    return autopct
+
+
+def plot_home_chart(fig, ax, title, chart_type, data):
+    """Dashboard charts (main.py)"""
+    ax.set_facecolor('#1e1e1e')
+    fig.subplots_adjust(left=0.12, right=0.95, top=0.88, bottom=0.18)
+
+    # Plot based on type with optimized rendering
+    if chart_type == "pie" and data:
+        labels, sizes = data
+        # Limit to top 8 items for better performance
+        if len(labels) > 8:
+            labels, sizes = labels[:8], sizes[:8]
+
+        # Use optimized autopct function from utils
+        autopct_func = create_autopct_function(sizes)
+        wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct=autopct_func,
+                                          colors=CHART_COLORS["primary"][:len(labels)],
+                                          textprops={'color': 'white', 'fontsize': 9, 'weight': 'bold'})
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        if len(data[0]) <= 8:
+            return pie_artists(wedges, texts, autotexts, create_autopct_function)
+
+    elif chart_type == "bar" and data:
+        labels, values = data
+        bars = ax.bar(range(len(labels)), values, color=CHART_COLORS["primary"][:len(labels)])
+
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
+        ax.tick_params(axis='y', colors='white', labelsize=10)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(axis='y', alpha=0.3, color='white')
+
+        # Add optimized value labels
+        return label_bars(ax, bars, fontsize=lambda height: min(12, max(8, int(height / 5))),
+                          ha='center', va='center', color='white', weight='bold',
+                          bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.8))
+
+    elif chart_type == "hbar" and data:
+        labels, values = data
+        colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
+        bars = ax.barh(range(len(labels)), values, color=colors[:len(labels)])
+
+        ax.set_yticks(range(len(labels)))
+        ax.set_yticklabels(labels, color='white', fontsize=11, weight='bold')
+        ax.tick_params(axis='x', colors='white', labelsize=10)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(axis='x', alpha=0.3, color='white')
+
+        # Add value labels in the middle of horizontal bars
+        return label_bars(ax, bars, horizontal=True, hide_zero=False, fontsize=11,
+                          ha='center', va='center', color='white', weight='bold',
+                          bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.7))
+
+    elif chart_type == "line" and data:
+        labels, values = data
+        ax.plot(labels, values, marker='o', linewidth=3, markersize=10, color='#3498DB')
+        ax.fill_between(range(len(labels)), values, alpha=0.3, color='#3498DB')
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, color='white', fontsize=11, weight='bold')
+        ax.tick_params(axis='y', colors='white', labelsize=10)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(True, alpha=0.3, color='white')
+
+    elif chart_type == "hist" and data:
+        values, bins = data
+        ax.hist(values, bins=bins, color='#3498DB', edgecolor='white', alpha=0.7)
+        ax.tick_params(axis='both', colors='white', labelsize=10)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(axis='y', alpha=0.3, color='white')
+
+    elif chart_type == "donut" and data:
+        labels, sizes = data
+        colors = ['#2CC985', '#E74C3C']
+        # Use optimized autopct function from utils
+        autopct_func = create_autopct_function(sizes)
+        wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct=autopct_func,
+                                          colors=colors, startangle=90)
+        # Draw circle for donut
+        centre_circle = Circle((0, 0), 0.70, fc='#1e1e1e')
+        ax.add_artist(centre_circle)
+        for text in texts:
+            text.set_color('white')
+            text.set_fontsize(12)
+            text.set_weight('bold')
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontsize(12)
+            autotext.set_weight('bold')
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        return pie_artists(wedges, texts, autotexts, create_autopct_function, startangle=90)
+
+    elif chart_type == "bar_with_range" and data:
+        labels, values, y_range = data
+        colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
+        bars = ax.bar(range(len(labels)), values, color=colors[:len(labels)])
+
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=10, weight='bold')
+        ax.set_ylim(0, max(y_range) if y_range else 100)
+        ax.tick_params(axis='y', colors='white', labelsize=9)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(axis='y', alpha=0.3, color='white')
+
+        # Add value labels in the CENTER of bars
+        return label_bars(ax, bars, fontsize=12,
+                          ha='center', va='center', color='white', weight='bold',
+                          bbox=dict(boxstyle='round,pad=0.2', facecolor='black', alpha=0.7))
+
+    elif chart_type == "grouped_bar" and data:
+        branches, total_students, placed_students = data
+        x = range(len(branches))
+        width = 0.35
+
+        # Create grouped bars
+        bars1 = ax.bar([i - width / 2 for i in x], total_students, width, label='Total Students',
+                       color='#3498DB')
+        bars2 = ax.bar([i + width / 2 for i in x], placed_students, width, label='Placed Students',
+                       color='#2CC985')
+
+        ax.set_xticks(x)
+        ax.set_xticklabels(branches, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
+        ax.set_ylim(0, 350)
+        ax.set_yticks([0, 25, 50, 75, 100, 125, 150, 175, 200, 225, 250, 275, 300, 325, 350])
+        ax.tick_params(axis='y', colors='white', labelsize=9)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.legend(loc='upper right', facecolor='#2b2b2b', edgecolor='white', labelcolor='white')
+        ax.grid(axis='y', alpha=0.3, color='white')
+
+        # Add value labels in the middle of bars
+        return label_bars(ax, list(bars1) + list(bars2), fontsize=10,
+                          ha='center', va='center', color='white', weight='bold',
+                          bbox=dict(boxstyle='round,pad=0.2', facecolor='black', alpha=0.7))
+
+
+def plot_company_chart(fig, ax, title, chart_type, data):
+    """Company analytics charts (company.py)"""
+    # Use larger height for horizontal bar charts with many items
+    if chart_type == "hbar":
+        fig.subplots_adjust(left=0.25, right=0.92, top=0.92, bottom=0.08)
+    else:
+        fig.subplots_adjust(left=0.12, right=0.95, top=0.88, bottom=0.18)
+    ax.set_facecolor('#1e1e1e')
+
+    if chart_type == "pie" and data:
+        labels, sizes = data
+        # Custom autopct function using utility
+        autopct_func = create_autopct_function(sizes)
+        wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct=autopct_func,
+                                          colors=CHART_COLORS["primary"][:len(labels)],
+                                          textprops={'color': 'white', 'fontsize': 9, 'weight': 'bold'})
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        return pie_artists(wedges, texts, autotexts, create_autopct_function)
+
+    elif chart_type == "bar" and data:
+        labels, values = data
+        colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
+        bars = ax.bar(range(len(labels)), values, color=colors[:len(labels)])
+
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
+        ax.tick_params(axis='y', colors='white', labelsize=10)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(axis='y', alpha=0.3, color='white')
+
+        # Value labels in the middle of bars, font size adjusted to bar height
+        return label_bars(ax, bars, fontsize=lambda height: min(12, max(8, int(height / 5))),
+                          ha='center', va='center', color='white', weight='bold',
+                          bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.8))
+
+    elif chart_type == "hbar" and data:
+        labels, values = data
+        colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6'] * 4
+
+        # Add spacing between bars by using height parameter
+        bar_height = 0.6  # Smaller height = more spacing
+        y_positions = range(len(labels))
+        bars = ax.barh(y_positions, values, height=bar_height, color=colors[:len(labels)])
+
+        ax.set_yticks(y_positions)
+        ax.set_yticklabels(labels, color='white', fontsize=8)
+        ax.tick_params(axis='x', colors='white', labelsize=9)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(axis='x', alpha=0.3, color='white')
+        # Add some padding to the right for labels
+        ax.set_xlim(0, max(values) * 1.15 if values else 10)
+
+        # Value labels at the end of horizontal bars
+        return label_bars(ax, bars, horizontal=True, position="end", hide_zero=False, fontsize=10,
+                          ha='left', va='center', color='white', weight='bold')
+
+
+def plot_placed_chart(fig, ax, title, chart_type, data):
+    """Placement analytics charts (placed_student.py)"""
+    ax.set_facecolor('#1e1e1e')
+    fig.subplots_adjust(left=0.12, right=0.95, top=0.88, bottom=0.18)
+
+    if chart_type == "pie" and data:
+        labels, sizes = data
+        colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6', '#1ABC9C', '#E67E22', '#34495E']
+        wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct=make_value_autopct(sizes),
+                                          colors=colors[:len(labels)],
+                                          textprops={'color': 'white', 'fontsize': 9, 'weight': 'bold'})
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        return pie_artists(wedges, texts, autotexts, make_value_autopct)
+
+    elif chart_type == "bar" and data:
+        labels, values = data
+        colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
+        bars = ax.bar(range(len(labels)), values, color=colors[:len(labels)])
+
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
+        ax.tick_params(axis='y', colors='white', labelsize=10)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
+        ax.grid(axis='y', alpha=0.3, color='white')
+
+        # Value labels in the middle of bars, font size adjusted to bar height
+        return label_bars(ax, bars, fontsize=lambda height: min(12, max(8, int(height / 5))),
+                          ha='center', va='center', color='white', weight='bold',
+                          bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.8))
+
+
+PLOTTERS = {
+    "home": plot_home_chart,
+    "company": plot_company_chart,
+    "placed": plot_placed_chart,
+}
@@ -0,0 +1,242 @@
+"""
+Chart Registry - keeps matplotlib figures alive between visits and redraws only what changed
+"""
+
+import hashlib
+import math
+from collections import OrderedDict
+
+MAX_CHARTS = 32
+MAX_RASTERS_PER_CHART = 4  # Rendered pixel buffers kept per chart, one per canvas size
+FIGURE_FACECOLOR = '#2b2b2b'
+
+# Chart types whose artists can be updated in place when only the values change
+BAR_TYPES = {"bar", "bar_with_range", "hbar", "grouped_bar"}
+PIE_TYPES = {"pie", "donut"}
+
+_canvas_class = None
+
+
+def data_fingerprint(chart_type, data):
+    """Stable hash of a chart's type and data"""
+    return hashlib.sha1(repr((chart_type, data)).encode("utf-8")).hexdigest()
+
+
+def _get_canvas_class():
+    """FigureCanvasTkAgg that re-blits the last rendered pixels instead of redrawing an unchanged figure"""
+    global _canvas_class
+    if _canvas_class is None:
+        import numpy as np
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        class CachedFigureCanvas(FigureCanvasTkAgg):
+            chart_entry = None
+
+            def draw(self):
+                entry = self.chart_entry
+                key = (*self.get_width_height(physical=True), self.figure.dpi)
+                raster = entry.rasters.get(key) if entry is not None else None
+                if raster is not None:
+                    self.renderer = self.get_renderer()
+                    np.asarray(self.renderer.buffer_rgba())[...] = raster
+                    self.blit()
+                    return
+                super().draw()
+                if entry is not None:
+                    if len(entry.rasters) >= MAX_RASTERS_PER_CHART:
+                        entry.rasters.clear()
+                    entry.rasters[key] = np.array(self.renderer.buffer_rgba())
+
+        _canvas_class = CachedFigureCanvas
+    return _canvas_class
+
+
+def _bar_label_position(bar, horizontal, position):
+    if horizontal:
+        width = bar.get_width()
+        x = width + 0.5 if position == "end" else width / 2
+        return x, bar.get_y() + bar.get_height() / 2.
+    return bar.get_x() + bar.get_width() / 2., bar.get_height() / 2
+
+
+def label_bars(ax, bars, horizontal=False, position="center", fontsize=None, hide_zero=True, **text_kwargs):
+    """Value label per bar; returns the bar artists for ChartRegistry in-place updates
+
+    fontsize may be a callable taking the bar value.
+    """
+    bars = list(bars)
+    texts = []
+    for bar in bars:
+        value = bar.get_width() if horizontal else bar.get_height()
+        x, y = _bar_label_position(bar, horizontal, position)
+        size = fontsize(value) if callable(fontsize) else fontsize
+        text = ax.text(x, y, f'{int(value)}', fontsize=size, **text_kwargs)
+        text.set_visible(value > 0 or not hide_zero)
+        texts.append(text)
+    return {"bars": bars, "texts": texts, "horizontal": horizontal, "position": position,
+            "fontsize": fontsize, "hide_zero": hide_zero}
+
+
+def pie_artists(wedges, texts, autotexts, make_autopct, startangle=0):
+    """Pie artists for ChartRegistry in-place updates; make_autopct(sizes) builds the autopct function"""
+    return {"wedges": list(wedges), "texts": list(texts), "autotexts": list(autotexts),
+            "make_autopct": make_autopct, "startangle": startangle}
+
+
+class ChartEntry:
+    def __init__(self, figure, chart_type, figsize, dpi):
+        self.figure = figure
+        self.chart_type = chart_type
+        self.figsize = figsize
+        self.dpi = dpi
+        self.fingerprint = None
+        self.categories = None
+        self.artists = {}
+        self.rasters = {}
+
+
+class ChartRegistry:
+    """One live Figure per chart id.
+
+    Tk widgets cannot move to a new parent, so each visit gets a fresh canvas widget, but the
+    Figure, its artists and its last rendered pixels are reused: an unchanged fingerprint skips
+    plotting and rasterizing, changed values with the same categories update bars and wedges in
+    place, and anything else is re-plotted into the existing Figure.
+    """
+
+    def __init__(self, max_charts=MAX_CHARTS):
+        self.max_charts = max_charts
+        self._entries = OrderedDict()
+
+    def show(self, chart_id, frame, chart_type, data, plot, figsize=(6.5, 5), dpi=100):
+        """Attach chart_id to frame and return its canvas
+
+        plot(fig, ax) draws the chart from scratch and may return label_bars()/pie_artists() artists.
+        """
+        entry = self._entries.get(chart_id)
+        fingerprint = data_fingerprint(chart_type, data)
+
+        try:
+            if entry is None or entry.chart_type != chart_type or entry.figsize != figsize or entry.dpi != dpi:
+                from matplotlib.figure import Figure
+                entry = ChartEntry(Figure(figsize=figsize, dpi=dpi, facecolor=FIGURE_FACECOLOR, edgecolor='none'),
+                                   chart_type, figsize, dpi)
+                self._entries[chart_id] = entry
+                self._replot(entry, data, plot)
+            elif entry.fingerprint != fingerprint:
+                if not self._update_in_place(entry, data):
+                    self._replot(entry, data, plot)
+        except Exception:
+            # Don't keep a half-drawn figure around
+            self._entries.pop(chart_id, None)
+            raise
+        entry.fingerprint = fingerprint
+
+        self._entries.move_to_end(chart_id)
+        while len(self._entries) > self.max_charts:
+            self._entries.popitem(last=False)
+
+        canvas = _get_canvas_class()(entry.figure, master=frame)
+        canvas.chart_entry = entry
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill='both', expand=True, padx=5, pady=5)
+        return canvas
+
+    def is_current(self, chart_id, chart_type, data):
+        """True when chart_id already holds a figure for exactly this data"""
+        entry = self._entries.get(chart_id)
+        return entry is not None and entry.fingerprint == data_fingerprint(chart_type, data)
+
+    def invalidate(self, chart_id=None):
+        """Forget one chart (or all) so the next show() plots from scratch"""
+        if chart_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(chart_id, None)
+
+    @staticmethod
+    def _categories(data):
+        return list(data[0]) if data else None
+
+    def _replot(self, entry, data, plot):
+        entry.figure.clear()
+        ax = entry.figure.add_subplot(111)
+        entry.artists = plot(entry.figure, ax) or {}
+        entry.categories = self._categories(data)
+        entry.rasters.clear()
+
+    def _update_in_place(self, entry, data):
+        if not entry.artists or not data or self._categories(data) != entry.categories:
+            return False
+        try:
+            if entry.chart_type in BAR_TYPES and "bars" in entry.artists:
+                updated = self._update_bars(entry, data)
+            elif entry.chart_type in PIE_TYPES and "wedges" in entry.artists:
+                updated = self._update_pie(entry, data)
+            else:
+                updated = False
+        except Exception as e:
+            print(f"⚠️ In-place chart update failed, re-plotting: {e}")
+            updated = False
+        if updated:
+            entry.rasters.clear()
+        return updated
+
+    def _update_bars(self, entry, data):
+        artists = entry.artists
+        values = list(data[1]) + list(data[2]) if entry.chart_type == "grouped_bar" else list(data[1])
+        if len(values) != len(artists["bars"]):
+            return False
+
+        horizontal = artists["horizontal"]
+        fontsize = artists["fontsize"]
+        for bar, text, value in zip(artists["bars"], artists["texts"], values):
+            if horizontal:
+                bar.set_width(value)
+            else:
+                bar.set_height(value)
+            text.set_position(_bar_label_position(bar, horizontal, artists["position"]))
+            text.set_text(f'{int(value)}')
+            text.set_visible(value > 0 or not artists["hide_zero"])
+            if callable(fontsize):
+                text.set_fontsize(fontsize(value))
+
+        ax = artists["bars"][0].axes
+        if entry.chart_type == "bar_with_range":
+            y_range = data[2]
+            ax.set_ylim(0, max(y_range) if y_range else 100)
+        elif entry.chart_type == "hbar" and artists["position"] == "end":
+            ax.set_xlim(0, max(values) * 1.15 if values else 10)
+        elif entry.chart_type != "grouped_bar":  # grouped bars use a fixed scale
+            ax.relim()
+            ax.autoscale_view()
+        return True
+
+    def _update_pie(self, entry, data):
+        artists = entry.artists
+        sizes = list(data[1])
+        total = float(sum(sizes))
+        if total <= 0 or len(sizes) != len(artists["wedges"]):
+            return False
+
+        autopct = artists["make_autopct"](sizes)
+        theta1 = artists["startangle"] / 360.
+        for wedge, text, autotext, size in zip(artists["wedges"], artists["texts"], artists["autotexts"], sizes):
+            frac = size / total
+            theta2 = theta1 + frac
+            wedge.set_theta1(360. * theta1)
+            wedge.set_theta2(360. * theta2)
+
+            # Same label geometry as Axes.pie (labeldistance 1.1, pctdistance 0.6)
+            thetam = math.pi * (theta1 + theta2)
+            x, y = math.cos(thetam), math.sin(thetam)
+            text.set_position((1.1 * x, 1.1 * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text(autopct(100. * frac))
+            theta1 = theta2
+        return True
+
+
+# Create global chart registry instance
+chart_registry = ChartRegistry()
@@ -0,0 +1,166 @@
+"""
+Chart Rendering Pool - charts are drawn with Agg in worker processes, Tk only shows the images
+"""
+
+import base64
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from async_db import async_db
+from chart_registry import chart_registry, data_fingerprint, FIGURE_FACECOLOR
+
+MAX_RENDER_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+MAX_CACHED_IMAGES = 32
+HOVER_UPGRADE_MS = 400  # Hovering this long swaps the image for an interactive canvas
+
+
+def render_chart_png(kind, title, chart_type, data, figsize, dpi):
+    """Draw one chart off-screen and return PNG bytes (runs in a worker process)"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from chart_plots import PLOTTERS
+
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor=FIGURE_FACECOLOR, edgecolor='none')
+    FigureCanvasAgg(fig)
+    PLOTTERS[kind](fig, fig.add_subplot(111), title, chart_type, data)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, facecolor=fig.get_facecolor())
+    return buffer.getvalue()
+
+
+def _warm_worker():
+    # Pay for the matplotlib import once per worker, before the first dashboard
+    import chart_plots  # noqa: F401
+    return os.getpid()
+
+
+class ChartRenderer:
+    """Renders charts in parallel in a process pool.
+
+    Each chart first appears as a static image; hovering or clicking replaces it with the
+    interactive TkAgg canvas from chart_registry. If the pool cannot be used (e.g. a frozen build
+    without multiprocessing support) charts fall back to drawing on the Tk thread.
+    """
+
+    def __init__(self, max_workers=MAX_RENDER_WORKERS):
+        self.max_workers = max_workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._images = OrderedDict()
+        self._images_lock = threading.Lock()
+        self._disabled = False
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn - forking a process that is running Tk and DB threads is not safe
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def warm_up(self):
+        """Start the worker processes in the background"""
+        try:
+            pool = self._get_pool()
+            for _ in range(self.max_workers):
+                pool.submit(_warm_worker)
+        except Exception as e:
+            print(f"⚠️ Chart render pool unavailable, drawing charts on the UI thread: {e}")
+            self._disabled = True
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _cached_image(self, key):
+        with self._images_lock:
+            png = self._images.get(key)
+            if png is not None:
+                self._images.move_to_end(key)
+            return png
+
+    def _store_image(self, key, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._images_lock:
+            self._images[key] = future.result()
+            while len(self._images) > MAX_CACHED_IMAGES:
+                self._images.popitem(last=False)
+
+    def show(self, chart_id, frame, kind, title, chart_type, data, figsize=(6.5, 5), dpi=100):
+        """Show a chart in frame - the finished image when ready, the live canvas on demand"""
+        import tkinter as tk
+        from chart_plots import PLOTTERS
+
+        def plot(fig, ax):
+            return PLOTTERS[kind](fig, ax, title, chart_type, data)
+
+        def show_interactive():
+            chart_registry.show(chart_id, frame, chart_type, data, plot, figsize=figsize, dpi=dpi)
+
+        # Already interactive for this data, or no worker processes - draw here
+        if self._disabled or chart_registry.is_current(chart_id, chart_type, data):
+            show_interactive()
+            return
+
+        image_label = tk.Label(frame, text="⏳ Rendering chart...", fg="white", bg=FIGURE_FACECOLOR,
+                               font=("Arial", 11), cursor="hand2")
+        image_label.pack(fill='both', expand=True, padx=5, pady=5)
+        state = {"hover": None}
+
+        def upgrade(event=None):
+            if not image_label.winfo_exists():
+                return
+            image_label.destroy()
+            try:
+                show_interactive()
+            except Exception as e:
+                tk.Label(frame, text=f"Error: {str(e)[:50]}", fg="#E74C3C",
+                         bg=FIGURE_FACECOLOR).pack(pady=10)
+
+        def on_enter(event):
+            state["hover"] = image_label.after(HOVER_UPGRADE_MS, upgrade)
+
+        def on_leave(event):
+            if state["hover"] is not None:
+                image_label.after_cancel(state["hover"])
+                state["hover"] = None
+
+        def display(png):
+            photo = tk.PhotoImage(data=base64.b64encode(png))
+            image_label.configure(image=photo, text="")
+            image_label.image = photo  # Keep a reference or Tk drops the image
+            image_label.bind("<Button-1>", upgrade)
+            image_label.bind("<Enter>", on_enter)
+            image_label.bind("<Leave>", on_leave)
+
+        def on_error(e):
+            if isinstance(e, BrokenProcessPool):
+                print(f"⚠️ Chart render pool stopped, drawing charts on the UI thread: {e}")
+                self._disabled = True
+            upgrade()
+
+        key = (chart_id, data_fingerprint(chart_type, data), figsize, dpi)
+        png = self._cached_image(key)
+        if png is not None:
+            display(png)
+            return
+
+        try:
+            future = self._get_pool().submit(render_chart_png, kind, title, chart_type, data, figsize, dpi)
+        except Exception as e:
+            on_error(e if isinstance(e, BrokenProcessPool) else BrokenProcessPool(str(e)))
+            return
+        # Cache even if the user has navigated away by the time it finishes
+        future.add_done_callback(lambda f: self._store_image(key, f))
+        async_db.watch(image_label, future, on_success=display, on_error=on_error)
+
+
+# Create global chart renderer instance
+chart_renderer = ChartRenderer()
@@ -1,22 +1,76 @@
 import customtkinter as ctk
 from tkinter import messagebox
-from database_config import get_company_collection
+from database_config import db_manager, get_company_collection
 from utils import (
-    validate_email, validate_phone, uppercase_entry_handler,
-    build_search_query, batch_clear_widgets, safe_int_convert, 
-    safe_float_convert, format_filter_info, create_autopct_function,
-    extract_numeric_value, COLORS, CHART_COLORS, get_cached_companies,
-    invalidate_cache, get_matplotlib, performance_monitor
+    validate_email, uppercase_entry_handler, batch_clear_widgets,
+    safe_int_convert, format_filter_info, COLORS
 )
+from package_utils import parse_package_lpa, package_lpa_of, package_tag
+from async_db import async_db
+from virtual_table import VirtualTreeview, PageNavigator, PAGE_SIZE, pager_source
+from pagination import KeysetPager
+from search_utils import build_search_query, with_search_tokens
+from schema_migrations import SCHEMA_VERSION_FIELD, SCHEMA_VERSIONS
+from cache_sync import cache_sync
+from local_store import local_store, with_updated_at
+from stats_counters import stats_counters, top_counts
+from chart_render import chart_renderer
+from csv_export import csv_exporter
+from bulk_import import bulk_importer
+from pymongo.errors import DuplicateKeyError
+from excel_export import excel_exporter, write_table, write_chart_sheets, chart_sheet, EXPORT_CHUNK_SIZE
+import re
+
+# (header, field, column width) of the companies Excel export
+COMPANY_EXPORT_COLUMNS = [
+    ("Company Name", "company_name", 25),
+    ("Email", "email", 25),
+    ("Contact", "contact_info", 15),
+    ("HR Name", "hr_name", 20),
+    ("Package", "package", 15),
+    ("Address", "address", 30),
+]
 
 
 class CompanyManager:
     def __init__(self):
-        self.collection = self.connect_db()
+        self._collection = None
+
+    @property
+    def collection(self):
+        """Bound on first use, so building the manager never waits on the DB handshake
+
+        Only read it on a worker thread - the first read may wait on that handshake.
+        """
+        if self._collection is None:
+            self._collection = self.connect_db()
+        return self._collection
 
     def connect_db(self):
         return get_company_collection()
 
+    def connecting(self):
+        """True until the main DB handshake has finished - the first worker call will wait on it"""
+        return not db_manager.is_connected()
+
+    def reader(self):
+        """Collection the views read from - the local replica once synced, otherwise Atlas (worker thread)"""
+        return local_store.collection("company") or self.collection
+
+    def writer(self):
+        """The Atlas collection for writes (worker thread) - raises when the database is unreachable"""
+        collection = self.collection
+        if collection is None:
+            raise ConnectionError("Database connection failed")
+        return collection
+
+    def find_all(self, query):
+        """Every company matching query, from reader() (worker thread)"""
+        source = self.reader()
+        if source is None:
+            raise ConnectionError("Database connection failed")
+        return list(source.find(query))
+
     def uppercase_entry(self, entry_widget):
         return uppercase_entry_handler(entry_widget)
 
@@ -47,6 +101,8 @@ class CompanyManager:
 
     def setup_company_charts_tab(self, parent):
         """Setup company analytics charts"""
+        self.company_charts_parent = parent
+
         # Title
         title = ctk.CTkLabel(parent, text="📊 COMPANY ANALYTICS",
                              font=("Arial", 32, "bold"), text_color=COLORS["info"])
@@ -67,54 +123,73 @@ class CompanyManager:
         loading_label = ctk.CTkLabel(charts_container, text="⏳ Loading analytics...",
                                      font=("Arial", 14), text_color=COLORS["info"])
         loading_label.pack(pady=50)
-        charts_container.update()
 
+        async_db.submit(charts_container, self.fetch_chart_companies,
+                        on_success=lambda result: self.render_company_charts(
+                            charts_container, loading_label, *result),
+                        key="company_charts")
+
+    def fetch_chart_companies(self):
+        """Get the chart counters and the best-paying companies (runs on a worker thread)
+
+        Returns (counters, companies). Counters come from the stats summary document; offline they
+        are counted from the latest companies instead.
+        """
+        source = self.reader()
+        if source is None:
+            return {}, []
         try:
-            # Get company data with pagination and projection
-            companies = []
-            if self.collection is not None:
-                try:
-                    projection = {
-                        "company_name": 1, "company_Name": 1, "sector": 1, 
-                        "package": 1, "hr_name": 1, "email": 1, "contact_info": 1
-                    }
-                    companies = list(self.collection.find({}, projection)
-                                   .sort([("_id", -1)])
-                                   .limit(500))  # Limit for performance
-                except Exception as e:
-                    print(f"Error fetching companies: {e}")
-                    companies = []
+            summary = stats_counters.summary()
+            if summary is not None:
+                # Indexed: package_lpa_1
+                top = source.find({}, {"company_name": 1, "package": 1, "package_lpa": 1})
+                return summary, list(top.sort([("package_lpa", -1)]).limit(20))
+
+            projection = {
+                "company_name": 1, "sector": 1, 
+                "package": 1, "package_lpa": 1, "hr_name": 1, "email": 1, "contact_info": 1
+            }
+            companies = list(source.find({}, projection)
+                             .sort([("_id", -1)])
+                             .limit(500))  # Limit for performance
+            return stats_counters.summarize("company", companies), companies
+        except Exception as e:
+            print(f"Error fetching companies: {e}")
+            return {}, []
 
+    def render_company_charts(self, charts_container, loading_label, counters, companies):
+        """Draw the analytics charts once the data has arrived"""
+        try:
             # Remove loading label
             loading_label.destroy()
 
-            import matplotlib.pyplot as plt
-            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-            from matplotlib.figure import Figure
-
             # Row 1: 2 charts
             row1_frame = ctk.CTkFrame(charts_container, fg_color=COLORS["content_frame"])
             row1_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
+            industry = self.get_industry_distribution(counters)
+            packages = self.get_company_package_distribution(counters)
+            top_companies = self.get_top_companies_by_package(companies)
+
             # Chart 1: Industry Type Distribution (Pie)
-            self.create_company_chart(row1_frame, "Industry Type Distribution",
-                                      self.get_industry_distribution(companies), "pie", row1_frame)
+            self.create_company_chart(row1_frame, "Industry Type Distribution", industry, "pie", row1_frame)
 
             # Chart 2: Company Package Distribution (Bar)
-            self.create_company_chart(row1_frame, "Company Package Distribution",
-                                      self.get_company_package_distribution(companies), "bar", row1_frame)
+            self.create_company_chart(row1_frame, "Company Package Distribution", packages, "bar", row1_frame)
 
             # Row 2: Top 20 Companies by Package
             row2_frame = ctk.CTkFrame(charts_container, fg_color=COLORS["content_frame"])
             row2_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
             # Chart 3: Top 20 Companies by Package (Horizontal Bar)
-            self.create_company_chart(row2_frame, "Top 20 Companies by Package",
-                                      self.get_top_companies_by_package(companies), "hbar", row2_frame)
+            self.create_company_chart(row2_frame, "Top 20 Companies by Package", top_companies, "hbar", row2_frame)
 
-            # Store chart data for export
+            # Store the aggregated series (not the documents) for export
             self.current_chart_data = {
-                'companies': companies
+                'count': counters.get("company_total", 0),
+                'industry': industry,
+                'packages': packages,
+                'top_companies': top_companies
             }
 
         except Exception as e:
@@ -125,10 +200,6 @@ class CompanyManager:
 
     def create_company_chart(self, parent, title, data, chart_type, row_frame):
         """Create a company chart"""
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        from matplotlib.figure import Figure
-
         frame = ctk.CTkFrame(row_frame, fg_color=COLORS["section_frame"], corner_radius=10)
         frame.pack(side='left', fill='both', expand=True, padx=5, pady=5)
 
@@ -138,128 +209,33 @@ class CompanyManager:
         title_label.pack(pady=10)
 
         try:
-            # Use larger height for horizontal bar charts with many items
-            if chart_type == "hbar":
-                fig = Figure(figsize=(8, 8), dpi=100, facecolor='#2b2b2b', edgecolor='none')
-                fig.subplots_adjust(left=0.25, right=0.92, top=0.92, bottom=0.08)
-            else:
-                fig = Figure(figsize=(6.5, 5), dpi=100, facecolor='#2b2b2b', edgecolor='none')
-                fig.subplots_adjust(left=0.12, right=0.95, top=0.88, bottom=0.18)
-            ax = fig.add_subplot(111)
-            ax.set_facecolor('#1e1e1e')
-
-            if chart_type == "pie" and data:
-                labels, sizes = data
-                # Custom autopct function using utility
-                autopct_func = create_autopct_function(sizes)
-                ax.pie(sizes, labels=labels, autopct=autopct_func, colors=CHART_COLORS["primary"][:len(labels)],
-                       textprops={'color': 'white', 'fontsize': 9, 'weight': 'bold'})
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-
-            elif chart_type == "bar" and data:
-                labels, values = data
-                colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
-                bars = ax.bar(range(len(labels)), values, color=colors[:len(labels)])
-
-                # Add value labels in the middle of bars for better visibility
-                for i, bar in enumerate(bars):
-                    height = bar.get_height()
-                    if height > 0:  # Only add label if bar has height
-                        # Position text in the middle of the bar
-                        y_pos = height / 2
-                        x_pos = bar.get_x() + bar.get_width() / 2.
-                        
-                        # Adjust font size based on bar height for better fit
-                        font_size = min(12, max(8, int(height / 5)))
-                        
-                        ax.text(x_pos, y_pos, f'{int(height)}',
-                                ha='center', va='center', color='white', 
-                                fontsize=font_size, weight='bold',
-                                bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.8))
-
-                ax.set_xticks(range(len(labels)))
-                ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
-                ax.tick_params(axis='y', colors='white', labelsize=10)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(axis='y', alpha=0.3, color='white')
-
-            elif chart_type == "hbar" and data:
-                labels, values = data
-                colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6'] * 4
-                
-                # Add spacing between bars by using height parameter
-                bar_height = 0.6  # Smaller height = more spacing
-                y_positions = range(len(labels))
-                bars = ax.barh(y_positions, values, height=bar_height, color=colors[:len(labels)])
-
-                # Add value labels at the end of horizontal bars
-                for i, bar in enumerate(bars):
-                    width = bar.get_width()
-                    # Position text at the end of the bar
-                    ax.text(width + 0.5, bar.get_y() + bar.get_height() / 2.,
-                            f'{int(width)}',
-                            ha='left', va='center', color='white', fontsize=10, weight='bold')
-
-                ax.set_yticks(y_positions)
-                ax.set_yticklabels(labels, color='white', fontsize=8)
-                ax.tick_params(axis='x', colors='white', labelsize=9)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(axis='x', alpha=0.3, color='white')
-                # Add some padding to the right for labels
-                ax.set_xlim(0, max(values) * 1.15 if values else 10)
-
-            canvas = FigureCanvasTkAgg(fig, master=frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill='both', expand=True, padx=5, pady=5)
+            # Drawn in a worker process; use larger height for horizontal bar charts with many items
+            figsize = (8, 8) if chart_type == "hbar" else (6.5, 5)
+            chart_renderer.show(f"company:{title}", frame, "company", title, chart_type, data,
+                                figsize=figsize, dpi=100)
 
         except Exception as e:
             error_label = ctk.CTkLabel(frame, text=f"Error: {str(e)[:50]}",
                                        font=("Arial", 10), text_color=COLORS["error"])
             error_label.pack(pady=10)
 
-    def get_industry_distribution(self, companies):
+    def get_industry_distribution(self, counters):
         """Get industry/sector distribution"""
-        sectors = {}
-        for company in companies:
-            sector = company.get("sector", "Unknown")
-            sectors[sector] = sectors.get(sector, 0) + 1
-
-        if not sectors:
-            return (["No Data"], [0])
+        return top_counts(counters.get("company_sectors", {}))
 
-        return (list(sectors.keys()), list(sectors.values()))
-
-    def get_company_package_distribution(self, companies):
+    def get_company_package_distribution(self, counters):
         """Get company package distribution"""
-        packages = {}
-        for company in companies:
-            pkg = company.get("package", "Unknown")
-            packages[pkg] = packages.get(pkg, 0) + 1
-
-        if not packages:
-            return (["No Data"], [0])
-
-        # Sort by package value
-        sorted_pkg = sorted(packages.items(), key=lambda x: x[1], reverse=True)[:8]
-        return (list(dict(sorted_pkg).keys()), list(dict(sorted_pkg).values()))
+        return top_counts(counters.get("company_package_buckets", {}))
 
     def get_top_companies_by_package(self, companies):
         """Get top 20 companies by package"""
-        import re
         company_packages = []
 
         for company in companies:
             name = company.get("company_name", "Unknown")
-            pkg = company.get("package", "0")
-
-            # Extract numeric value from package
-            numbers = re.findall(r'\d+', str(pkg))
-            if numbers:
-                try:
-                    pkg_num = float(numbers[0])
-                    company_packages.append((name, pkg_num))
-                except:
-                    pass
+            pkg_num = package_lpa_of(company)
+            if pkg_num is not None:
+                company_packages.append((name, pkg_num))
 
         if not company_packages:
             return (["No Data"], [0])
@@ -280,6 +256,7 @@ class CompanyManager:
         # Company Information Section - Compact 2-column layout
         company_frame = ctk.CTkFrame(tab, fg_color=COLORS["section_frame"], corner_radius=10)
         company_frame.pack(fill='x', padx=10, pady=5)
+        self.add_company_frame = company_frame
 
         ctk.CTkLabel(company_frame, text="🏢 COMPANY INFORMATION",
                      font=("Arial", 14, "bold"), text_color=COLORS["info"]).pack(pady=8)
@@ -332,7 +309,20 @@ class CompanyManager:
         # Submit button - compact
         submit_btn = ctk.CTkButton(tab, text="➕ ADD COMPANY", command=self.add_company,
                                    fg_color=COLORS["success"], font=("Arial", 14, "bold"), height=40, width=180)
-        submit_btn.pack(pady=15)
+        submit_btn.pack(pady=(15, 5))
+
+        # Many records at once from a spreadsheet
+        import_btn = ctk.CTkButton(tab, text="📥 BULK IMPORT (CSV/XLSX)", command=self.bulk_import_companies,
+                                   fg_color=COLORS["info"], font=("Arial", 12, "bold"), height=35, width=220)
+        import_btn.pack(pady=(0, 15))
+
+    def bulk_import_companies(self):
+        """Import companies from a CSV/XLSX file - upserted on company name"""
+        def on_done(result):
+            cache_sync.notify_write("company")
+            local_store.request_sync(["company"])  # Pull the imported rows into the local replica
+
+        bulk_importer.import_from_dialog(self.add_company_frame, "company", "Import Companies", on_done=on_done)
 
     def add_company(self):
         # Validate required fields using optimized validation
@@ -352,51 +342,54 @@ class CompanyManager:
             "contact_info": self.contact_info_var.get(),
             "hr_name": self.hr_name_var.get().upper(),
             "package": self.package_var.get().upper(),
+            "package_lpa": parse_package_lpa(self.package_var.get()),
             "website": self.company_website_var.get(),  # Keep website URL in original format
-            "address": self.address_var.get().upper()
+            "address": self.address_var.get().upper(),
+            SCHEMA_VERSION_FIELD: SCHEMA_VERSIONS["company"]
         }
 
-        try:
-            if self.collection is not None:
-                # Check for duplicate
-                existing = self.collection.find_one({
-                    "$or": [
-                        {"company_name": company_data["company_name"]},
-                        {"email": company_data["email"]}
-                    ]
-                })
-
-                if existing:
-                    # Ask user if they want to update existing record
-                    existing_name = existing.get("company_name", "Unknown")
-                    result = messagebox.askyesno("Duplicate Found", 
-                        f"A company with the same name or email already exists:\n\n"
-                        f"Existing: {existing_name}\n"
-                        f"New: {company_data['company_name']}\n\n"
-                        f"Do you want to UPDATE the existing record with new data?")
-                    
-                    if result:
-                        # Update existing record
-                        self.collection.update_one(
-                            {"_id": existing["_id"]},
-                            {"$set": company_data}
-                        )
-                        # Invalidate cache after updating company
-                        invalidate_cache('companies')
-                        messagebox.showinfo("Success", f"Company '{existing_name}' updated successfully!")
-                        self.clear_company_form()
-                    return
-
-                self.collection.insert_one(company_data)
-                # Invalidate cache after adding new company
-                invalidate_cache('companies')
-                messagebox.showinfo("Success", "Company added successfully!")
-                self.clear_company_form()
-            else:
-                messagebox.showerror("Error", "Database connection failed")
-        except Exception as e:
+        def on_error(e):
+            if isinstance(e, DuplicateKeyError):
+                messagebox.showerror("Duplicate Found", "Another company already has this name or email.")
+                return
             messagebox.showerror("Error", f"Failed to add company: {e}")
 
+        def on_duplicate_checked(existing):
+            if existing:
+                # Ask user if they want to update existing record
+                existing_name = existing.get("company_name", "Unknown")
+                result = messagebox.askyesno("Duplicate Found", 
+                    f"A company with the same name or email already exists:\n\n"
+                    f"Existing: {existing_name}\n"
+                    f"New: {company_data['company_name']}\n\n"
+                    f"Do you want to UPDATE the existing record with new data?")
+
+                if result:
+                    # Update existing record
+                    async_db.submit(self.add_company_frame, lambda: local_store.write_through(
+                                        "company", {"_id": existing["_id"]}, stats_counters.update_one,
+                                        self.writer(), "company", {"_id": existing["_id"]},
+                                        with_updated_at({"$set": with_search_tokens("company", company_data)})),
+                                    on_success=lambda _: on_saved(f"Company '{existing_name}' updated successfully!"),
+                                    on_error=on_error)
+                return
+
+            # Nothing matched - the record was inserted by the same call
+            on_saved("Company added successfully!")
+
+        def on_saved(message):
+            # Invalidate cache here and on the other clients after adding/updating company
+            cache_sync.notify_write("company")
+            messagebox.showinfo("Success", message)
+            self.clear_company_form()
+
+        # Insert unless the name or email is taken - one atomic round trip on the unique indexes
+        async_db.submit(self.add_company_frame, lambda: local_store.write_through(
+                            "company", {"company_name": company_data["company_name"]},
+                            stats_counters.insert_unless_exists, self.writer(), "company",
+                            with_search_tokens("company", company_data)),
+                        on_success=on_duplicate_checked, on_error=on_error, busy=self.connecting())
+
     def clear_company_form(self):
         # Clear all form fields
         for var in [self.company_name_var, self.company_email_var, self.contact_info_var,
@@ -466,7 +459,7 @@ class CompanyManager:
         search_row3 = ctk.CTkFrame(search_frame, fg_color=COLORS["section_frame"])
         search_row3.pack(fill='x', padx=20, pady=15)
 
-        ctk.CTkLabel(search_row3, text="Show Results:", font=("Arial", 12, "bold")).pack(side='left', padx=10)
+        ctk.CTkLabel(search_row3, text="Per Page:", font=("Arial", 12, "bold")).pack(side='left', padx=10)
         self.company_result_limit_var = ctk.StringVar(value="50")
         limit_options = ["10", "20", "50", "100", "All"]
         ctk.CTkOptionMenu(search_row3, variable=self.company_result_limit_var, values=limit_options,
@@ -510,70 +503,73 @@ class CompanyManager:
         for widget in self.company_results_frame.winfo_children():
             widget.destroy()
 
-        try:
-            if self.collection is not None:
-                query = {}
-                if search_term:
-                    if search_type == "name":
-                        # Search both old and new field names
-                        query = {"$or": [
-                            {"company_name": {"$regex": search_term, "$options": "i"}},
-                            {"company_Name": {"$regex": search_term, "$options": "i"}}
-                        ]}
-                    elif search_type == "email":
-                        query = {"email": {"$regex": search_term, "$options": "i"}}
-                    elif search_type == "hr":
-                        query = {"hr_name": {"$regex": search_term, "$options": "i"}}
-
-                # Fetch companies with optional limit, sorted by most recent
-                if limit:
-                    companies = list(self.collection.find(query).sort("_id", -1).limit(limit))
-                else:
-                    companies = list(self.collection.find(query).sort("_id", -1))
-
-                if not companies:
-                    ctk.CTkLabel(self.company_results_frame, text="No companies found",
-                                 font=("Arial", 14)).pack(pady=20)
-                    return
-
-                # Create table header with proper column widths
-                header_frame = ctk.CTkFrame(self.company_results_frame, fg_color=COLORS["info"], corner_radius=5)
-                header_frame.pack(fill='x', pady=5, padx=5)
-
-                headers = ["Company Name", "Email", "Contact", "HR Name", "Package", "Address"]
-                # Define column widths for better alignment
-                column_widths = [200, 200, 120, 150, 100, 200]
-
-                for i, (header, width) in enumerate(zip(headers, column_widths)):
-                    ctk.CTkLabel(header_frame, text=header, font=("Arial", 11, "bold"),
-                                 text_color="white", width=width, anchor="w").grid(row=0, column=i, padx=3, pady=8,
-                                                                                   sticky='ew')
-                    header_frame.grid_columnconfigure(i, minsize=width)
-
-                # Display companies
-                for company in companies:
-                    company_frame = ctk.CTkFrame(self.company_results_frame, fg_color=COLORS["section_frame"],
-                                                 corner_radius=5)
-                    company_frame.pack(fill='x', pady=2, padx=5)
-
-                    # Handle both old and new data structures
-                    data = [
-                        company.get("company_name", company.get("company_Name", "N/A")),
-                        company.get("email", "N/A"),
-                        company.get("contact_info", company.get("contact_no", "N/A")),
-                        company.get("hr_name", "N/A"),
-                        company.get("package", "N/A"),
-                        company.get("address", "N/A")
-                    ]
-
-                    for i, (value, width) in enumerate(zip(data, column_widths)):
-                        ctk.CTkLabel(company_frame, text=value, font=("Arial", 10),
-                                     width=width, anchor="w").grid(row=0, column=i, padx=3, pady=5, sticky='ew')
-                        company_frame.grid_columnconfigure(i, minsize=width)
+        query = {}
+        if search_term:
+            # Indexed token prefix search (covers both old and new field names)
+            search_keys = {"name": "company_name", "email": "email", "hr": "hr_name"}
+            if search_type in search_keys:
+                query = build_search_query("company", {search_keys[search_type]: search_term})
+
+        def fetch():
+            source = self.reader()
+            if source is None:
+                raise ConnectionError("Database connection failed")
+            # Fetch companies with optional limit, sorted by most recent
+            pager = KeysetPager(source, query, page_size=limit or PAGE_SIZE)
+            if limit:
+                return pager.next_page()
+            return [company for page in pager.pages() for company in page]
 
-            else:
-                ctk.CTkLabel(self.company_results_frame, text="Database connection failed",
+        def on_error(e):
+            ctk.CTkLabel(self.company_results_frame, text=f"Error loading companies: {e}",
+                         font=("Arial", 14)).pack(pady=20)
+
+        async_db.submit(self.company_results_frame, fetch, on_success=self.render_company_list,
+                        on_error=on_error, key="company_results", busy=self.connecting())
+
+    def render_company_list(self, companies):
+        """Render the simple company list produced by load_companies"""
+        try:
+            if not companies:
+                ctk.CTkLabel(self.company_results_frame, text="No companies found",
                              font=("Arial", 14)).pack(pady=20)
+                return
+
+            # Create table header with proper column widths
+            header_frame = ctk.CTkFrame(self.company_results_frame, fg_color=COLORS["info"], corner_radius=5)
+            header_frame.pack(fill='x', pady=5, padx=5)
+
+            headers = ["Company Name", "Email", "Contact", "HR Name", "Package", "Address"]
+            # Define column widths for better alignment
+            column_widths = [200, 200, 120, 150, 100, 200]
+
+            for i, (header, width) in enumerate(zip(headers, column_widths)):
+                ctk.CTkLabel(header_frame, text=header, font=("Arial", 11, "bold"),
+                             text_color="white", width=width, anchor="w").grid(row=0, column=i, padx=3, pady=8,
+                                                                               sticky='ew')
+                header_frame.grid_columnconfigure(i, minsize=width)
+
+            # Display companies
+            for company in companies:
+                company_frame = ctk.CTkFrame(self.company_results_frame, fg_color=COLORS["section_frame"],
+                                             corner_radius=5)
+                company_frame.pack(fill='x', pady=2, padx=5)
+
+                # Handle both old and new data structures
+                data = [
+                    company.get("company_name", "N/A"),
+                    company.get("email", "N/A"),
+                    company.get("contact_info", "N/A"),
+                    company.get("hr_name", "N/A"),
+                    company.get("package", "N/A"),
+                    company.get("address", "N/A")
+                ]
+
+                for i, (value, width) in enumerate(zip(data, column_widths)):
+                    ctk.CTkLabel(company_frame, text=value, font=("Arial", 10),
+                                 width=width, anchor="w").grid(row=0, column=i, padx=3, pady=5, sticky='ew')
+                    company_frame.grid_columnconfigure(i, minsize=width)
+
         except Exception as e:
             ctk.CTkLabel(self.company_results_frame, text=f"Error loading companies: {e}",
                          font=("Arial", 14)).pack(pady=20)
@@ -603,14 +599,22 @@ class CompanyManager:
         """Optimized advanced search with multiple filters"""
         batch_clear_widgets(self.company_results_frame)
 
-        # Show loading indicator
-        loading_label = ctk.CTkLabel(self.company_results_frame, text="⏳ Searching companies...",
+        # Show loading indicator - the first search may still be waiting on the DB handshake
+        text = "⏳ Connecting to database..." if self.connecting() else "⏳ Searching companies..."
+        loading_label = ctk.CTkLabel(self.company_results_frame, text=text,
                                      font=("Arial", 16, "bold"), text_color=COLORS["info"])
         loading_label.pack(pady=50)
-        self.company_results_frame.update()
 
+        # Bind the collection on a worker, then build the table here
+        async_db.submit(self.company_results_frame, self.reader,
+                        on_success=lambda source: self.show_company_search(source, loading_label),
+                        on_error=lambda e: self.show_company_search_error(e, loading_label),
+                        key="company_search_source")
+
+    def show_company_search(self, source, loading_label):
+        """Run the advanced search against source once it is bound"""
         try:
-            if self.collection is None:
+            if source is None:
                 loading_label.destroy()
                 ctk.CTkLabel(self.company_results_frame, text="Database connection failed",
                              font=("Arial", 14)).pack(pady=20)
@@ -624,34 +628,20 @@ class CompanyManager:
                 "contact_info": self.search_contact_var.get().strip()
             }
             
-            # Build base query
+            # Build base query - indexed token prefix search, legacy field names included
             query_conditions = []
-            for field, value in filters.items():
-                if value:
-                    if field == "company_name":
-                        # Handle both old and new field names
-                        query_conditions.append({"$or": [
-                            {"company_name": {"$regex": value, "$options": "i"}},
-                            {"company_Name": {"$regex": value, "$options": "i"}}
-                        ]})
-                    elif field == "contact_info":
-                        # Handle both old and new field names
-                        query_conditions.append({"$or": [
-                            {"contact_info": {"$regex": value, "$options": "i"}},
-                            {"contact_no": {"$regex": value, "$options": "i"}}
-                        ]})
-                    else:
-                        query_conditions.append({field: {"$regex": value, "$options": "i"}})
-
-            # Package filter with optimized numeric extraction
+            text_query = build_search_query("company", filters)
+            if text_query:
+                query_conditions.append(text_query)
+
+            # Package filter - indexed range query on the normalized package_lpa field
             package = self.search_package_var.get().strip()
             if package:
-                package_num = extract_numeric_value(package)
-                if package_num > 0:
-                    # Use regex to find packages with this number
-                    query_conditions.append({"package": {"$regex": str(int(package_num)), "$options": "i"}})
+                package_lpa = parse_package_lpa(package)
+                if package_lpa:
+                    query_conditions.append({"package_lpa": {"$gte": package_lpa}})
                 else:
-                    query_conditions.append({"package": {"$regex": package, "$options": "i"}})
+                    query_conditions.append({"package": {"$regex": re.escape(package), "$options": "i"}})
 
             query = {"$and": query_conditions} if query_conditions else {}
 
@@ -661,70 +651,44 @@ class CompanyManager:
 
             # Optimized database query with projection
             projection = {
-                "company_name": 1, "company_Name": 1, "email": 1, "contact_info": 1, 
-                "contact_no": 1, "hr_name": 1, "package": 1, "website": 1, "address": 1
+                "company_name": 1, "email": 1, "contact_info": 1,
+                "hr_name": 1, "package": 1, "package_lpa": 1, "website": 1, "address": 1
             }
             
-            cursor = self.collection.find(query, projection).sort("_id", -1)
-            if limit:
-                cursor = cursor.limit(limit)
-            
-            companies = list(cursor)
-
-            # Client-side package filtering if numeric threshold provided
-            if package:
-                package_threshold = extract_numeric_value(package)
-                if package_threshold > 0:
-                    companies = self._filter_companies_by_package(companies, package_threshold)
-
-            loading_label.destroy()
-
-            if not companies:
-                ctk.CTkLabel(self.company_results_frame, text="❌ No companies found matching your criteria",
-                             font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
-                return
+            def company_source(sort):
+                # "All" streams keyset pages on scroll, otherwise one page at a time with Prev/Next
+                self.company_pager = KeysetPager(source, query, projection,
+                                                 page_size=limit or PAGE_SIZE, sort=sort)
+                return pager_source(self.company_pager, single=bool(limit))
 
             # Format filter info efficiently
             filter_text = format_filter_info(filters)
             if package:
                 filter_text += f" | Package: {package}"
 
-            # Store current companies for export
-            self.current_companies = companies
+            self.current_companies = []
 
-            # Create professional table
-            self.create_professional_company_table(companies, filter_text)
+            # Create professional table - rows are paged in as the user scrolls
+            self.create_professional_company_table(company_source, filter_text, loading_label, paged=bool(limit))
 
         except Exception as e:
-            if 'loading_label' in locals():
-                loading_label.destroy()
-            ctk.CTkLabel(self.company_results_frame, text=f"Error searching companies: {e}",
-                         font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
+            self.show_company_search_error(e, loading_label)
 
-    def _filter_companies_by_package(self, companies, threshold):
-        """Efficiently filter companies by package threshold - O(n) single pass"""
-        filtered = []
-        for comp in companies:
-            comp_package = comp.get("package", "")
-            if comp_package:
-                comp_package_num = extract_numeric_value(comp_package)
-                # Convert LPA to actual amount if needed
-                if "lpa" in str(comp_package).lower():
-                    comp_package_num *= 100000
-                if comp_package_num >= threshold:
-                    filtered.append(comp)
-            else:
-                filtered.append(comp)  # Include companies without package info
-        return filtered
+    def show_company_search_error(self, error, loading_label):
+        if loading_label.winfo_exists():
+            loading_label.destroy()
+        ctk.CTkLabel(self.company_results_frame, text=f"Error searching companies: {error}",
+                     font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
 
-    def create_professional_company_table(self, companies, filter_text=""):
-        """Create a high-performance professional table using ttk.Treeview for companies"""
-        import tkinter as tk
+    def create_professional_company_table(self, company_source, filter_text="", loading_label=None, paged=False):
+        """Create a virtualized professional table using ttk.Treeview for companies"""
         from tkinter import ttk
+        import webbrowser
+
+        self.company_table_paged = paged
 
         # Create table container
         table_container = ctk.CTkFrame(self.company_results_frame, fg_color=COLORS["content_frame"])
-        table_container.pack(fill='both', expand=True, padx=5, pady=5)
 
         # Configure ttk style for dark theme
         style = ttk.Style()
@@ -752,36 +716,6 @@ class CompanyManager:
             background=[("active", "#2980b9")]
         )
 
-        # Define columns
-        columns = ("idx", "company_name", "email", "contact", "hr_name", "package", "website", "address")
-
-        # Store website URLs for click handling
-        self.company_website_urls = {}
-
-        # Create Treeview with scrollbars
-        tree_frame = tk.Frame(table_container, bg="#1e1e1e")
-        tree_frame.pack(fill='both', expand=True)
-
-        # Scrollbars
-        v_scroll = ttk.Scrollbar(tree_frame, orient="vertical")
-        v_scroll.pack(side="right", fill="y")
-
-        h_scroll = ttk.Scrollbar(tree_frame, orient="horizontal")
-        h_scroll.pack(side="bottom", fill="x")
-
-        # Create Treeview
-        self.company_tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show="headings",
-            style="Company.Treeview",
-            yscrollcommand=v_scroll.set,
-            xscrollcommand=h_scroll.set
-        )
-
-        v_scroll.config(command=self.company_tree.yview)
-        h_scroll.config(command=self.company_tree.xview)
-
         # Define column headings and widths
         col_config = [
             ("idx", "#", 50),
@@ -794,11 +728,72 @@ class CompanyManager:
             ("address", "Address", 200)
         ]
 
-        for col_id, heading, width in col_config:
-            self.company_tree.heading(col_id, text=heading, anchor="center")
-            self.company_tree.column(col_id, width=width, minwidth=width, anchor="center")
+        # Header click sorts on the server by these fields
+        sort_fields = {
+            "company_name": "company_name", "email": "email", "hr_name": "hr_name",
+            "package": "package_lpa", "address": "address"
+        }
+
+        def format_row(company, idx):
+            # Handle both old and new data structures
+            website_url = company.get("website", "")
+            website_display = "🔗 Click" if website_url and website_url.strip() else "N/A"
+            values = (
+                idx,
+                company.get("company_name", "N/A"),
+                company.get("email", "N/A"),
+                company.get("contact_info", "N/A"),
+                company.get("hr_name", "N/A"),
+                company.get("package", "N/A"),
+                website_display,
+                company.get("address", "N/A")
+            )
+            # Color code by package tier
+            package_tier = package_tag(company)
+            return values, [package_tier] if package_tier else []
 
-        self.company_tree.pack(fill='both', expand=True)
+        # Info bar at bottom
+        info_frame = ctk.CTkFrame(self.company_results_frame, fg_color=COLORS["section_frame"], height=40)
+        info_label = ctk.CTkLabel(info_frame, text="", font=("Arial", 10, "bold"), text_color=COLORS["success"])
+        info_label.pack(side='left', padx=10, pady=8)
+        navigator = None
+
+        def on_page(table):
+            if loading_label is not None and loading_label.winfo_exists():
+                loading_label.destroy()
+            if table.exhausted and not table.docs:
+                table_container.destroy()
+                info_frame.destroy()
+                ctk.CTkLabel(self.company_results_frame, text="❌ No companies found matching your criteria",
+                             font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
+                return
+            if not table_container.winfo_ismapped():
+                table_container.pack(fill='both', expand=True, padx=5, pady=5)
+                info_frame.pack(fill='x', padx=5, pady=3)
+                info_frame.pack_propagate(False)
+
+            # Store current companies for export
+            self.current_companies = table.docs
+            if navigator:
+                navigator.update()
+                count_text = f"Showing {len(table.docs)}"
+            else:
+                count_text = f"Found {len(table.docs)}" if table.exhausted else f"Loaded {len(table.docs)}"
+            info_label.configure(
+                text=f"📊 {count_text} companies | Filters: {filter_text} | Scroll with mouse wheel, click a heading to sort"
+            )
+
+        self.company_table = VirtualTreeview(
+            table_container, col_config, "Company.Treeview", 35, format_row, company_source,
+            sort_fields=sort_fields, on_page=on_page,
+            on_error=lambda e: self.show_company_search_error(e, loading_label)
+        )
+        self.company_table.pack(fill='both', expand=True)
+        self.company_tree = self.company_table.tree
+
+        if paged:
+            navigator = PageNavigator(info_frame, self.company_table, lambda: self.company_pager)
+            navigator.pack(side='right', padx=10)
 
         # Configure row tags for alternating colors
         self.company_tree.tag_configure("oddrow", background="#2b2b2b")
@@ -806,77 +801,17 @@ class CompanyManager:
         self.company_tree.tag_configure("high_package", foreground="#2CC985")
         self.company_tree.tag_configure("medium_package", foreground="#F39C12")
 
-        # Insert data
-        import webbrowser
-        for idx, company in enumerate(companies, 1):
-            try:
-                # Handle both old and new data structures
-                company_name = company.get("company_name", company.get("company_Name", "N/A"))
-                email = company.get("email", "N/A")
-                contact = company.get("contact_info", company.get("contact_no", "N/A"))
-                hr_name = company.get("hr_name", "N/A")
-                package = company.get("package", "N/A")
-                website_url = company.get("website", "")
-                website_display = "🔗 Click" if website_url and website_url.strip() else "N/A"
-                address = company.get("address", "N/A")
-
-                values = (idx, company_name, email, contact, hr_name, package, website_display, address)
-
-                # Determine row tags
-                tags = ["oddrow"] if idx % 2 == 1 else ["evenrow"]
-
-                # Color code by package (try to extract numeric value)
-                try:
-                    import re
-                    numbers = re.findall(r'\d+\.?\d*', str(package))
-                    if numbers:
-                        pkg_val = float(numbers[0])
-                        if "lpa" in str(package).lower():
-                            pkg_val = pkg_val * 100000
-                        if pkg_val >= 1000000:  # >= 10 LPA
-                            tags.append("high_package")
-                        elif pkg_val >= 500000:  # >= 5 LPA
-                            tags.append("medium_package")
-                except:
-                    pass
-
-                item_id = self.company_tree.insert("", "end", values=values, tags=tags)
-
-                # Store website URL for this row
-                if website_url and website_url.strip():
-                    self.company_website_urls[item_id] = website_url
-
-            except Exception as e:
-                print(f"Error processing company {idx}: {e}")
-
         # Bind click on Website column to open URL
         def on_click(event):
             region = self.company_tree.identify_region(event.x, event.y)
             if region == "cell":
                 item = self.company_tree.identify_row(event.y)
                 column = self.company_tree.identify_column(event.x)
-                if column == "#7" and item in self.company_website_urls:  # Website column
-                    webbrowser.open(self.company_website_urls[item])
+                company = self.company_table.row_at(item)
+                if column == "#7" and company and (company.get("website") or "").strip():  # Website column
+                    webbrowser.open(company["website"])
 
-        self.company_tree.bind("<Button-1>", on_click)
-
-        # Mouse wheel scrolling
-        def on_mousewheel(event):
-            self.company_tree.yview_scroll(int(-1*(event.delta/120)), "units")
-
-        self.company_tree.bind("<MouseWheel>", on_mousewheel)
-
-        # Info bar at bottom
-        info_frame = ctk.CTkFrame(self.company_results_frame, fg_color=COLORS["section_frame"], height=40)
-        info_frame.pack(fill='x', padx=5, pady=3)
-        info_frame.pack_propagate(False)
-
-        ctk.CTkLabel(
-            info_frame,
-            text=f"📊 Found {len(companies)} companies | Filters: {filter_text} | Scroll with mouse wheel",
-            font=("Arial", 10, "bold"),
-            text_color=COLORS["success"]
-        ).pack(side='left', padx=10, pady=8)
+        self.company_tree.bind("<Button-1>", on_click, add="+")
 
     def setup_edit_company_tab(self, tab):
         # Title
@@ -924,54 +859,39 @@ class CompanyManager:
         for widget in self.edit_company_form_frame.winfo_children():
             widget.destroy()
 
-        try:
-            if self.collection is not None:
-                # Build query based on inputs
-                if company_name and email:
-                    # Both fields - exact match
-                    companies = list(self.collection.find({
-                        "company_name": {"$regex": company_name, "$options": "i"},
-                        "email": {"$regex": email, "$options": "i"}
-                    }))
-                elif company_name:
-                    # Only company name - show all matching
-                    companies = list(self.collection.find({
-                        "company_name": {"$regex": company_name, "$options": "i"}
-                    }))
-                else:
-                    # Only email
-                    companies = list(self.collection.find({
-                        "email": {"$regex": email, "$options": "i"}
-                    }))
-
-                if not companies:
-                    ctk.CTkLabel(self.edit_company_form_frame, text="❌ No companies found",
-                                 font=("Arial", 12), text_color=COLORS["error"]).pack(pady=20)
-                    return
-
-                if len(companies) == 1:
-                    # Single result - show edit form directly
-                    self.show_edit_company_form(companies[0])
-                else:
-                    # Multiple results - show list to select
-                    ctk.CTkLabel(self.edit_company_form_frame, 
-                                 text=f"📋 Found {len(companies)} companies - Click to edit:",
-                                 font=("Arial", 12, "bold"), text_color=COLORS["info"]).pack(pady=5)
+        # Build query based on inputs - whichever fields were filled must match
+        query = build_search_query("company", {"company_name": company_name, "email": email})
 
-                    for company in companies:
-                        row = ctk.CTkFrame(self.edit_company_form_frame, fg_color=COLORS["section_frame"], corner_radius=8)
-                        row.pack(fill='x', padx=5, pady=2)
+        async_db.submit(self.edit_company_form_frame, self.find_all, query,
+                        on_success=self.show_companies_for_edit,
+                        on_error=lambda e: messagebox.showerror("Error", f"Failed to search company: {e}"),
+                        key="company_edit_search", busy=self.connecting())
 
-                        info = f"🏢 {company['company_name']}  |  📧 {company['email']}  |  👔 {company['hr_name']}  |  💰 {company['package']}"
-                        ctk.CTkLabel(row, text=info, font=("Arial", 10)).pack(side='left', padx=10, pady=5)
+    def show_companies_for_edit(self, companies):
+        if not companies:
+            ctk.CTkLabel(self.edit_company_form_frame, text="❌ No companies found",
+                         font=("Arial", 12), text_color=COLORS["error"]).pack(pady=20)
+            return
 
-                        ctk.CTkButton(row, text="✏️ EDIT", command=lambda c=company: self.show_edit_company_form(c),
-                                      fg_color=COLORS["warning"], font=("Arial", 10, "bold"), 
-                                      height=28, width=70).pack(side='right', padx=5, pady=3)
-            else:
-                messagebox.showerror("Error", "Database connection failed")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to search company: {e}")
+        if len(companies) == 1:
+            # Single result - show edit form directly
+            self.show_edit_company_form(companies[0])
+        else:
+            # Multiple results - show list to select
+            ctk.CTkLabel(self.edit_company_form_frame, 
+                         text=f"📋 Found {len(companies)} companies - Click to edit:",
+                         font=("Arial", 12, "bold"), text_color=COLORS["info"]).pack(pady=5)
+
+            for company in companies:
+                row = ctk.CTkFrame(self.edit_company_form_frame, fg_color=COLORS["section_frame"], corner_radius=8)
+                row.pack(fill='x', padx=5, pady=2)
+
+                info = f"🏢 {company['company_name']}  |  📧 {company['email']}  |  👔 {company['hr_name']}  |  💰 {company['package']}"
+                ctk.CTkLabel(row, text=info, font=("Arial", 10)).pack(side='left', padx=10, pady=5)
+
+                ctk.CTkButton(row, text="✏️ EDIT", command=lambda c=company: self.show_edit_company_form(c),
+                              fg_color=COLORS["warning"], font=("Arial", 10, "bold"), 
+                              height=28, width=70).pack(side='right', padx=5, pady=3)
 
     def show_edit_company_form(self, company):
         # Clear previous form
@@ -1058,26 +978,32 @@ class CompanyManager:
             "contact_info": self.edit_contact_info_var.get(),
             "hr_name": self.edit_hr_name_var.get().upper(),
             "package": self.edit_package_var.get().upper(),
+            "package_lpa": parse_package_lpa(self.edit_package_var.get()),
             "website": self.edit_website_var.get(),
-            "address": self.edit_address_var.get().upper()
+            "address": self.edit_address_var.get().upper(),
+            SCHEMA_VERSION_FIELD: SCHEMA_VERSIONS["company"]
         }
 
-        try:
-            if self.collection is not None:
-                self.collection.update_one(
-                    {"_id": self.current_edit_company_id},
-                    {"$set": updated_data}
-                )
-                messagebox.showinfo("Success", "Company updated successfully!")
-                # Clear edit form
-                for widget in self.edit_company_form_frame.winfo_children():
-                    widget.destroy()
-                self.edit_company_search_var.set("")
-            else:
-                messagebox.showerror("Error", "Database connection failed")
-        except Exception as e:
+        def on_updated(_):
+            cache_sync.notify_write("company")
+            messagebox.showinfo("Success", "Company updated successfully!")
+            # Clear edit form
+            for widget in self.edit_company_form_frame.winfo_children():
+                widget.destroy()
+            self.edit_company_search_var.set("")
+
+        def on_error(e):
+            if isinstance(e, DuplicateKeyError):
+                messagebox.showerror("Duplicate Found", "Another company already has this name or email.")
+                return
             messagebox.showerror("Error", f"Failed to update company: {e}")
 
+        company_id = self.current_edit_company_id
+        async_db.submit(self.edit_company_form_frame, lambda: local_store.write_through(
+                            "company", {"_id": company_id}, stats_counters.update_one, self.writer(), "company",
+                            {"_id": company_id}, with_updated_at({"$set": with_search_tokens("company", updated_data)})),
+                        on_success=on_updated, on_error=on_error, busy=self.connecting())
+
     def setup_delete_company_tab(self, tab):
         # Title
         title_label = ctk.CTkLabel(tab, text="🗑️ DELETE COMPANY",
@@ -1135,365 +1061,133 @@ class CompanyManager:
             messagebox.showerror("Error", "Please enter at least Company Name or Contact Info")
             return
 
-        try:
-            if self.collection is not None:
-                # Build query
-                query_conditions = []
-                if name:
-                    query_conditions.append({"company_name": {"$regex": name, "$options": "i"}})
-                if contact:
-                    query_conditions.append({
-                        "$or": [
-                            {"email": contact},
-                            {"contact_info": contact}
-                        ]
-                    })
-
-                if len(query_conditions) == 2:
-                    query = {"$and": query_conditions}
-                else:
-                    query = query_conditions[0]
-
-                companies = list(self.collection.find(query))
-
-                # Clear previous results efficiently
-                batch_clear_widgets(self.delete_company_results_frame)
-
-                if not companies:
-                    ctk.CTkLabel(self.delete_company_results_frame, text="❌ No companies found matching criteria",
-                                 font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
-                    return
-
-                # Display found companies
-                for company in companies:
-                    company_card = ctk.CTkFrame(self.delete_company_results_frame, fg_color=COLORS["section_frame"],
-                                                corner_radius=10)
-                    company_card.pack(fill='x', padx=5, pady=5)
-
-                    info_text = (
-                        f"Company: {company['company_name']}\n"
-                        f"Email: {company['email']}\n"
-                        f"Contact: {company['contact_info']}\n"
-                        f"HR Name: {company['hr_name']}\n"
-                        f"Package: {company['package']}"
-                    )
+        # Build query
+        query_conditions = []
+        if name:
+            query_conditions.append(build_search_query("company", {"company_name": name}))
+        if contact:
+            query_conditions.append({
+                "$or": [
+                    {"email": contact},
+                    {"contact_info": contact}
+                ]
+            })
+
+        if len(query_conditions) == 2:
+            query = {"$and": query_conditions}
+        else:
+            query = query_conditions[0]
+
+        async_db.submit(self.delete_company_results_frame, self.find_all, query, busy=self.connecting(),
+                        on_success=self.show_companies_for_delete,
+                        on_error=lambda e: messagebox.showerror("Error", f"Search failed: {e}"),
+                        key="company_delete_search")
+
+    def show_companies_for_delete(self, companies):
+        # Clear previous results efficiently
+        batch_clear_widgets(self.delete_company_results_frame)
+
+        if not companies:
+            ctk.CTkLabel(self.delete_company_results_frame, text="❌ No companies found matching criteria",
+                         font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
+            return
 
-                    ctk.CTkLabel(company_card, text=info_text, font=("Arial", 12), justify="left").pack(padx=20,
-                                                                                                        pady=15)
+        # Display found companies
+        for company in companies:
+            company_card = ctk.CTkFrame(self.delete_company_results_frame, fg_color=COLORS["section_frame"],
+                                        corner_radius=10)
+            company_card.pack(fill='x', padx=5, pady=5)
+
+            info_text = (
+                f"Company: {company['company_name']}\n"
+                f"Email: {company['email']}\n"
+                f"Contact: {company['contact_info']}\n"
+                f"HR Name: {company['hr_name']}\n"
+                f"Package: {company['package']}"
+            )
 
-                    delete_btn = ctk.CTkButton(company_card, text="🗑️ DELETE THIS COMPANY",
-                                               command=lambda c=company: self.confirm_delete_company(c),
-                                               fg_color=COLORS["error"], font=("Arial", 12, "bold"), height=40)
-                    delete_btn.pack(padx=20, pady=10)
+            ctk.CTkLabel(company_card, text=info_text, font=("Arial", 12), justify="left").pack(padx=20,
+                                                                                                pady=15)
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed: {e}")
+            delete_btn = ctk.CTkButton(company_card, text="🗑️ DELETE THIS COMPANY",
+                                       command=lambda c=company: self.confirm_delete_company(c),
+                                       fg_color=COLORS["error"], font=("Arial", 12, "bold"), height=40)
+            delete_btn.pack(padx=20, pady=10)
 
     def confirm_delete_company(self, company):
         """Confirm and delete company"""
-        if messagebox.askyesno("Confirm Delete",
-                               f"Are you sure you want to delete:\n{company['company_name']}?\n\nThis action cannot be undone!"):
-            try:
-                if self.collection is not None:
-                    self.collection.delete_one({"_id": company["_id"]})
-                    messagebox.showinfo("Success", "Company deleted successfully!")
-                    self.delete_company_name_var.set("")
-                    self.delete_company_contact_var.set("")
-                    # Refresh results efficiently
-                    batch_clear_widgets(self.delete_company_results_frame)
-                else:
-                    messagebox.showerror("Error", "Database connection failed")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete company: {e}")
+        if not messagebox.askyesno("Confirm Delete",
+                                   f"Are you sure you want to delete:\n{company['company_name']}?\n\nThis action cannot be undone!"):
+            return
+
+        def on_deleted(_):
+            cache_sync.notify_write("company")
+            messagebox.showinfo("Success", "Company deleted successfully!")
+            self.delete_company_name_var.set("")
+            self.delete_company_contact_var.set("")
+            # Refresh results efficiently
+            batch_clear_widgets(self.delete_company_results_frame)
+
+        async_db.submit(self.delete_company_results_frame, lambda: local_store.delete_through(
+                            "company", stats_counters.delete_one, self.writer(), "company", {"_id": company["_id"]}),
+                        on_success=on_deleted, busy=self.connecting(),
+                        on_error=lambda e: messagebox.showerror("Error", f"Failed to delete company: {e}"))
+
+    def company_export_source(self):
+        """(rows, count) for exports - the page on screen when paged, else a cursor over the whole search
+
+        count() is called on the worker thread.
+        """
+        if self.company_table_paged:
+            docs = list(self.current_companies)
+            return docs, lambda: len(docs)
+        return self.company_pager.cursor(batch_size=EXPORT_CHUNK_SIZE), self.company_pager.count
 
     def export_companies_excel(self):
         """Export companies to Excel file"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from datetime import datetime
-
-            # Get companies from stored data
-            if not hasattr(self, 'current_companies') or not self.current_companies:
-                messagebox.showwarning("No Data", "No companies to export. Please search first.")
-                return
-
-            companies = self.current_companies
-
-            # Create workbook
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Companies"
-
-            # Add headers
-            headers = ["Company Name", "Email", "Contact", "HR Name", "Package", "Address"]
-            ws.append(headers)
+        # Get companies from stored data
+        if not hasattr(self, 'current_companies') or not self.current_companies:
+            messagebox.showwarning("No Data", "No companies to export. Please search first.")
+            return
 
-            # Style header
-            header_fill = PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
+        rows, count = self.company_export_source()
 
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+        def write(filename, job):
+            job.total = count()
+            return write_table(filename, "Companies", COMPANY_EXPORT_COLUMNS, rows, job)
 
-            # Add data
-            for company in companies:
-                ws.append([
-                    company.get("company_name", company.get("company_Name", "")),
-                    company.get("email", ""),
-                    company.get("contact_info", company.get("contact_no", "")),
-                    company.get("hr_name", ""),
-                    company.get("package", ""),
-                    company.get("address", "")
-                ])
-
-            # Adjust column widths
-            ws.column_dimensions['A'].width = 25
-            ws.column_dimensions['B'].width = 25
-            ws.column_dimensions['C'].width = 15
-            ws.column_dimensions['D'].width = 20
-            ws.column_dimensions['E'].width = 15
-            ws.column_dimensions['F'].width = 30
-
-            # Open Save As dialog
-            from tkinter import filedialog
-            default_filename = f"companies_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                initialfile=default_filename,
-                title="Save Companies As"
-            )
-            
-            if not filename:  # User cancelled
-                return
-                
-            wb.save(filename)
-            messagebox.showinfo("Success", f"Companies exported to:\n{filename}")
-        except ImportError:
-            messagebox.showerror("Error", "openpyxl library not installed. Install it using: pip install openpyxl")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export to Excel: {e}")
+        excel_exporter.export(self.company_results_frame, "companies", "Save Companies As", write,
+                              "Companies exported")
 
     def export_companies_csv(self):
-        """Export companies to CSV file"""
-        try:
-            import csv
-            from datetime import datetime
-            from tkinter import filedialog
-
-            # Get companies from stored data
-            if not hasattr(self, 'current_companies') or not self.current_companies:
-                messagebox.showwarning("No Data", "No companies to export. Please search first.")
-                return
-
-            companies = self.current_companies
-
-            # Open Save As dialog
-            default_filename = f"companies_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                initialfile=default_filename,
-                title="Save Companies As"
-            )
-            
-            if not filename:  # User cancelled
-                return
-
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ["Company Name", "Email", "Contact", "HR Name", "Package", "Address"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                for company in companies:
-                    writer.writerow({
-                        "Company Name": company.get("company_name", company.get("company_Name", "")),
-                        "Email": company.get("email", ""),
-                        "Contact": company.get("contact_info", company.get("contact_no", "")),
-                        "HR Name": company.get("hr_name", ""),
-                        "Package": company.get("package", ""),
-                        "Address": company.get("address", "")
-                    })
-
-            messagebox.showinfo("Success", f"Companies exported to:\n{filename}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export to CSV: {e}")
+        """Export companies to CSV - streamed from the database, not the rows loaded in the table"""
+        pager = getattr(self, 'company_pager', None)
+        # The last search's query and order, or every company when nothing has been searched yet
+        query = pager.filter if pager is not None else {}
+        sort = [(pager.field, pager.direction)] if pager is not None else [("_id", -1)]
+        csv_exporter.export_query(self.company_results_frame, "companies", "Save Companies As",
+                                  self.writer, query, COMPANY_EXPORT_COLUMNS, "Companies exported", sort=sort)
 
     def export_company_charts_to_excel(self):
         """Export company chart data to Excel with charts"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-            from openpyxl.chart import PieChart, BarChart, Reference
-            from openpyxl.chart.label import DataLabelList
-            from datetime import datetime
-            from tkinter import filedialog
-
-            if not hasattr(self, 'current_chart_data') or not self.current_chart_data:
-                messagebox.showwarning("No Data", "No chart data to export. Please load charts first.")
-                return
-
-            companies = self.current_chart_data.get('companies', [])
-            if not companies:
-                messagebox.showwarning("No Data", "No company data to export.")
-                return
-
-            # Open Save As dialog
-            default_filename = f"company_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                initialfile=default_filename,
-                title="Save Company Analytics As"
-            )
-
-            if not filename:  # User cancelled
-                return
-
-            # Create workbook
-            wb = openpyxl.Workbook()
-
-            # Styles
-            header_fill = PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=12)
-            thin_border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
+        if not hasattr(self, 'current_chart_data') or not self.current_chart_data:
+            messagebox.showwarning("No Data", "No chart data to export. Please load charts first.")
+            return
 
-            # ========== Sheet 1: Industry Type Distribution (Pie Chart) ==========
-            ws1 = wb.active
-            ws1.title = "Industry Distribution"
-            ws1.append(["Industry Type", "Number of Companies"])
-
-            industry_labels, industry_counts = self.get_industry_distribution(companies)
-            for i in range(len(industry_labels)):
-                ws1.append([industry_labels[i], industry_counts[i]])
-
-            for cell in ws1[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            for row in ws1.iter_rows(min_row=2, max_row=ws1.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws1.column_dimensions['A'].width = 25
-            ws1.column_dimensions['B'].width = 22
-
-            # Create Pie Chart
-            if len(industry_labels) > 0:
-                pie_chart = PieChart()
-                pie_chart.title = "Industry Type Distribution"
-                data = Reference(ws1, min_col=2, min_row=1, max_row=len(industry_labels) + 1)
-                cats = Reference(ws1, min_col=1, min_row=2, max_row=len(industry_labels) + 1)
-                pie_chart.add_data(data, titles_from_data=True)
-                pie_chart.set_categories(cats)
-                pie_chart.dataLabels = DataLabelList()
-                pie_chart.dataLabels.showPercent = True
-                pie_chart.width = 15
-                pie_chart.height = 10
-                ws1.add_chart(pie_chart, "D2")
-
-            # ========== Sheet 2: Company Package Distribution (Bar Chart) ==========
-            ws2 = wb.create_sheet("Package Distribution")
-            ws2.append(["Package Range", "Number of Companies"])
-
-            package_labels, package_counts = self.get_company_package_distribution(companies)
-            for i in range(len(package_labels)):
-                ws2.append([package_labels[i], package_counts[i]])
-
-            for cell in ws2[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            for row in ws2.iter_rows(min_row=2, max_row=ws2.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws2.column_dimensions['A'].width = 20
-            ws2.column_dimensions['B'].width = 22
-
-            # Create Bar Chart
-            if len(package_labels) > 0:
-                bar_chart = BarChart()
-                bar_chart.title = "Company Package Distribution"
-                bar_chart.type = "col"
-                bar_chart.style = 10
-                data = Reference(ws2, min_col=2, min_row=1, max_row=len(package_labels) + 1)
-                cats = Reference(ws2, min_col=1, min_row=2, max_row=len(package_labels) + 1)
-                bar_chart.add_data(data, titles_from_data=True)
-                bar_chart.set_categories(cats)
-                bar_chart.dataLabels = DataLabelList()
-                bar_chart.dataLabels.showVal = True
-                bar_chart.width = 15
-                bar_chart.height = 10
-                ws2.add_chart(bar_chart, "D2")
-
-            # ========== Sheet 3: Top 20 Companies by Package (Horizontal Bar Chart) ==========
-            ws3 = wb.create_sheet("Top 20 Companies")
-            ws3.append(["Company Name", "Package (LPA)"])
-
-            company_names, company_packages = self.get_top_companies_by_package(companies)
-            for i in range(len(company_names)):
-                ws3.append([company_names[i], company_packages[i]])
-
-            for cell in ws3[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            for row in ws3.iter_rows(min_row=2, max_row=ws3.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws3.column_dimensions['A'].width = 35
-            ws3.column_dimensions['B'].width = 18
-
-            # Create Horizontal Bar Chart
-            if len(company_names) > 0:
-                hbar_chart = BarChart()
-                hbar_chart.title = "Top 20 Companies by Package"
-                hbar_chart.type = "bar"  # Horizontal bar
-                hbar_chart.style = 10
-                data = Reference(ws3, min_col=2, min_row=1, max_row=min(len(company_names) + 1, 21))
-                cats = Reference(ws3, min_col=1, min_row=2, max_row=min(len(company_names) + 1, 21))
-                hbar_chart.add_data(data, titles_from_data=True)
-                hbar_chart.set_categories(cats)
-                hbar_chart.dataLabels = DataLabelList()
-                hbar_chart.dataLabels.showVal = True
-                hbar_chart.width = 18
-                hbar_chart.height = 12
-                ws3.add_chart(hbar_chart, "D2")
-
-            # Save file
-            wb.save(filename)
-            
-            # Count charts added
-            chart_count = 0
-            for sheet in wb.sheetnames:
-                ws = wb[sheet]
-                chart_count += len(ws._charts)
-            
-            messagebox.showinfo("Success", 
-                f"Company analytics exported successfully to:\n{filename}\n\n"
-                f"📊 Charts added: {chart_count}\n"
-                f"📋 Sheets: {len(wb.sheetnames)}")
+        chart_data = self.current_chart_data
+        if not chart_data.get('count'):
+            messagebox.showwarning("No Data", "No company data to export.")
+            return
 
-        except ImportError:
-            messagebox.showerror("Error", "openpyxl library not installed. Install it using: pip install openpyxl")
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            messagebox.showerror("Error", f"Failed to export to Excel: {e}\n\nDetails:\n{error_details[:500]}")
+        sheets = [
+            chart_sheet("Industry Distribution", ["Industry Type", "Number of Companies"],
+                        list(zip(*chart_data['industry'])), "pie", "Industry Type Distribution", [25, 22]),
+            chart_sheet("Package Distribution", ["Package Range", "Number of Companies"],
+                        list(zip(*chart_data['packages'])), "col", "Company Package Distribution", [20, 22]),
+            chart_sheet("Top 20 Companies", ["Company Name", "Package (LPA)"],
+                        list(zip(*chart_data['top_companies'])), "bar", "Top 20 Companies by Package", [35, 18],
+                        size=(18, 12), max_rows=20),
+        ]
+        excel_exporter.export(self.company_charts_parent, "company_analytics", "Save Company Analytics As",
+                              lambda filename, job: write_chart_sheets(filename, sheets, job),
+                              "Company analytics exported successfully")
@@ -0,0 +1,120 @@
+"""
+CSV Export - streams a projected, batched query cursor straight to disk, optionally gzipped
+"""
+
+import csv
+import gzip
+from excel_export import (
+    ExcelExporter, EXPORT_CHUNK_SIZE, iter_chunks, column_getters, column_projection, close_rows
+)
+
+
+def query_cursor(collection, query=None, projection=None, sort=None, batch_size=EXPORT_CHUNK_SIZE):
+    """Cursor over every document matching query, fetched batch_size documents per round trip"""
+    cursor = collection.find(query or {}, projection).batch_size(batch_size)
+    return cursor.sort(sort) if sort else cursor
+
+
+def open_csv(filename, compress=False):
+    if compress:
+        return gzip.open(filename, "wt", newline="", encoding="utf-8")
+    return open(filename, "w", newline="", encoding="utf-8")
+
+
+def write_csv(filename, columns, rows, job, prepare=None, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream rows (a cursor or list) to a CSV file chunk by chunk
+
+    columns is a list of (header, field or callable, ...); prepare(chunk) may enrich each chunk
+    with one batched lookup before it is written.
+    """
+    getters = column_getters(columns)
+    try:
+        with open_csv(filename, compress) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow([header for header, *_ in columns])
+            for chunk in iter_chunks(rows, chunk_size):
+                job.check()
+                if prepare:
+                    chunk = prepare(chunk)
+                writer.writerows([getter(doc) for getter in getters] for doc in chunk)
+                job.written += len(chunk)
+            job.check()
+    finally:
+        close_rows(rows)
+    return {"rows": job.written, "sheets": 0, "charts": 0}
+
+
+class CsvExporter(ExcelExporter):
+    """Column picker, then the same background writing and progress window as Excel exports"""
+
+    extension = ".csv"
+    file_type = "CSV files"
+    format_name = "CSV"
+
+    def available(self):
+        return True
+
+    def export_query(self, parent, prefix, title, get_collection, query, columns, success_text,
+                     sort=None, prepare=None, extra_fields=()):
+        """Export every document matching query - not just the rows loaded in the table
+
+        get_collection() is called on the export worker, so binding the collection never blocks Tk.
+        extra_fields are projected for callable columns and prepare().
+        """
+        options = self.ask_options(parent.winfo_toplevel(), title, columns)
+        if options is None:
+            return None
+        selected, compress = options
+        projection = column_projection(selected, extra_fields)
+
+        def write(filename, job):
+            collection = get_collection()
+            job.total = collection.count_documents(query or {})
+            rows = query_cursor(collection, query, projection, sort)
+            return write_csv(filename, selected, rows, job, prepare=prepare, compress=compress)
+
+        return self.export(parent, prefix, title, write, success_text,
+                           extension=".csv.gz" if compress else ".csv")
+
+    def ask_options(self, root, title, columns):
+        """Modal column picker - returns (selected columns, gzip) or None when cancelled"""
+        import tkinter as tk
+        from tkinter import messagebox
+
+        window = tk.Toplevel(root)
+        window.title(title)
+        window.resizable(False, False)
+        window.transient(root)
+        window.grab_set()
+
+        tk.Label(window, text="Columns to export", font=("Arial", 11, "bold")).pack(anchor='w', padx=15, pady=(10, 5))
+        column_vars = []
+        for header, *_ in columns:
+            var = tk.BooleanVar(value=True)
+            tk.Checkbutton(window, text=header, variable=var).pack(anchor='w', padx=25)
+            column_vars.append(var)
+
+        compress_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(window, text="Compress (.csv.gz)", variable=compress_var).pack(anchor='w', padx=15, pady=(10, 0))
+
+        result = {}
+
+        def confirm():
+            selected = [column for column, var in zip(columns, column_vars) if var.get()]
+            if not selected:
+                messagebox.showwarning("No Columns", "Select at least one column to export.", parent=window)
+                return
+            result["options"] = (selected, compress_var.get())
+            window.destroy()
+
+        buttons = tk.Frame(window)
+        buttons.pack(pady=10)
+        tk.Button(buttons, text="Export", width=10, command=confirm).pack(side='left', padx=5)
+        tk.Button(buttons, text="Cancel", width=10, command=window.destroy).pack(side='left', padx=5)
+
+        root.wait_window(window)
+        return result.get("options")
+
+
+# Create global csv exporter instance
+csv_exporter = CsvExporter()
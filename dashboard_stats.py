@@ -0,0 +1,78 @@
+"""
+Dashboard Stats Engine - server-side aggregation for the home dashboard
+"""
+
+from database_config import get_student_collection
+from stats_counters import stats_counters
+
+# Package ranges (in LPA) shown on the dashboard, in display order
+PACKAGE_BUCKETS = ["5-10", "10-15", "15-20", "20-25", "25-30"]
+
+
+class DashboardStats:
+    """Runs one $facet aggregation over students and reads companies and placements from the
+    stats summary - only counts cross the wire"""
+
+    def empty_stats(self):
+        return {
+            "student_total": 0,
+            "student_branches": {},
+            "company_total": 0,
+            "package_buckets": {bucket: 0 for bucket in PACKAGE_BUCKETS},
+            "placement_total": 0,
+            "placed_branches": {},
+        }
+
+    def _run_facet(self, collection, facets):
+        """Run a single $facet aggregation and return its one result document"""
+        if collection is None:
+            return {}
+        result = list(collection.aggregate([{"$facet": facets}], allowDiskUse=True))
+        return result[0] if result else {}
+
+    @staticmethod
+    def _total(facet_rows):
+        return facet_rows[0]["n"] if facet_rows else 0
+
+    @staticmethod
+    def _counts(facet_rows):
+        return {row["_id"] if row["_id"] not in (None, "") else "Unknown": row["count"]
+                for row in facet_rows}
+
+    def student_facets(self):
+        return {
+            "total": [{"$count": "n"}],
+            "by_branch": [
+                {"$group": {
+                    "_id": {"$ifNull": ["$branch", "Unknown"]},
+                    "count": {"$sum": 1}
+                }},
+                {"$sort": {"count": -1, "_id": 1}}
+            ]
+        }
+
+    def compute(self):
+        """Fetch all dashboard counters - the students facet plus the stats summary
+
+        The summary is the one stats document, or its facet aggregation until that is built.
+        """
+        stats = self.empty_stats()
+        try:
+            # Student writes live in student.py and do not maintain counters - aggregate them
+            students = self._run_facet(get_student_collection(), self.student_facets())
+            stats["student_total"] = self._total(students.get("total", []))
+            stats["student_branches"] = self._counts(students.get("by_branch", []))
+
+            summary = stats_counters.summary()
+            if summary is not None:
+                stats["company_total"] = summary.get("company_total", 0)
+                stats["package_buckets"].update(summary.get("company_package_buckets", {}))
+                stats["placement_total"] = summary.get("placement_total", 0)
+                stats["placed_branches"] = summary.get("placed_branches", {})
+        except Exception as e:
+            print(f"❌ Error computing dashboard stats: {e}")
+        return stats
+
+
+# Create global dashboard stats instance
+dashboard_stats = DashboardStats()
@@ -1,12 +1,14 @@
 import pymongo
 from pymongo import MongoClient
+from pymongo.errors import OperationFailure
 from tkinter import messagebox
 import threading
-from functools import lru_cache
+from db_monitor import command_monitor
 
 MONGO_URI = "DATABASE URI"
 DATABASE_NAME = "TPinfo"
 
+# Set to MONGO_URI when both databases live on the same cluster - they then share one client
 OFFER_LETTERS_URI = "DATABASE URI"
 OFFER_LETTERS_DB_NAME = "offer_letters"
 
@@ -18,6 +20,112 @@ COLLECTIONS = {
 
 OFFER_LETTERS_COLLECTION = "letters"
 
+# One {_id: collection, version: n} counter per collection, bumped on every write (cache_sync.py)
+CACHE_VERSIONS_COLLECTION = "cache_versions"
+
+# Pre-aggregated dashboard/chart counters, maintained with $inc on every write (stats_counters.py)
+STATS_COLLECTION = "stats"
+
+# One {collection, doc_id, deleted_at} tombstone per deleted record - replicas sync deletes from
+# these instead of listing every id (local_store.py). Expired after DELETED_RECORD_TTL_DAYS.
+DELETED_RECORDS_COLLECTION = "deleted_records"
+DELETED_RECORD_TTL_DAYS = 30
+
+
+def _present(field):
+    """Partial index filter: only documents whose field holds a non-empty string"""
+    return {field: {"$type": "string", "$gt": ""}}
+
+
+# Secondary indexes per collection: (keys, options)
+INDEXES = {
+    "company": [
+        ([("package_lpa", pymongo.ASCENDING)], {"name": "package_lpa_1"}),
+        ([("search_tokens", pymongo.ASCENDING)], {"name": "search_tokens_1"}),
+        # Natural keys (unique_writes.NATURAL_KEYS); company_name also serves the facets.FACETS distinct().
+        # Partial, so legacy company_Name-only records that normalize-schema has not reached yet
+        # (company_name missing) do not collide as duplicate nulls
+        ([("company_name", pymongo.ASCENDING)],
+         {"name": "company_name_1", "unique": True, "partialFilterExpression": _present("company_name")}),
+        ([("email", pymongo.ASCENDING)],
+         {"name": "email_1", "unique": True, "partialFilterExpression": _present("email")}),
+        ([("hr_name", pymongo.ASCENDING)], {"name": "hr_name_1"}),
+        # Delta sync high-water mark (local_store.py)
+        ([("updated_at", pymongo.ASCENDING)], {"name": "updated_at_1"}),
+    ],
+    "placed_student": [
+        ([("package_lpa", pymongo.ASCENDING)], {"name": "package_lpa_1"}),
+        ([("search_tokens", pymongo.ASCENDING)], {"name": "search_tokens_1"}),
+        ([("student_id", pymongo.ASCENDING)], {"name": "student_id_1"}),
+        ([("student_branch", pymongo.ASCENDING)], {"name": "student_branch_1"}),
+        ([("batch", pymongo.ASCENDING)], {"name": "batch_1"}),
+        ([("year_of_placement", pymongo.ASCENDING)], {"name": "year_of_placement_1"}),
+        ([("company_name", pymongo.ASCENDING)], {"name": "company_name_1"}),
+        # Natural key (unique_writes.NATURAL_KEYS)
+        ([("student_name", pymongo.ASCENDING), ("company_name", pymongo.ASCENDING)],
+         {"name": "student_company_1", "unique": True}),
+        ([("updated_at", pymongo.ASCENDING)], {"name": "updated_at_1"}),
+    ],
+    "student": [
+        ([("admission_year", pymongo.ASCENDING)], {"name": "admission_year_1"}),
+        # Case-insensitive, matches student_refs.NAME_COLLATION
+        ([("name", pymongo.ASCENDING), ("branch", pymongo.ASCENDING)],
+         {"name": "name_branch_ci", "collation": {"locale": "en", "strength": 2}}),
+        ([("updated_at", pymongo.ASCENDING)], {"name": "updated_at_1"}),
+    ],
+}
+
+DELETED_RECORD_INDEXES = [
+    ([("collection", pymongo.ASCENDING), ("deleted_at", pymongo.ASCENDING)], {"name": "collection_deleted_at_1"}),
+    ([("deleted_at", pymongo.ASCENDING)],
+     {"name": "deleted_at_ttl", "expireAfterSeconds": DELETED_RECORD_TTL_DAYS * 24 * 3600}),
+]
+
+# Keyed stats counters: the largest keys of one counter (stats_counters.py)
+STATS_INDEXES = [
+    ([("counter", pymongo.ASCENDING), ("count", pymongo.DESCENDING)], {"name": "counter_count"}),
+]
+
+# Offer letters (inline storage): at most one active letter per student-company pair
+LETTER_INDEXES = [
+    ([("student_name", pymongo.ASCENDING), ("company_name", pymongo.ASCENDING)],
+     {"name": "active_letter_1", "unique": True, "partialFilterExpression": {"status": "active"}}),
+]
+
+INDEX_CONFLICT_CODES = (85, 86)  # IndexOptionsConflict, IndexKeySpecsConflict
+
+
+def _create_index(collection, keys, options):
+    try:
+        collection.create_index(keys, **options)
+    except OperationFailure as e:
+        if e.code not in INDEX_CONFLICT_CODES or not options.get("unique"):
+            raise
+        # Older databases have a plain index on these keys - swap it for the unique one
+        indexes = collection.index_information()
+        old_name = next(name for name, info in indexes.items() if info["key"] == list(keys))
+        old_options = {k: v for k, v in indexes[old_name].items() if k not in ("key", "v", "ns")}
+        collection.drop_index(old_name)
+        try:
+            collection.create_index(keys, **options)
+        except OperationFailure:
+            # Existing duplicates block the unique index - put the plain one back
+            collection.create_index(keys, name=old_name, **old_options)
+            raise
+
+
+def create_indexes(collection, specs):
+    """Create (keys, options) indexes, returning the names that could not be built"""
+    failed = []
+    for keys, options in specs:
+        try:
+            _create_index(collection, keys, options)
+        except Exception as e:
+            print(f"⚠️ Index {collection.name}.{options.get('name')} not created: {e}")
+            failed.append(options.get("name"))
+    return failed
+
+
 class OptimizedDatabaseManager:
     _instance = None
     _lock = threading.Lock()
@@ -36,12 +144,21 @@ class OptimizedDatabaseManager:
             self.offer_letters_client = None
             self.offer_letters_db = None
             self._collections = {}
+            self._connect_lock = threading.RLock()
             self.initialized = True
     
-    def connect(self):
+    def is_connected(self):
+        """True once the main client is open - never waits on the handshake"""
+        return self.client is not None
+
+    def connect(self, show_errors=True):
+        with self._connect_lock:
+            return self._connect(show_errors)
+
+    def _connect(self, show_errors):
         if self.client is None:
             try:
-                self.client = MongoClient(
+                client = MongoClient(
                     MONGO_URI,
                     maxPoolSize=15,
                     minPoolSize=2,
@@ -52,26 +169,44 @@ class OptimizedDatabaseManager:
                     tls=True,
                     tlsAllowInvalidCertificates=True,
                     retryWrites=True,
-                    w='majority'
+                    w='majority',
+                    event_listeners=[command_monitor]
                 )
                 
-                self.client.admin.command('ping')
+                client.admin.command('ping')
+                self.client = client
                 self.db = self.client[DATABASE_NAME]
                 print("✅ Main DB connection successful!")
+
+                # Index builds are idempotent - run them off the calling thread
+                threading.Thread(target=self.ensure_indexes, daemon=True).start()
                 return True
                 
             except Exception as e:
                 error_msg = f"Failed to connect to main MongoDB: {e}"
                 print(f"❌ {error_msg}")
-                messagebox.showerror("Database Error", error_msg)
+                if show_errors:
+                    messagebox.showerror("Database Error", error_msg)
                 return False
         return True
     
-    def connect_offer_letters(self):
+    def connect_offer_letters(self, show_errors=True):
         """Establish connection to offer letters database"""
+        with self._connect_lock:
+            return self._connect_offer_letters(show_errors)
+
+    def _connect_offer_letters(self, show_errors):
         if self.offer_letters_client is None:
+            # Same cluster - reuse the main pool instead of opening a second one
+            if OFFER_LETTERS_URI == MONGO_URI:
+                if not self._connect(show_errors):
+                    return False
+                self.offer_letters_client = self.client
+                self.offer_letters_db = self.client[OFFER_LETTERS_DB_NAME]
+                return True
+
             try:
-                self.offer_letters_client = MongoClient(
+                client = MongoClient(
                     OFFER_LETTERS_URI,
                     maxPoolSize=8,   # Smaller pool for offer letters
                     minPoolSize=1,
@@ -81,11 +216,13 @@ class OptimizedDatabaseManager:
                     socketTimeoutMS=20000,
                     tls=True,
                     tlsAllowInvalidCertificates=True,
-                    retryWrites=True
+                    retryWrites=True,
+                    event_listeners=[command_monitor]
                 )
                 
                 # Test the connection
-                self.offer_letters_client.admin.command('ping')
+                client.admin.command('ping')
+                self.offer_letters_client = client
                 self.offer_letters_db = self.offer_letters_client[OFFER_LETTERS_DB_NAME]
                 print("✅ Offer letters DB connection successful!")
                 return True
@@ -93,17 +230,42 @@ class OptimizedDatabaseManager:
             except Exception as e:
                 error_msg = f"Failed to connect to offer letters MongoDB: {e}"
                 print(f"❌ {error_msg}")
-                messagebox.showerror("Offer Letters Database Error", error_msg)
+                if show_errors:
+                    messagebox.showerror("Offer Letters Database Error", error_msg)
                 return False
         return True
+
+    def use_client(self, client, database_name=DATABASE_NAME, offer_letters_db_name=OFFER_LETTERS_DB_NAME):
+        """Bind both databases to an already-open client (benchmarks.py passes mongomock or a local mongod)"""
+        with self._connect_lock:
+            self.client = self.offer_letters_client = client
+            self.db = client[database_name]
+            self.offer_letters_db = client[offer_letters_db_name]
+            self._collections.clear()
+
+    def warm_up(self, on_connected=None):
+        """Open both connection pools on a background thread so the first query skips TLS setup
+
+        on_connected(ok) is called from that thread once the main handshake has finished.
+        """
+        def warm():
+            # Errors are reported later by the foreground call that retries the connection
+            connected = self.connect(show_errors=False)
+            if on_connected:
+                on_connected(connected)
+            self.connect_offer_letters(show_errors=False)
+
+        thread = threading.Thread(target=warm, daemon=True)
+        thread.start()
+        return thread
     
-    @lru_cache(maxsize=3)  # Cache collections for faster access
     def get_collection(self, collection_name):
-        """Get collection with caching"""
+        """Get collection, cached in _collections once connected (a failed connect is retried next call)"""
         if collection_name not in COLLECTIONS:
             raise ValueError(f"Unknown collection: {collection_name}")
             
-        if not self.connect():
+        # Called from worker threads - the caller reports the failure, a messagebox cannot
+        if not self.connect(show_errors=False):
             return None
             
         # Return cached collection 
@@ -112,6 +274,48 @@ class OptimizedDatabaseManager:
             
         return self._collections[collection_name]
     
+    def ensure_indexes(self):
+        """Create the indexes listed in INDEXES (no-op if they already exist)"""
+        try:
+            failed = []
+            for collection_name, specs in INDEXES.items():
+                collection = self.get_collection(collection_name)
+                if collection is None:
+                    return False
+                failed.extend(create_indexes(collection, specs))
+            failed.extend(create_indexes(self.db[DELETED_RECORDS_COLLECTION], DELETED_RECORD_INDEXES))
+            failed.extend(create_indexes(self.db[STATS_COLLECTION], STATS_INDEXES))
+            if failed:
+                print("⚠️ Duplicate records block some unique indexes - see: python migrations.py report-duplicates")
+            return not failed
+        except Exception as e:
+            print(f"⚠️ Index creation failed: {e}")
+            return False
+
+    def get_cache_versions_collection(self):
+        """Get the per-collection write counters used for cross-client cache invalidation"""
+        if not self.connect(show_errors=False):
+            return None
+        return self.db[CACHE_VERSIONS_COLLECTION]
+
+    def get_stats_collection(self):
+        """Get the collection holding the pre-aggregated dashboard counters"""
+        if not self.connect(show_errors=False):
+            return None
+        return self.db[STATS_COLLECTION]
+
+    def get_deleted_records_collection(self):
+        """Get the tombstones of deleted records that replicas sync deletes from"""
+        if not self.connect(show_errors=False):
+            return None
+        return self.db[DELETED_RECORDS_COLLECTION]
+
+    def get_offer_letters_db(self):
+        """Get the offer letters database handle"""
+        if not self.connect_offer_letters():
+            return None
+        return self.offer_letters_db
+
     def get_offer_letters_collection(self):
         """Get offer letters collection from separate database"""
         if not self.connect_offer_letters():
@@ -120,18 +324,17 @@ class OptimizedDatabaseManager:
     
     def close_connection(self):
         """Close database connection and clear cache"""
+        if self.offer_letters_client and self.offer_letters_client is not self.client:
+            self.offer_letters_client.close()
+        self.offer_letters_client = None
+        self.offer_letters_db = None
+
         if self.client:
             self.client.close()
             self.client = None
             self.db = None
-        
-        if self.offer_letters_client:
-            self.offer_letters_client.close()
-            self.offer_letters_client = None
-            self.offer_letters_db = None
             
         self._collections.clear()
-        self.get_collection.cache_clear()
 
 
 
@@ -158,6 +361,16 @@ def get_offer_letters_collection():
     return db_manager.get_offer_letters_collection()
 
 
+def warm_up_connections(on_connected=None):
+    """Start connecting to both databases in the background"""
+    return db_manager.warm_up(on_connected)
+
+
+def ensure_indexes():
+    """Create all secondary and unique indexes"""
+    return db_manager.ensure_indexes()
+
+
 def test_connection():
     """Test database connection"""
     try:
@@ -0,0 +1,297 @@
+"""
+DB Monitor - pymongo command instrumentation, per-operation latency percentiles and a slow-query log
+"""
+
+import contextvars
+import datetime
+import json
+import math
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import bson
+from pymongo import monitoring
+
+SLOW_QUERY_MS = 300
+SLOW_QUERY_LOG = os.path.join(os.path.expanduser("~"), ".tp_manager", "slow_queries.log")
+SAMPLES_PER_OPERATION = 500  # Latency percentiles are over this many most recent calls
+RECENT_SLOW_QUERIES = 100
+
+# Read commands explain() can plan without running
+EXPLAINABLE = {"find", "aggregate", "count", "distinct"}
+EXPLAIN_FIELDS = {
+    "find": ("filter", "sort", "projection", "hint", "skip", "limit", "collation"),
+    "aggregate": ("pipeline", "hint", "collation"),
+    "count": ("query", "hint", "skip", "limit", "collation"),
+    "distinct": ("key", "query", "collation"),
+}
+# Commands that carry no query of their own
+IGNORED = {"explain", "ping", "hello", "ismaster", "isMaster", "endSessions", "killCursors",
+           "saslStart", "saslContinue", "buildInfo", "listCollections", "createIndexes", "listIndexes"}
+
+# Infrastructure modules skipped when looking for the app function that issued a command
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+_PLUMBING = {"db_monitor.py", "database_config.py", "async_db.py", "pagination.py", "virtual_table.py",
+             "excel_export.py", "csv_export.py", "unique_writes.py", "local_store.py", "stats_counters.py"}
+
+# The UI view the user is on - async_db copies it into the worker running each query
+current_view = contextvars.ContextVar("current_view", default="background")
+
+
+def set_view(name):
+    """Tag the queries issued from now on (on this thread and its async_db jobs) with name"""
+    current_view.set(name)
+
+
+def _caller():
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and os.path.basename(filename) not in _PLUMBING:
+            return f"{os.path.splitext(os.path.basename(filename))[0]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def query_shape(value):
+    """value with every literal replaced by "?" - groups queries by structure and keeps names out of logs"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, dict) for item in value):
+            return [query_shape(item) for item in value]
+        return "?"
+    return "?"
+
+
+def _collection_of(command_name, command):
+    if command_name == "getMore":
+        return command.get("collection")
+    value = command.get(command_name)
+    return value if isinstance(value, str) else None
+
+
+def _documents_in(reply):
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if "values" in reply:  # distinct
+        return len(reply["values"])
+    if "value" in reply:  # findAndModify
+        return 1 if reply["value"] else 0
+    return reply.get("n", 0)
+
+
+def _bson_size(doc):
+    try:
+        return len(bson.encode(doc))
+    except Exception:
+        return 0
+
+
+def plan_summary(explain):
+    """("FETCH > IXSCAN(name_1)", uses_collscan) from an explain() result"""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # Aggregations report the plan of their leading $cursor stage
+        for stage in explain.get("stages", []):
+            if "$cursor" in stage:
+                planner = stage["$cursor"].get("queryPlanner")
+                break
+    if not planner:
+        return "no plan", False
+
+    node = planner.get("winningPlan", {})
+    node = node.get("queryPlan", node)  # Slot-based engine wraps the classic tree
+    stages = []
+    while node:
+        stage = node.get("stage", "?")
+        stages.append(f"{stage}({node['indexName']})" if node.get("indexName") else stage)
+        children = node.get("inputStages") or ([node["inputStage"]] if node.get("inputStage") else [])
+        node = children[0] if children else None
+    return " > ".join(stages), any(stage.startswith("COLLSCAN") for stage in stages)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    # Nearest rank
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class OperationStats:
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.documents = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.samples = deque(maxlen=SAMPLES_PER_OPERATION)
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Records latency, documents returned and bytes on the wire per (view, command, collection).
+
+    Read commands slower than SLOW_QUERY_MS, and the first run of every query shape that turns out
+    to scan the whole collection, are explained on a background thread and appended to
+    SLOW_QUERY_LOG as JSON lines.
+    """
+
+    def __init__(self, slow_ms=SLOW_QUERY_MS, log_path=SLOW_QUERY_LOG):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self._inflight = {}
+        self._operations = {}
+        self._plans = {}  # query shape -> (plan summary, collscan)
+        self._slow = deque(maxlen=RECENT_SLOW_QUERIES)
+        self._lock = threading.Lock()
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-explain")
+
+    # ---- CommandListener ----
+
+    def started(self, event):
+        if event.command_name in IGNORED:
+            return
+        command = event.command
+        self._inflight[(event.connection_id, event.request_id)] = {
+            "view": current_view.get(),
+            "caller": _caller(),
+            "collection": _collection_of(event.command_name, command),
+            "command": command if event.command_name in EXPLAINABLE else None,
+            "bytes": _bson_size(command),
+        }
+
+    def succeeded(self, event):
+        started = self._inflight.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        self._record(event, started, _documents_in(event.reply), _bson_size(event.reply), failed=False)
+
+    def failed(self, event):
+        started = self._inflight.pop((event.connection_id, event.request_id), None)
+        if started is not None:
+            self._record(event, started, 0, 0, failed=True)
+
+    # ---- recording ----
+
+    def _record(self, event, started, documents, reply_bytes, failed):
+        duration_ms = event.duration_micros / 1000.0
+        key = (started["view"], event.command_name, started["collection"] or "")
+        with self._lock:
+            stats = self._operations.get(key)
+            if stats is None:
+                stats = self._operations[key] = OperationStats()
+            stats.count += 1
+            stats.failures += failed
+            stats.documents += documents
+            stats.bytes += started["bytes"] + reply_bytes
+            stats.total_ms += duration_ms
+            stats.samples.append(duration_ms)
+
+        command = started["command"]
+        if command is None or failed:
+            return
+        shape = json.dumps([event.database_name, event.command_name, query_shape(
+            {field: command[field] for field in EXPLAIN_FIELDS[event.command_name] if field in command}
+        )], sort_keys=True, default=str)
+        slow = duration_ms >= self.slow_ms
+        with self._lock:
+            known = shape in self._plans
+            if not known:
+                self._plans[shape] = None  # Explain each new shape once
+        if slow or not known:
+            entry = {
+                "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                "view": started["view"],
+                "caller": started["caller"],
+                "database": event.database_name,
+                "collection": started["collection"],
+                "command": event.command_name,
+                "duration_ms": round(duration_ms, 1),
+                "documents": documents,
+                "bytes": started["bytes"] + reply_bytes,
+                "shape": json.loads(shape)[2],
+            }
+            try:
+                self._explainer.submit(self._explain, event.database_name, event.command_name, command,
+                                       shape, entry, slow)
+            except RuntimeError:
+                pass  # Shutting down
+
+    def _explain(self, database_name, command_name, command, shape, entry, slow):
+        plan = self._plans.get(shape)
+        if plan is None:
+            plan = ("explain failed", False)
+            try:
+                from database_config import db_manager
+                client = db_manager.client
+                if database_name == getattr(db_manager.offer_letters_db, "name", None):
+                    client = db_manager.offer_letters_client
+                target = {command_name: command[command_name]}
+                target.update({field: command[field] for field in EXPLAIN_FIELDS[command_name] if field in command})
+                if command_name == "aggregate":
+                    target["cursor"] = {}
+                plan = plan_summary(client[database_name].command("explain", target, verbosity="queryPlanner"))
+            except Exception as e:
+                print(f"⚠️ Could not explain {command_name} on {entry['collection']}: {e}")
+            with self._lock:
+                self._plans[shape] = plan
+
+        entry["plan"], entry["collscan"] = plan
+        if slow or entry["collscan"]:
+            self._log(entry)
+
+    def _log(self, entry):
+        with self._lock:
+            self._slow.appendleft(entry)
+        reason = "COLLSCAN" if entry["collscan"] else f"{entry['duration_ms']}ms"
+        print(f"⚠️ Slow query ({reason}): {entry['command']} {entry['collection']} from "
+              f"{entry['caller'] or entry['view']} - {entry['plan']}")
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not write slow query log: {e}")
+
+    # ---- reads for the diagnostics panel ----
+
+    def snapshot(self):
+        """One row per (view, command, collection), slowest total time first"""
+        rows = []
+        with self._lock:
+            items = [(key, stats, sorted(stats.samples)) for key, stats in self._operations.items()]
+        for (view, command_name, collection), stats, samples in items:
+            rows.append({
+                "view": view,
+                "operation": f"{command_name} {collection}".strip(),
+                "count": stats.count,
+                "failures": stats.failures,
+                "p50_ms": round(_percentile(samples, 0.50), 1),
+                "p95_ms": round(_percentile(samples, 0.95), 1),
+                "max_ms": round(samples[-1], 1) if samples else 0.0,
+                "documents": stats.documents,
+                "kb": round(stats.bytes / 1024, 1),
+                "total_ms": round(stats.total_ms, 1),
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+            self._slow.clear()
+
+    def shutdown(self):
+        self._explainer.shutdown(wait=False, cancel_futures=True)
+
+
+# Create global command monitor instance
+command_monitor = CommandMonitor()
@@ -0,0 +1,106 @@
+"""
+Diagnostics Panel - live p50/p95 latency per Mongo operation and the recent slow queries
+"""
+
+import customtkinter as ctk
+from tkinter import ttk
+from utils import COLORS
+from db_monitor import command_monitor, SLOW_QUERY_LOG
+
+REFRESH_MS = 2000
+
+OPERATION_COLUMNS = [
+    ("view", "View", 130), ("operation", "Operation", 200), ("count", "Calls", 70),
+    ("p50_ms", "p50 ms", 80), ("p95_ms", "p95 ms", 80), ("max_ms", "Max ms", 80),
+    ("documents", "Docs", 80), ("kb", "KB", 80), ("failures", "Failed", 70),
+]
+SLOW_COLUMNS = [
+    ("time", "Time", 150), ("caller", "Caller", 220), ("command", "Command", 90),
+    ("collection", "Collection", 130), ("duration_ms", "ms", 80), ("plan", "Plan", 300),
+]
+
+
+def _table(parent, columns, style, height):
+    tree = ttk.Treeview(parent, columns=[key for key, _, _ in columns], show='headings',
+                        style=style, height=height)
+    for key, heading, width in columns:
+        tree.heading(key, text=heading)
+        tree.column(key, width=width, anchor='w' if key in ("view", "operation", "caller", "plan") else 'center')
+    scrollbar = ttk.Scrollbar(parent, orient='vertical', command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side='right', fill='y')
+    tree.pack(fill='both', expand=True)
+    return tree
+
+
+class DiagnosticsPanel:
+    """Toplevel window that refreshes the command monitor's numbers every REFRESH_MS"""
+
+    def __init__(self, root):
+        self.window = ctk.CTkToplevel(root)
+        self.window.title("TP_Manager - Database Diagnostics")
+        self.window.geometry("1150x650")
+        self.window.attributes('-topmost', True)
+
+        style = ttk.Style()
+        style.configure("Diagnostics.Treeview", background="#1e1e1e", foreground="white",
+                        fieldbackground="#1e1e1e", rowheight=26, font=("Arial", 10))
+        style.configure("Diagnostics.Treeview.Heading", background="#3498DB", foreground="white",
+                        font=("Arial", 10, "bold"))
+
+        header = ctk.CTkFrame(self.window, fg_color="transparent")
+        header.pack(fill='x', padx=10, pady=(10, 5))
+        ctk.CTkLabel(header, text="📈 Mongo operations by view (slowest total time first)",
+                     font=("Arial", 14, "bold"), text_color=COLORS["info"]).pack(side='left')
+        ctk.CTkButton(header, text="RESET", width=90, height=30, fg_color=COLORS["warning"],
+                      command=self.reset).pack(side='right')
+
+        operations_frame = ctk.CTkFrame(self.window, fg_color=COLORS["content_frame"])
+        operations_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        self.operations = _table(operations_frame, OPERATION_COLUMNS, "Diagnostics.Treeview", 12)
+
+        self.slow_label = ctk.CTkLabel(self.window, text="", font=("Arial", 14, "bold"),
+                                       text_color=COLORS["warning"])
+        self.slow_label.pack(anchor='w', padx=10, pady=(10, 5))
+        slow_frame = ctk.CTkFrame(self.window, fg_color=COLORS["content_frame"])
+        slow_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        self.slow = _table(slow_frame, SLOW_COLUMNS, "Diagnostics.Treeview", 8)
+
+        ctk.CTkLabel(self.window, text=f"Full slow query log: {SLOW_QUERY_LOG}", font=("Arial", 10),
+                     text_color="#a0a0a0").pack(anchor='w', padx=10, pady=(0, 10))
+
+        self.refresh()
+
+    def exists(self):
+        try:
+            return bool(self.window.winfo_exists())
+        except Exception:
+            return False
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+
+    def reset(self):
+        command_monitor.reset()
+        self.refresh(schedule=False)
+
+    def refresh(self, schedule=True):
+        if not self.exists():
+            return
+        self.operations.delete(*self.operations.get_children())
+        for row in command_monitor.snapshot():
+            self.operations.insert('', 'end', values=[row[key] for key, _, _ in OPERATION_COLUMNS])
+
+        slow_queries = command_monitor.slow_queries()
+        self.slow_label.configure(text=f"⚠️ Slow queries and collection scans ({len(slow_queries)} recent)")
+        self.slow.delete(*self.slow.get_children())
+        for entry in slow_queries:
+            values = dict(entry, caller=entry.get("caller") or entry.get("view"))
+            if entry.get("collscan"):
+                values["plan"] = f"{entry.get('plan')} ⚠️"
+            self.slow.insert('', 'end', values=[values.get(key, "") for key, _, _ in SLOW_COLUMNS])
+
+        if schedule:
+            self.window.after(REFRESH_MS, self.refresh)
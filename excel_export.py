@@ -0,0 +1,316 @@
+"""
+Excel Export Engine - streams rows into write-only workbooks on a worker thread
+"""
+
+import os
+from async_db import async_db
+
+EXPORT_CHUNK_SIZE = 500  # Documents pulled from the cursor (and enriched) per step
+PROGRESS_POLL_MS = 150
+HEADER_COLOR = "3498DB"
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportJob:
+    """Progress shared between the writing worker and the progress window"""
+
+    def __init__(self, total=None):
+        self.total = total
+        self.written = 0
+        self.cancelled = False
+
+    def check(self):
+        if self.cancelled:
+            raise ExportCancelled()
+
+
+def column_letter(index):
+    from openpyxl.utils import get_column_letter
+    return get_column_letter(index)
+
+
+def iter_chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def column_getters(columns):
+    """One callable(doc) per (header, field or callable, ...) column"""
+    return [value if callable(value) else (lambda doc, field=value: doc.get(field, ""))
+            for _, value, *_ in columns]
+
+
+def column_projection(columns, extra=()):
+    """Projection covering the field columns plus the fields callable columns read"""
+    fields = [value for _, value, *_ in columns if not callable(value)]
+    return {field: 1 for field in [*fields, *extra]}
+
+
+def close_rows(rows):
+    close = getattr(rows, "close", None)  # Release a server cursor that was not exhausted
+    if close:
+        close()
+
+
+def _styled_row(ws, values, header=False, bordered=False, font_size=None):
+    """Write-only sheets cannot style cells after the fact - build WriteOnlyCells up front"""
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+    thin = Side(style='thin')
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        if header:
+            cell.fill = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type="solid")
+            cell.font = Font(bold=True, color="FFFFFF", size=font_size)
+        if header or bordered:
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+        if bordered:
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cells.append(cell)
+    return cells
+
+
+def chart_sheet(title, headers, rows, chart, chart_title, widths, anchor="D2", size=(15, 10),
+                series_columns=(2, 2), max_rows=None, titles_from_data=True, data_labels=None):
+    """Describe one aggregated-series sheet with its chart
+
+    chart is "pie", "col" or "bar" (horizontal); data_labels overrides the DataLabelList flags.
+    """
+    return {
+        "title": title, "headers": headers, "rows": rows, "chart": chart, "chart_title": chart_title,
+        "widths": widths, "anchor": anchor, "size": size, "series_columns": series_columns,
+        "max_rows": max_rows, "titles_from_data": titles_from_data, "data_labels": data_labels,
+    }
+
+
+def _add_chart(ws, sheet):
+    from openpyxl.chart import PieChart, BarChart, Reference
+    from openpyxl.chart.label import DataLabelList
+
+    count = len(sheet["rows"])
+    if sheet["max_rows"]:
+        count = min(count, sheet["max_rows"])
+    if count == 0:
+        return 0
+
+    if sheet["chart"] == "pie":
+        chart = PieChart()
+        labels = {"showPercent": True}
+    else:
+        chart = BarChart()
+        chart.type = sheet["chart"]
+        chart.style = 10
+        if sheet["series_columns"][1] > sheet["series_columns"][0]:
+            chart.grouping = "clustered"
+        labels = {"showVal": True}
+    chart.title = sheet["chart_title"]
+
+    min_col, max_col = sheet["series_columns"]
+    first_row = 1 if sheet["titles_from_data"] else 2
+    data = Reference(ws, min_col=min_col, max_col=max_col, min_row=first_row, max_row=count + 1)
+    cats = Reference(ws, min_col=1, min_row=2, max_row=count + 1)
+    chart.add_data(data, titles_from_data=sheet["titles_from_data"])
+    chart.set_categories(cats)
+
+    chart.dataLabels = DataLabelList()
+    for flag, value in (sheet["data_labels"] or labels).items():
+        setattr(chart.dataLabels, flag, value)
+    chart.width, chart.height = sheet["size"]
+    ws.add_chart(chart, sheet["anchor"])
+    return 1
+
+
+def write_table(filename, sheet_title, columns, rows, job, prepare=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream rows into a single-sheet write-only workbook
+
+    columns is a list of (header, value, width); value is a document field name or a callable(doc).
+    rows may be a live cursor - only chunk_size documents are held at once, and prepare(chunk)
+    may enrich each chunk (e.g. one batched lookup per chunk) before it is written.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    for index, (_, _, width) in enumerate(columns, start=1):
+        ws.column_dimensions[column_letter(index)].width = width
+    ws.append(_styled_row(ws, [header for header, _, _ in columns], header=True))
+
+    getters = column_getters(columns)
+    try:
+        for chunk in iter_chunks(rows, chunk_size):
+            job.check()
+            if prepare:
+                chunk = prepare(chunk)
+            for doc in chunk:
+                ws.append([getter(doc) for getter in getters])
+            job.written += len(chunk)
+        job.check()
+        wb.save(filename)
+    finally:
+        close_rows(rows)
+    return {"rows": job.written, "sheets": 1, "charts": 0}
+
+
+def write_chart_sheets(filename, sheets, job):
+    """Write aggregated series (one chart_sheet() each) with their native Excel charts"""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    job.total = len(sheets)
+    charts = 0
+    for sheet in sheets:
+        job.check()
+        ws = wb.create_sheet(sheet["title"])
+        for index, width in enumerate(sheet["widths"], start=1):
+            ws.column_dimensions[column_letter(index)].width = width
+        ws.append(_styled_row(ws, sheet["headers"], header=True, bordered=True, font_size=12))
+        for row in sheet["rows"]:
+            ws.append(_styled_row(ws, row, bordered=True))
+        charts += _add_chart(ws, sheet)
+        job.written += 1
+    wb.save(filename)
+    return {"rows": sum(len(sheet["rows"]) for sheet in sheets), "sheets": len(sheets), "charts": charts}
+
+
+def progress_window(root, title, job, verb="Exported"):
+    """Small window following job.written / job.total, with a Cancel button"""
+    import tkinter as tk
+    from tkinter import ttk
+
+    window = tk.Toplevel(root)
+    window.title(title)
+    window.resizable(False, False)
+    window.transient(root)
+    label = tk.Label(window, text="⏳ Preparing...", font=("Arial", 11), padx=20, pady=10)
+    label.pack()
+    bar = ttk.Progressbar(window, length=320, mode="indeterminate")
+    bar.pack(padx=20, pady=5)
+    bar.start(15)
+
+    def cancel():
+        job.cancelled = True
+        label.configure(text="⏳ Cancelling...")
+
+    tk.Button(window, text="Cancel", command=cancel).pack(pady=(5, 10))
+    window.protocol("WM_DELETE_WINDOW", cancel)
+
+    def poll():
+        if not window.winfo_exists():
+            return
+        if job.total and not job.cancelled:
+            if str(bar.cget("mode")) != "determinate":
+                bar.stop()
+                bar.configure(mode="determinate", maximum=job.total)
+            bar.configure(value=min(job.written, job.total))
+            label.configure(text=f"⏳ {verb} {job.written:,} of {job.total:,}")
+        elif job.written and not job.cancelled:
+            label.configure(text=f"⏳ {verb} {job.written:,}")
+        window.after(PROGRESS_POLL_MS, poll)
+
+    poll()
+    return window
+
+
+def close_progress(window):
+    try:
+        if window.winfo_exists():
+            window.destroy()
+    except Exception:
+        pass  # Already gone with the main window
+
+
+class ExcelExporter:
+    """Save dialog, background writing and a progress window for every Excel export"""
+
+    extension = ".xlsx"
+    file_type = "Excel files"
+    format_name = "Excel"
+
+    def available(self):
+        from tkinter import messagebox
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            messagebox.showerror("Error", "openpyxl library not installed. Install it using: pip install openpyxl")
+            return False
+        return True
+
+    def ask_filename(self, prefix, title, extension=None):
+        from datetime import datetime
+        from tkinter import filedialog
+        extension = extension or self.extension
+        return filedialog.asksaveasfilename(
+            defaultextension=extension,
+            filetypes=[(self.file_type, f"*{extension}"), ("All files", "*.*")],
+            initialfile=f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}",
+            title=title
+        )
+
+    def export(self, parent, prefix, title, write, success_text, total=None, extension=None):
+        """Ask for a file, then run write(filename, job) on a worker while showing progress
+
+        write returns the write_table()/write_chart_sheets() summary.
+        """
+        from tkinter import messagebox
+        if not self.available():
+            return None
+
+        filename = self.ask_filename(prefix, title, extension)
+        if not filename:  # User cancelled
+            return None
+
+        job = ExportJob(total)
+        root = parent.winfo_toplevel()
+        window = progress_window(root, title, job)
+
+        def on_done(result):
+            close_progress(window)
+            message = f"{success_text} to:\n{filename}"
+            if result.get("charts"):
+                message += f"\n\n📊 Charts added: {result['charts']}\n📋 Sheets: {result['sheets']}"
+            else:
+                message += f"\n\n📋 Rows: {result['rows']}"
+            messagebox.showinfo("Success", message)
+
+        def on_error(e):
+            close_progress(window)
+            if isinstance(e, ExportCancelled):
+                print(f"⚠️ Export cancelled: {filename}")
+                return
+            messagebox.showerror("Error", f"Failed to export to {self.format_name}: {e}")
+
+        # Anchored on the main window so leaving the page does not drop the result
+        return async_db.submit(root, self._write_file, write, filename, job,
+                               on_success=on_done, on_error=on_error)
+
+    @staticmethod
+    def _write_file(write, filename, job):
+        # Write beside the target and swap it in, so a failed or cancelled export never
+        # leaves a truncated workbook (or clobbers the file being replaced)
+        partial = f"{filename}.part"
+        try:
+            result = write(partial, job)
+            os.replace(partial, filename)
+            return result
+        except BaseException:
+            try:
+                if os.path.exists(partial):
+                    os.remove(partial)
+            except OSError as e:
+                print(f"⚠️ Could not remove partial export {partial}: {e}")
+            raise
+
+
+# Create global excel exporter instance
+excel_exporter = ExcelExporter()
@@ -0,0 +1,67 @@
+"""
+Facet Service - cached distinct() values for filter dropdowns
+"""
+
+import threading
+import time
+from database_config import db_manager
+
+FACET_TTL_SECONDS = 600
+
+# Facet name -> (collection, field); each field has an index in database_config.INDEXES
+FACETS = {
+    "branches": ("placed_student", "student_branch"),
+    "batches": ("placed_student", "batch"),
+    "years": ("placed_student", "year_of_placement"),
+    "placed_companies": ("placed_student", "company_name"),
+    "companies": ("company", "company_name"),
+    "hr_names": ("company", "hr_name"),
+}
+
+
+class FacetService:
+    """distinct() values per facet, held for FACET_TTL_SECONDS or until a write to the collection"""
+
+    def __init__(self, ttl=FACET_TTL_SECONDS):
+        self.ttl = ttl
+        self._cache = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, facet):
+        """Sorted non-empty distinct values for a facet (blocking on a miss - call from a worker)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(facet)
+            if entry and entry[0] > now:
+                return entry[1]
+            generation = self._generation
+
+        collection_name, field = FACETS[facet]
+        collection = db_manager.get_collection(collection_name)
+        if collection is None:
+            return []
+
+        # Non-empty strings only - the same filter as the partial indexes, so those can serve it
+        query = {field: {"$type": "string", "$gt": ""}}
+        values = sorted(collection.distinct(field, query), key=str)
+        with self._lock:
+            # A write during the query may have made these values stale - serve but don't cache them
+            if generation == self._generation:
+                self._cache[facet] = (now + self.ttl, values)
+        return values
+
+    def invalidate(self, collection_name=None):
+        """Drop cached facets of one collection (or all) - call after every write"""
+        with self._lock:
+            self._generation += 1
+            if collection_name is None:
+                self._cache.clear()
+                return
+            for facet, (facet_collection, _) in FACETS.items():
+                if facet_collection == collection_name:
+                    self._cache.pop(facet, None)
+
+
+# Create global facet service instance
+facet_service = FacetService()
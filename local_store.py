@@ -0,0 +1,579 @@
+"""
+Local Store - SQLite (FTS5) read replica of the main collections, kept current by delta sync
+"""
+
+import datetime
+import os
+import re
+import sqlite3
+import threading
+from bson import ObjectId, json_util
+from database_config import db_manager, COLLECTIONS, DELETED_RECORD_TTL_DAYS
+from search_utils import SEARCH_FIELDS, SEARCH_TOKENS_FIELD, search_tokens
+
+LOCAL_STORE_PATH = os.path.join(os.path.expanduser("~"), ".tp_manager", "local_store.db")
+LOCAL_SCHEMA_VERSION = 2  # Bumped when the table layout changes - older files are re-synced from scratch
+SYNC_INTERVAL_SECONDS = 300  # Safety net - remote writes normally wake the sync through cache_sync
+SYNC_OVERLAP = datetime.timedelta(seconds=60)  # Re-read recent changes in case a write committed late
+SYNC_BATCH_SIZE = 500
+# A replica idle longer than this may have missed expired tombstones and reloads in full
+FULL_RESYNC_AFTER = datetime.timedelta(days=DELETED_RECORD_TTL_DAYS - 1)
+
+# Server-assigned ($currentDate) modification time - the delta sync high-water mark
+UPDATED_AT_FIELD = "updated_at"
+DELETED_AT_FIELD = "deleted_at"
+
+# Fields the views filter or sort on - each gets its own indexed column. Other fields can still be
+# queried (through json_extract on the stored document), just without an index.
+LOCAL_COLUMNS = {
+    "company": ("company_name", "email", "hr_name", "contact_info", "package", "package_lpa",
+                "sector", "address"),
+    "placed_student": ("student_name", "student_branch", "batch", "company_name", "position",
+                       "year_of_placement", "package", "package_lpa", "hr_name", "student_id"),
+    "student": ("name", "branch", "admission_year", "email"),
+}
+
+
+def with_updated_at(update):
+    """Add the $currentDate stamp the delta sync keys on to an update document"""
+    return dict(update, **{"$currentDate": {UPDATED_AT_FIELD: True}})
+
+
+# ---- Query translation: the subset of the MongoDB query language the views produce, as SQL ----
+
+_FIELD_PATTERN = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+_TOKEN_PATTERN = re.compile(r"^\^([a-z_]+):([a-z0-9]+)$")
+_NUMBER_TYPES = "('integer', 'real')"
+
+
+def _sql_value(value):
+    """A document value as stored in (and compared against) a column"""
+    if isinstance(value, bool):
+        return int(value)
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return json_util.dumps(value)
+
+
+def _regexp(pattern, value):
+    return value is not None and re.search(pattern, value) is not None
+
+
+class _QueryTranslator:
+    """Builds a WHERE clause and its parameters for one collection's table"""
+
+    def __init__(self, collection_name, fts):
+        self.collection_name = collection_name
+        self.columns = LOCAL_COLUMNS.get(collection_name, ())
+        self.fts = fts and collection_name in SEARCH_FIELDS
+        self.params = []
+
+    def _bind(self, value):
+        self.params.append(_sql_value(value))
+        return "?"
+
+    def _column(self, field):
+        if field == "_id":
+            return "id"
+        if field in self.columns:
+            return f'"{field}"'
+        if not _FIELD_PATTERN.match(field):
+            raise ValueError(f"Unsupported field for the local store: {field}")
+        return f"json_extract(doc, '$.{field}')"
+
+    def where(self, query):
+        parts = []
+        for key, condition in (query or {}).items():
+            if key in ("$and", "$or", "$nor"):
+                joined = (" AND " if key == "$and" else " OR ").join(
+                    f"({self.where(part)})" for part in condition) or ("1" if key == "$and" else "0")
+                parts.append(f"NOT ({joined})" if key == "$nor" else f"({joined})")
+            elif key == SEARCH_TOKENS_FIELD:
+                parts.append(self._tokens(condition))
+            else:
+                parts.append(self._condition(self._column(key), condition))
+        return " AND ".join(parts) or "1"
+
+    def _tokens(self, condition):
+        pattern = condition.get("$regex") if isinstance(condition, dict) else None
+        match = _TOKEN_PATTERN.match(pattern) if isinstance(pattern, str) else None
+        if self.fts and match and len(condition) == 1:
+            # Anchored "key:token" prefix - answered from the FTS5 index
+            key, token = match.groups()
+            table = f"search_{self.collection_name}"
+            expression = self._bind(f'{key} : "{token}"*')
+            return f"id IN (SELECT id FROM {table} WHERE {table} MATCH {expression})"
+        element = _QueryTranslator(self.collection_name, False)
+        element_sql = element._condition("value", condition)
+        self.params.extend(element.params)
+        return f"EXISTS (SELECT 1 FROM json_each(doc, '$.{SEARCH_TOKENS_FIELD}') WHERE {element_sql})"
+
+    def _condition(self, expr, condition):
+        if not isinstance(condition, dict) or not any(key.startswith("$") for key in condition):
+            return self._eq(expr, condition)
+        parts = []
+        for op, target in condition.items():
+            if op == "$options":
+                continue
+            if op == "$eq":
+                parts.append(self._eq(expr, target))
+            elif op == "$ne":
+                parts.append(f"NOT {self._eq(expr, target)}")
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                parts.append(self._compare(expr, op, target))
+            elif op == "$in":
+                parts.append(self._in(expr, target))
+            elif op == "$nin":
+                parts.append(f"NOT {self._in(expr, target)}")
+            elif op == "$exists":
+                parts.append(f"({expr} IS {'NOT ' if target else ''}NULL)")
+            elif op == "$regex":
+                flags = "(?i)" if "i" in condition.get("$options", "") else ""
+                parts.append(f"(typeof({expr}) = 'text' AND regexp({self._bind(flags + target)}, {expr}))")
+            elif op == "$not":
+                parts.append(f"NOT ({self._condition(expr, target)})")
+            else:
+                raise ValueError(f"Unsupported query operator for the local store: {op}")
+        return f"({' AND '.join(parts) or '1'})"
+
+    def _eq(self, expr, value):
+        # Missing fields are NULL and equal None, like the server
+        if value is None:
+            return f"({expr} IS NULL)"
+        return f"({expr} IS {self._bind(value)})"
+
+    def _compare(self, expr, op, target):
+        # Comparison operators only match within one type bracket, like the server
+        if target is None:
+            return "0"
+        types = _NUMBER_TYPES if isinstance(target, (int, float)) and not isinstance(target, bool) else "('text')"
+        symbol = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}[op]
+        return f"(typeof({expr}) IN {types} AND {expr} {symbol} {self._bind(target)})"
+
+    def _in(self, expr, values):
+        values = list(values)
+        conditions = []
+        present = [value for value in values if value is not None]
+        if present:
+            conditions.append(f"COALESCE({expr} IN ({', '.join(self._bind(value) for value in present)}), 0)")
+        if len(present) < len(values):
+            conditions.append(f"({expr} IS NULL)")
+        return f"({' OR '.join(conditions) or '0'})"
+
+
+def _project(doc, projection):
+    if projection is None:
+        return doc
+    result = {field: doc[field] for field, include in projection.items() if include and field in doc}
+    if projection.get("_id", 1) and "_id" in doc:
+        result["_id"] = doc["_id"]
+    return result
+
+
+class LocalCursor:
+    """Enough of pymongo's Cursor for KeysetPager and the search views"""
+
+    def __init__(self, collection, query, projection):
+        self._collection = collection
+        self._query = query or {}
+        self._projection = projection
+        self._sort = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=1):
+        self._sort = [(key_or_list, direction)] if isinstance(key_or_list, str) else list(key_or_list)
+        return self
+
+    def skip(self, count):
+        self._skip = count
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        store = self._collection.store
+        for doc in store.select(self._collection.name, self._query, self._sort, self._skip, self._limit):
+            yield _project(doc, self._projection)
+
+
+class LocalCollection:
+    """Read-only view of one replicated collection with the pymongo calls the views use"""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def find(self, query=None, projection=None):
+        return LocalCursor(self, query, projection)
+
+    def find_one(self, query=None, projection=None):
+        return next(iter(self.find(query, projection).limit(1)), None)
+
+    def count_documents(self, query):
+        return self.store.count(self.name, query)
+
+
+class LocalStore:
+    """SQLite mirror of student, company and placed_student.
+
+    Each collection is a table holding the document as extended JSON plus an indexed column per
+    LOCAL_COLUMNS field; searchable fields also go into one FTS5 table per collection. Filters,
+    sorts and keyset pages are answered in SQL, so reads never load the collection into memory.
+
+    A background thread pulls only documents whose updated_at (or _id, for records written without
+    one) is past the collection's checkpoint, and drops records listed in the deleted_records
+    tombstones since the last sync. Writes go to MongoDB first and are applied here in the same
+    worker call through write_through(); deletes go through delete_through(), which also writes
+    the tombstone other clients sync from - records deleted any other way stay in the replicas
+    until their next full reload.
+    """
+
+    def __init__(self, path=LOCAL_STORE_PATH, interval=SYNC_INTERVAL_SECONDS):
+        self.path = path
+        self.interval = interval
+        self._conn = None  # Writer - used under _lock by the sync thread and write_through()
+        self._readers = threading.local()  # One read connection per thread; WAL lets them run alongside writes
+        self._fts = False
+        self._synced = set()
+        self._lock = threading.RLock()
+        self._open_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pending = set()
+        self._thread = None
+
+    # ---- storage ----
+
+    def _open(self, conn):
+        conn.create_function("regexp", 2, _regexp, deterministic=True)
+        return conn
+
+    def _connect(self):
+        """The writer connection, creating the schema on first use - never waits for a running sync"""
+        if self._conn is not None:
+            return self._conn
+        with self._open_lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = self._open(sqlite3.connect(self.path, check_same_thread=False))
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._create_schema(conn)
+                self._synced = {row[0] for row in conn.execute("SELECT collection FROM checkpoints")}
+                self._conn = conn
+        return self._conn
+
+    def _create_schema(self, conn):
+        if conn.execute("PRAGMA user_version").fetchone()[0] != LOCAL_SCHEMA_VERSION:
+            # Older layout - start over, the first sync reloads everything
+            tables = (["documents", "checkpoints"] + [f"docs_{name}" for name in COLLECTIONS]
+                      + [f"search_{name}" for name in SEARCH_FIELDS])
+            for table in tables:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"PRAGMA user_version = {LOCAL_SCHEMA_VERSION}")
+
+        for collection_name in COLLECTIONS:
+            columns = LOCAL_COLUMNS.get(collection_name, ())
+            conn.execute(f"CREATE TABLE IF NOT EXISTS docs_{collection_name} ("
+                         f"id TEXT PRIMARY KEY, doc TEXT NOT NULL"
+                         f"{''.join(f', {column}' for column in columns)})")
+            for column in columns:
+                # (field, id) serves both the filter and the keyset seek on that sort
+                conn.execute(f"CREATE INDEX IF NOT EXISTS docs_{collection_name}_{column} "
+                             f"ON docs_{collection_name} ({column}, id)")
+        conn.execute("CREATE TABLE IF NOT EXISTS checkpoints ("
+                     "collection TEXT PRIMARY KEY, updated_at TEXT, max_id TEXT, deleted_at TEXT, synced_at TEXT)")
+        try:
+            for collection_name, keys in SEARCH_FIELDS.items():
+                conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS search_{collection_name} "
+                             f"USING fts5(id UNINDEXED, {', '.join(keys)})")
+            self._fts = True
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ SQLite without FTS5, local searches will scan: {e}")
+        conn.commit()
+
+    def _reader(self):
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            self._connect()
+            conn = self._readers.conn = self._open(sqlite3.connect(self.path))
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _put(self, conn, collection_name, doc):
+        doc_id = str(doc["_id"])
+        columns = LOCAL_COLUMNS.get(collection_name, ())
+        conn.execute(f"INSERT OR REPLACE INTO docs_{collection_name} (id, doc{''.join(f', {c}' for c in columns)}) "
+                     f"VALUES (?, ?{', ?' * len(columns)})",
+                     (doc_id, json_util.dumps(doc), *(_sql_value(doc.get(column)) for column in columns)))
+        if self._fts and collection_name in SEARCH_FIELDS:
+            keys = list(SEARCH_FIELDS[collection_name])
+            grouped = {key: [] for key in keys}
+            for entry in doc.get(SEARCH_TOKENS_FIELD) or search_tokens(collection_name, doc):
+                key, _, token = entry.partition(":")
+                if key in grouped:
+                    grouped[key].append(token)
+            conn.execute(f"DELETE FROM search_{collection_name} WHERE id = ?", (doc_id,))
+            conn.execute(f"INSERT INTO search_{collection_name} (id, {', '.join(keys)}) "
+                         f"VALUES (?, {', '.join('?' for _ in keys)})",
+                         (doc_id, *(" ".join(grouped[key]) for key in keys)))
+
+    def _delete(self, conn, collection_name, doc_id):
+        conn.execute(f"DELETE FROM docs_{collection_name} WHERE id = ?", (str(doc_id),))
+        if self._fts and collection_name in SEARCH_FIELDS:
+            conn.execute(f"DELETE FROM search_{collection_name} WHERE id = ?", (str(doc_id),))
+
+    def _clear(self, conn, collection_name):
+        conn.execute(f"DELETE FROM docs_{collection_name}")
+        if self._fts and collection_name in SEARCH_FIELDS:
+            conn.execute(f"DELETE FROM search_{collection_name}")
+        conn.execute("DELETE FROM checkpoints WHERE collection = ?", (collection_name,))
+
+    # ---- reads ----
+
+    def collection(self, collection_name):
+        """LocalCollection once the collection has been synced at least once, otherwise None"""
+        try:
+            self._connect()
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ Local store unavailable: {e}")
+            return None
+        if collection_name not in self._synced:
+            return None
+        return LocalCollection(self, collection_name)
+
+    def _translate(self, collection_name, query):
+        translator = _QueryTranslator(collection_name, self._fts)
+        return translator.where(query), translator.params
+
+    def select(self, collection_name, query, sort=(), skip=0, limit=0):
+        """Documents matching query in sort order - streamed from SQLite, one row at a time"""
+        where, params = self._translate(collection_name, query)
+        translator = _QueryTranslator(collection_name, self._fts)
+        order = ", ".join(f"{translator._column(field)} {'DESC' if direction == -1 else 'ASC'}"
+                          for field, direction in sort)
+        sql = f"SELECT doc FROM docs_{collection_name} WHERE {where}"
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit or skip:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [limit or -1, skip]
+        for (text,) in self._reader().execute(sql, params):
+            yield json_util.loads(text)
+
+    def count(self, collection_name, query):
+        where, params = self._translate(collection_name, query)
+        return self._reader().execute(f"SELECT COUNT(*) FROM docs_{collection_name} WHERE {where}",
+                                      params).fetchone()[0]
+
+    # ---- writes ----
+
+    def write_through(self, collection_name, query, write, *args, **kwargs):
+        """Run a MongoDB write, then mirror the documents matching query into the local store
+
+        Runs on the calling worker thread; a local failure never fails the write.
+        """
+        result = write(*args, **kwargs)
+        if collection_name in self._synced:
+            try:
+                self.refresh(collection_name, query)
+            except Exception as e:
+                print(f"⚠️ Local store not updated, next sync will catch up: {e}")
+                self.request_sync([collection_name])
+        return result
+
+    def delete_through(self, collection_name, write, *args, **kwargs):
+        """Run a MongoDB delete returning the deleted document (or None), then record its tombstone
+        so the other replicas drop it too, and drop it here"""
+        deleted = write(*args, **kwargs)
+        if deleted is None:
+            return deleted
+
+        tombstones = db_manager.get_deleted_records_collection()
+        try:
+            tombstones.update_one({"collection": collection_name, "doc_id": deleted["_id"]},
+                                  {"$currentDate": {DELETED_AT_FIELD: True}}, upsert=True)
+        except Exception as e:
+            print(f"⚠️ Delete not recorded for other clients' local stores: {e}")
+
+        if collection_name in self._synced:
+            try:
+                with self._lock:
+                    conn = self._connect()
+                    self._delete(conn, collection_name, deleted["_id"])
+                    conn.commit()
+            except Exception as e:
+                print(f"⚠️ Local store not updated, next sync will catch up: {e}")
+                self.request_sync([collection_name])
+        return deleted
+
+    def refresh(self, collection_name, query):
+        """Re-read the documents matching query from MongoDB; local ones no longer there are dropped"""
+        mongo = db_manager.get_collection(collection_name)
+        if mongo is None:
+            return
+        fresh = list(mongo.find(query))
+        where, params = self._translate(collection_name, query)
+        with self._lock:
+            conn = self._connect()
+            stale = [row[0] for row in conn.execute(f"SELECT id FROM docs_{collection_name} WHERE {where}", params)]
+            for doc_id in stale:
+                self._delete(conn, collection_name, doc_id)
+            for doc in fresh:
+                self._put(conn, collection_name, doc)
+            conn.commit()
+
+    # ---- sync ----
+
+    def _checkpoint(self, collection_name):
+        row = self._connect().execute("SELECT updated_at, max_id, deleted_at, synced_at FROM checkpoints "
+                                      "WHERE collection = ?", (collection_name,)).fetchone()
+        if row is None:
+            return None
+        updated_at, max_id, deleted_at, synced_at = row
+        synced_at = datetime.datetime.fromisoformat(synced_at) if synced_at else None
+        if synced_at is None or datetime.datetime.now() - synced_at > FULL_RESYNC_AFTER:
+            return None
+        return (datetime.datetime.fromisoformat(updated_at) if updated_at else None,
+                json_util.loads(max_id) if max_id else None,
+                datetime.datetime.fromisoformat(deleted_at) if deleted_at else None)
+
+    def sync(self, collection_name):
+        """Pull changes and deletes since the last checkpoint (everything on the first run);
+        returns the number of documents applied"""
+        mongo = db_manager.get_collection(collection_name)
+        tombstones = db_manager.get_deleted_records_collection()
+        if mongo is None or tombstones is None:
+            return 0
+        with self._lock:
+            checkpoint = self._checkpoint(collection_name)
+
+        query = {}
+        deleted_query = {"collection": collection_name}
+        if checkpoint is None:
+            # Full load - deletes from here on come from tombstones newer than the latest one now
+            latest = tombstones.find_one(deleted_query, {DELETED_AT_FIELD: 1}, sort=[(DELETED_AT_FIELD, -1)])
+            updated_at, max_id = None, None
+            deleted_at = latest[DELETED_AT_FIELD] if latest else None
+            with self._lock:
+                self._synced.discard(collection_name)  # Views read MongoDB until the reload finishes
+                conn = self._connect()
+                self._clear(conn, collection_name)
+                conn.commit()
+        else:
+            updated_at, max_id, deleted_at = checkpoint
+            changed = []
+            if updated_at is not None:
+                changed.append({UPDATED_AT_FIELD: {"$gte": updated_at - SYNC_OVERLAP}})
+            if max_id is not None:
+                changed.append({"_id": {"$gt": max_id}})
+            if changed:
+                query = {"$or": changed}
+        if deleted_at is not None:
+            deleted_query[DELETED_AT_FIELD] = {"$gte": deleted_at - SYNC_OVERLAP}
+
+        pulled = 0
+        batch = []
+        cursor = mongo.find(query).batch_size(SYNC_BATCH_SIZE)
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= SYNC_BATCH_SIZE:
+                updated_at, max_id = self._apply(collection_name, batch, updated_at, max_id)
+                pulled += len(batch)
+                batch = []
+        updated_at, max_id = self._apply(collection_name, batch, updated_at, max_id)
+        pulled += len(batch)
+
+        removed = 0
+        if checkpoint is not None or deleted_at is not None:
+            deleted = list(tombstones.find(deleted_query, {"doc_id": 1, DELETED_AT_FIELD: 1}))
+            with self._lock:
+                conn = self._connect()
+                for tombstone in deleted:
+                    self._delete(conn, collection_name, tombstone["doc_id"])
+                conn.commit()
+            removed = len(deleted)
+            deleted_at = max([tombstone[DELETED_AT_FIELD] for tombstone in deleted] +
+                             ([deleted_at] if deleted_at else []), default=None)
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO checkpoints (collection, updated_at, max_id, deleted_at, synced_at) "
+                         "VALUES (?, ?, ?, ?, ?)",
+                         (collection_name, updated_at.isoformat() if updated_at else None,
+                          json_util.dumps(max_id) if max_id is not None else None,
+                          deleted_at.isoformat() if deleted_at else None,
+                          datetime.datetime.now().isoformat()))
+            conn.commit()
+            self._synced.add(collection_name)
+
+        if pulled or removed:
+            print(f"✅ Local {collection_name}: {pulled} pulled, {removed} removed")
+        return pulled + removed
+
+    def _apply(self, collection_name, docs, updated_at, max_id):
+        """Write one batch of pulled documents; returns the advanced (updated_at, max_id) marks"""
+        if not docs:
+            return updated_at, max_id
+        with self._lock:
+            conn = self._connect()
+            for doc in docs:
+                self._put(conn, collection_name, doc)
+            conn.commit()
+        stamps = [doc[UPDATED_AT_FIELD] for doc in docs if isinstance(doc.get(UPDATED_AT_FIELD), datetime.datetime)]
+        updated_at = max(stamps + ([updated_at] if updated_at else []), default=None)
+        max_id = max([doc["_id"] for doc in docs] + ([max_id] if max_id is not None else []))
+        return updated_at, max_id
+
+    def start(self):
+        """Sync every collection now, then whenever request_sync() is called or the interval passes"""
+        if self._thread is not None:
+            return
+        self._pending.update(COLLECTIONS)
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="local-store-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def request_sync(self, collection_names=None):
+        """Wake the sync thread for these collections (all when None) - safe from any thread"""
+        with self._pending_lock:
+            self._pending.update(collection_names or COLLECTIONS)
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._wake.wait(self.interval):
+                self.request_sync()
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            with self._pending_lock:
+                pending, self._pending = self._pending, set()
+            for collection_name in pending:
+                try:
+                    self.sync(collection_name)
+                except Exception as e:
+                    # Offline - keep serving the local copy and retry on the next wake-up
+                    print(f"⚠️ Local {collection_name} sync failed: {e}")
+
+
+# Create global local store instance
+local_store = LocalStore()
@@ -1,14 +1,27 @@
+from startup_profile import startup_profile
+import argparse
 import customtkinter as ctk
 from tkinter import messagebox
 from PIL import Image, ImageTk
 import os
 from utils import (
-    batch_clear_widgets, safe_int_convert, safe_float_convert,
-    extract_numeric_value, create_autopct_function, COLORS, CHART_COLORS,
+    batch_clear_widgets, safe_int_convert, safe_float_convert, COLORS,
     resource_path, get_cached_students, get_cached_companies, get_cached_placements,
-    get_matplotlib, create_optimized_figure, embed_chart_in_frame, invalidate_cache,
+    create_optimized_figure, embed_chart_in_frame, invalidate_cache,
     performance_monitor
 )
+from dashboard_stats import dashboard_stats
+from chart_render import chart_renderer
+from excel_export import excel_exporter, write_chart_sheets, chart_sheet
+from database_config import (warm_up_connections, db_manager, get_student_collection,
+                             get_company_collection, get_placed_student_collection)
+from async_db import async_db
+from cache_sync import cache_sync
+from local_store import local_store
+from package_utils import package_lpa_of
+from db_monitor import command_monitor, set_view
+
+startup_profile.end("imports")
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
@@ -29,31 +42,62 @@ class TP_Manager:
         self.is_maximized = True
         self.normal_geometry = None
 
-        from student import StudentManager
-        from company import CompanyManager
-        from placed_student import PlacedStudentManager
+        # TLS handshakes and chart worker start-up run while the login screen is up
+        startup_profile.begin("db_handshake")
+        warm_up_connections(on_connected=lambda ok: startup_profile.end(
+            "db_handshake", "background" if ok else "background, failed"))
+        chart_renderer.warm_up()
 
-        self.student_manager = StudentManager()
-        self.company_manager = CompanyManager()
-        self.placed_student_manager = PlacedStudentManager()
+        # Section managers are built on first use - see the properties below
+        self._managers = {}
+        self.diagnostics_panel = None
+        set_view("startup")
 
         self.current_section = None
         self.current_action = None
 
         self._preload_data()
+        startup_profile.end("tk_init")
         self.show_login_screen()
 
+    @property
+    def student_manager(self):
+        return self._manager("student")
+
+    @property
+    def company_manager(self):
+        return self._manager("company")
+
+    @property
+    def placed_student_manager(self):
+        return self._manager("placed")
+
+    def _manager(self, section):
+        """Import and build a section manager the first time it is needed (Tk thread)"""
+        if section not in self._managers:
+            if section == "student":
+                from student import StudentManager
+                self._managers[section] = StudentManager()
+            elif section == "company":
+                from company import CompanyManager
+                self._managers[section] = CompanyManager()
+            else:
+                from placed_student import PlacedStudentManager
+                self._managers[section] = PlacedStudentManager()
+        return self._managers[section]
+
     def _preload_data(self):
         import threading
         
         def preload():
+            # Waits for the warm-up handshake instead of holding up the login screen
+            if not db_manager.connect(show_errors=False):
+                print("⚠️ Data preloading skipped: database not reachable")
+                return
             try:
-                if self.student_manager.collection is not None:
-                    get_cached_students(self.student_manager.collection, limit=100)
-                if self.company_manager.collection is not None:
-                    get_cached_companies(self.company_manager.collection, limit=50)
-                if self.placed_student_manager.collection is not None:
-                    get_cached_placements(self.placed_student_manager.collection, limit=50)
+                get_cached_students(get_student_collection(), limit=100)
+                get_cached_companies(get_company_collection(), limit=50)
+                get_cached_placements(get_placed_student_collection(), limit=50)
                 print("✅ Data preloading completed")
             except Exception as e:
                 print(f"⚠️ Data preloading failed: {e}")
@@ -62,7 +106,12 @@ class TP_Manager:
 
     def show_login_screen(self):
         from login import LoginFrame
+        startup_profile.begin("login_screen")
         self.login_frame = LoginFrame(self.root, self.on_login_success)
+        startup_profile.end("login_screen")
+        # Idle callbacks run after Tk has drawn the pending widgets
+        startup_profile.begin("first_paint")
+        self.root.after_idle(lambda: startup_profile.end("first_paint"))
 
     def on_login_success(self, username):
         self.username = username
@@ -120,6 +169,18 @@ class TP_Manager:
         self.setup_content_frame()
         self.select_section('home')
 
+        # Pick up edits made on the other T&P machines - the local replica pulls just the delta
+        cache_sync.add_listener(self.on_remote_changes)
+        cache_sync.add_listener(local_store.request_sync)
+        cache_sync.start(self.root)
+        local_store.start()
+
+    def on_remote_changes(self, collection_names):
+        """Another client wrote to collection_names - redraw the dashboard if it is showing"""
+        if self.current_section == 'home' and self.current_action is None:
+            print(f"🔄 Refreshing dashboard after changes to {', '.join(sorted(collection_names))}")
+            self.show_home()
+
     def setup_top_frame(self):
         # Keep frame height same as before
         frame_height = max(140, int(self.root.winfo_screenheight() * 0.12)) 
@@ -215,6 +276,13 @@ class TP_Manager:
                                                      command=self.open_database_settings, **db_button_style)
         self.nav_buttons['database'].place(x=1200, y=10)
 
+        self.nav_buttons['diagnostics'] = ctk.CTkButton(master=self.page_option_frame_1, text='📈 DIAGNOSTICS',
+                                                        command=self.open_diagnostics,
+                                                        **dict(db_button_style, width=130,
+                                                               fg_color=COLORS["info"], border_color=COLORS["info"],
+                                                               hover_color="#2980b9"))
+        self.nav_buttons['diagnostics'].place(x=1060, y=10)
+
         # Sub-navigation frame (for action buttons)
         self.sub_nav_frame = ctk.CTkFrame(master=self.main_frame, height=50, corner_radius=10,
                                           fg_color=COLORS["section_frame"])
@@ -224,6 +292,7 @@ class TP_Manager:
     def select_section(self, section):
         """Handle main navigation selection with enhanced interactive button behavior"""
         self.current_section = section
+        set_view(section)  # Queries from here on are grouped under this view in diagnostics
         self.current_action = None
 
         # Safety check - ensure nav_buttons exist
@@ -233,7 +302,7 @@ class TP_Manager:
 
         # Update button styles with enhanced interactivity
         for key, btn in self.nav_buttons.items():
-            if key == 'database':  # Skip database button styling
+            if key in ('database', 'diagnostics'):  # Tool buttons keep their own styling
                 continue
                 
             if key == section:
@@ -332,6 +401,7 @@ class TP_Manager:
     def select_action(self, action):
         """Handle action selection with enhanced interactive button behavior"""
         self.current_action = action
+        set_view(f"{self.current_section}/{action}")
 
         # Update action button styles with enhanced interactivity
         for key, btn in self.action_buttons.items():
@@ -435,20 +505,18 @@ class TP_Manager:
         loading_label = ctk.CTkLabel(charts_container, text="⏳ Loading analytics...",
                                      font=("Arial", 14), text_color=COLORS["info"])
         loading_label.pack(pady=50)
-        charts_container.update()
 
-        try:
-            # Get data from databases using cached functions for better performance
-            students = get_cached_students(self.student_manager.collection, limit=500)
-            companies = get_cached_companies(self.company_manager.collection, limit=300)
-            placements = get_cached_placements(self.placed_student_manager.collection, limit=300)
+        # Server-side aggregated counters - no documents cross the wire
+        async_db.submit(charts_container, dashboard_stats.compute,
+                        on_success=lambda stats: self.render_home_charts(charts_container, loading_label, stats),
+                        key="home_dashboard")
 
+    def render_home_charts(self, charts_container, loading_label, stats):
+        """Draw the dashboard charts once the stats have arrived"""
+        try:
             # Remove loading label
             loading_label.destroy()
-
-            # Lazy load matplotlib only when needed
-            plt, FigureCanvasTkAgg, Figure = get_matplotlib()
-            import numpy as np
+            self.current_stats = stats
 
             # Row 1: 3 charts side by side
             row1_frame = ctk.CTkFrame(charts_container, fg_color=COLORS["content_frame"])
@@ -456,15 +524,15 @@ class TP_Manager:
 
             # Chart 1: Students by Branch (Pie Chart)
             self.create_chart_frame(row1_frame, "Students by Branch",
-                                    self.get_students_by_branch(students), "pie", row1_frame)
+                                    self.get_students_by_branch(stats), "pie", row1_frame)
 
             # Chart 2: Company Packages Distribution (Bar Chart with ranges)
-            pkg_dist = self.get_package_distribution(companies)
+            pkg_dist = self.get_package_distribution(stats)
             self.create_chart_frame(row1_frame, "Company Package Ranges (LPA)",
                                     pkg_dist, "bar_with_range", row1_frame)
 
             # Chart 3: Total Records Count (Bar Chart with range)
-            records_data = self.get_records_count(students, companies, placements)
+            records_data = self.get_records_count(stats)
             self.create_chart_frame(row1_frame, "Total Records Count",
                                     (records_data[0], records_data[1], records_data[2]), "bar_with_range", row1_frame)
 
@@ -473,7 +541,7 @@ class TP_Manager:
             row2_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
             # Chart 4: Students vs Placed by Branch (Grouped Bar Chart)
-            students_vs_placed = self.get_students_vs_placed_by_branch(students, placements)
+            students_vs_placed = self.get_students_vs_placed_by_branch(stats)
             self.create_chart_frame(row2_frame, "Students vs Placed by Branch",
                                     students_vs_placed, "grouped_bar", row2_frame)
 
@@ -485,9 +553,6 @@ class TP_Manager:
 
     def create_chart_frame(self, parent, title, data, chart_type, row_frame):
         """Create a chart frame with matplotlib - optimized version"""
-        # Lazy load matplotlib
-        plt, FigureCanvasTkAgg, Figure = get_matplotlib()
-
         frame = ctk.CTkFrame(row_frame, fg_color=COLORS["section_frame"], corner_radius=10)
         frame.pack(side='left', fill='both', expand=True, padx=5, pady=5)
 
@@ -497,219 +562,26 @@ class TP_Manager:
         title_label.pack(pady=10)
 
         try:
-            # Create figure with optimized settings for better performance
-            fig = Figure(figsize=(6.5, 5), dpi=80, facecolor='#2b2b2b', edgecolor='none')  # Reduced DPI
-            ax = fig.add_subplot(111)
-            ax.set_facecolor('#1e1e1e')
-            fig.subplots_adjust(left=0.12, right=0.95, top=0.88, bottom=0.18)
-
-            # Plot based on type with optimized rendering
-            if chart_type == "pie" and data:
-                labels, sizes = data
-                # Limit to top 8 items for better performance
-                if len(labels) > 8:
-                    labels, sizes = labels[:8], sizes[:8]
-                
-                # Use optimized autopct function from utils
-                autopct_func = create_autopct_function(sizes)
-                ax.pie(sizes, labels=labels, autopct=autopct_func, colors=CHART_COLORS["primary"][:len(labels)],
-                       textprops={'color': 'white', 'fontsize': 9, 'weight': 'bold'})
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-
-            elif chart_type == "bar" and data:
-                labels, values = data
-                bars = ax.bar(range(len(labels)), values, color=CHART_COLORS["primary"][:len(labels)])
-
-                # Add optimized value labels
-                for i, bar in enumerate(bars):
-                    height = bar.get_height()
-                    if height > 0:
-                        y_pos = height / 2
-                        x_pos = bar.get_x() + bar.get_width() / 2.
-                        font_size = min(12, max(8, int(height / 5)))
-                        
-                        ax.text(x_pos, y_pos, f'{int(height)}',
-                                ha='center', va='center', color='white', 
-                                fontsize=font_size, weight='bold',
-                                bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.8))
-
-                ax.set_xticks(range(len(labels)))
-                ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
-                ax.tick_params(axis='y', colors='white', labelsize=10)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(axis='y', alpha=0.3, color='white')
-
-            elif chart_type == "hbar" and data:
-                labels, values = data
-                colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
-                bars = ax.barh(range(len(labels)), values, color=colors[:len(labels)])
-                
-                # Add value labels in the middle of horizontal bars
-                for i, bar in enumerate(bars):
-                    width = bar.get_width()
-                    # Position text in the middle of the horizontal bar
-                    ax.text(width / 2, bar.get_y() + bar.get_height() / 2.,
-                            f'{int(width)}',
-                            ha='center', va='center', color='white', fontsize=11, weight='bold',
-                            bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.7))
-                
-                ax.set_yticks(range(len(labels)))
-                ax.set_yticklabels(labels, color='white', fontsize=11, weight='bold')
-                ax.tick_params(axis='x', colors='white', labelsize=10)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(axis='x', alpha=0.3, color='white')
-
-            elif chart_type == "line" and data:
-                labels, values = data
-                ax.plot(labels, values, marker='o', linewidth=3, markersize=10, color='#3498DB')
-                ax.fill_between(range(len(labels)), values, alpha=0.3, color='#3498DB')
-                ax.set_xticks(range(len(labels)))
-                ax.set_xticklabels(labels, color='white', fontsize=11, weight='bold')
-                ax.tick_params(axis='y', colors='white', labelsize=10)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(True, alpha=0.3, color='white')
-
-            elif chart_type == "hist" and data:
-                values, bins = data
-                ax.hist(values, bins=bins, color='#3498DB', edgecolor='white', alpha=0.7)
-                ax.tick_params(axis='both', colors='white', labelsize=10)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(axis='y', alpha=0.3, color='white')
-
-            elif chart_type == "donut" and data:
-                labels, sizes = data
-                colors = ['#2CC985', '#E74C3C']
-                # Use optimized autopct function from utils
-                autopct_func = create_autopct_function(sizes)
-                wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct=autopct_func,
-                                                  colors=colors, startangle=90)
-                # Draw circle for donut
-                centre_circle = plt.Circle((0, 0), 0.70, fc='#1e1e1e')
-                ax.add_artist(centre_circle)
-                for text in texts:
-                    text.set_color('white')
-                    text.set_fontsize(12)
-                    text.set_weight('bold')
-                for autotext in autotexts:
-                    autotext.set_color('white')
-                    autotext.set_fontsize(9)
-                    autotext.set_weight('bold')
-                    autotext.set_fontsize(12)
-                    autotext.set_weight('bold')
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-
-            elif chart_type == "bar_with_range" and data:
-                labels, values, y_range = data
-                colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
-                bars = ax.bar(range(len(labels)), values, color=colors[:len(labels)])
-
-                # Add value labels in the CENTER of bars
-                for i, bar in enumerate(bars):
-                    height = bar.get_height()
-                    if height > 0:  # Only add label if bar has height
-                        # Position text in the center of the bar
-                        y_pos = height / 2
-                        x_pos = bar.get_x() + bar.get_width() / 2.
-                        
-                        ax.text(x_pos, y_pos, f'{int(height)}',
-                                ha='center', va='center', color='white', 
-                                fontsize=12, weight='bold',
-                                bbox=dict(boxstyle='round,pad=0.2', facecolor='black', alpha=0.7))
-
-                ax.set_xticks(range(len(labels)))
-                ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=10, weight='bold')
-                ax.set_ylim(0, max(y_range) if y_range else 100)
-                ax.tick_params(axis='y', colors='white', labelsize=9)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(axis='y', alpha=0.3, color='white')
-
-            elif chart_type == "grouped_bar" and data:
-                branches, total_students, placed_students = data
-                x = range(len(branches))
-                width = 0.35
-
-                # Create grouped bars
-                bars1 = ax.bar([i - width / 2 for i in x], total_students, width, label='Total Students',
-                               color='#3498DB')
-                bars2 = ax.bar([i + width / 2 for i in x], placed_students, width, label='Placed Students',
-                               color='#2CC985')
-
-                # Add value labels in the middle of bars
-                for bar in bars1:
-                    height = bar.get_height()
-                    if height > 0:  # Only show label if bar has height
-                        ax.text(bar.get_x() + bar.get_width() / 2., height / 2,
-                                f'{int(height)}',
-                                ha='center', va='center', color='white', fontsize=10, weight='bold',
-                                bbox=dict(boxstyle='round,pad=0.2', facecolor='black', alpha=0.7))
-
-                for bar in bars2:
-                    height = bar.get_height()
-                    if height > 0:  # Only show label if bar has height
-                        ax.text(bar.get_x() + bar.get_width() / 2., height / 2,
-                                f'{int(height)}',
-                                ha='center', va='center', color='white', fontsize=10, weight='bold',
-                                bbox=dict(boxstyle='round,pad=0.2', facecolor='black', alpha=0.7))
-
-                ax.set_xticks(x)
-                ax.set_xticklabels(branches, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
-                ax.set_ylim(0, 350)
-                ax.set_yticks([0, 25, 50, 75, 100, 125, 150, 175, 200, 225, 250, 275, 300, 325, 350])
-                ax.tick_params(axis='y', colors='white', labelsize=9)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.legend(loc='upper right', facecolor='#2b2b2b', edgecolor='white', labelcolor='white')
-                ax.grid(axis='y', alpha=0.3, color='white')
-
-            # Embed in tkinter
-            canvas = FigureCanvasTkAgg(fig, master=frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill='both', expand=True, padx=5, pady=5)
+            # Drawn in a worker process; the Tk thread only shows the finished image
+            chart_renderer.show(f"home:{title}", frame, "home", title, chart_type, data, figsize=(6.5, 5), dpi=80)
 
         except Exception as e:
             error_label = ctk.CTkLabel(frame, text=f"Error: {str(e)[:50]}",
                                        font=("Arial", 10), text_color=COLORS["error"])
             error_label.pack(pady=10)
 
-    def get_students_by_branch(self, students):
-        """Get student count by branch"""
-        branches = {}
-        for student in students:
-            # Check both flat and nested structure
-            branch = student.get("branch") or student.get("personal_info", {}).get("branch", "Unknown")
-            branches[branch] = branches.get(branch, 0) + 1
+    def get_students_by_branch(self, stats):
+        """Get student count by branch from aggregated dashboard stats"""
+        branches = stats.get("student_branches", {})
 
         if not branches:
             return (["No Data"], [0])
 
         return (list(branches.keys())[:8], list(branches.values())[:8])
 
-    def get_package_distribution(self, companies):
-        """Optimized company package distribution by range (in LPA)"""
-        # Define package ranges in LPA
-        ranges = {
-            "5-10": 0,
-            "10-15": 0,
-            "15-20": 0,
-            "20-25": 0,
-            "25-30": 0
-        }
-
-        # Optimized single-pass processing
-        for company in companies:
-            pkg = company.get("package", "0")
-            pkg_num = extract_numeric_value(pkg)
-            
-            # Categorize into ranges efficiently
-            if pkg_num < 10:
-                ranges["5-10"] += 1
-            elif pkg_num < 15:
-                ranges["10-15"] += 1
-            elif pkg_num < 20:
-                ranges["15-20"] += 1
-            elif pkg_num < 25:
-                ranges["20-25"] += 1
-            else:
-                ranges["25-30"] += 1
+    def get_package_distribution(self, stats):
+        """Company package distribution by range (in LPA) from aggregated dashboard stats"""
+        ranges = stats.get("package_buckets", {})
 
         # Calculate appropriate y-range based on actual values
         max_value = max(ranges.values()) if ranges.values() else 50
@@ -743,10 +615,10 @@ class TP_Manager:
         sorted_comp = sorted(companies.items(), key=lambda x: x[1], reverse=True)[:8]
         return (list(dict(sorted_comp).keys()), list(dict(sorted_comp).values()))
 
-    def get_records_count(self, students, companies, placements):
+    def get_records_count(self, stats):
         """Get total records count with proper range"""
         labels = ["Students", "Companies", "Placements"]
-        values = [len(students), len(companies), len(placements)]
+        values = [stats.get("student_total", 0), stats.get("company_total", 0), stats.get("placement_total", 0)]
         # Calculate dynamic y_range based on max value
         max_val = max(values) if values else 100
         step = max(25, int(max_val / 10))  # At least 25, or 1/10 of max
@@ -754,22 +626,13 @@ class TP_Manager:
         return (labels, values, y_range)
 
     def get_package_ranges(self, companies):
-        """Get package range distribution"""
-        import re
+        """Get package range distribution (in LPA)"""
         packages = []
 
         for company in companies:
-            pkg = company.get("package", "0")
-            # Extract numeric value
-            numbers = re.findall(r'\d+', str(pkg))
-            if numbers:
-                try:
-                    pkg_num = float(numbers[0])
-                    if "lpa" in str(pkg).lower():
-                        pkg_num = pkg_num * 100000
-                    packages.append(pkg_num)
-                except:
-                    pass
+            pkg_num = package_lpa_of(company)
+            if pkg_num is not None:
+                packages.append(pkg_num)
 
         if not packages:
             return ([0], 5)
@@ -855,26 +718,14 @@ class TP_Manager:
         return (list(dict(sorted_comp).keys()), list(dict(sorted_comp).values()))
 
     def get_avg_package_by_branch(self, placements):
-        """Get average package by branch"""
-        import re
+        """Get average package (in LPA) by branch"""
         branch_packages = {}
 
         for placement in placements:
             branch = placement.get("student_branch", "Unknown")
-            pkg = placement.get("package", "0")
-
-            numbers = re.findall(r'\d+', str(pkg))
-            if numbers:
-                try:
-                    pkg_num = float(numbers[0])
-                    if "lpa" in str(pkg).lower():
-                        pkg_num = pkg_num
-
-                    if branch not in branch_packages:
-                        branch_packages[branch] = []
-                    branch_packages[branch].append(pkg_num)
-                except:
-                    pass
+            pkg_num = package_lpa_of(placement)
+            if pkg_num is not None:
+                branch_packages.setdefault(branch, []).append(pkg_num)
 
         branches = sorted(branch_packages.keys())
         avg_packages = []
@@ -884,20 +735,10 @@ class TP_Manager:
 
         return (branches, avg_packages)
 
-    def get_students_vs_placed_by_branch(self, students, placements):
-        """Get students vs placed students by branch"""
-        # Count students by branch
-        student_branches = {}
-        for student in students:
-            # Check both flat and nested structure
-            branch = student.get("branch") or student.get("personal_info", {}).get("branch", "Unknown")
-            student_branches[branch] = student_branches.get(branch, 0) + 1
-
-        # Count placed students by branch
-        placed_branches = {}
-        for placement in placements:
-            branch = placement.get("student_branch", "Unknown")
-            placed_branches[branch] = placed_branches.get(branch, 0) + 1
+    def get_students_vs_placed_by_branch(self, stats):
+        """Get students vs placed students by branch from aggregated dashboard stats"""
+        student_branches = stats.get("student_branches", {})
+        placed_branches = stats.get("placed_branches", {})
 
         # Get all branches sorted
         branches = sorted(set(list(student_branches.keys()) + list(placed_branches.keys())))
@@ -914,251 +755,39 @@ class TP_Manager:
 
     def export_home_charts_to_excel(self):
         """Export home dashboard chart data to Excel with charts"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-            from openpyxl.chart import PieChart, BarChart, Reference
-            from openpyxl.chart.label import DataLabelList
-            from openpyxl.chart.series import DataPoint
-            from openpyxl.drawing.fill import PatternFillProperties, ColorChoice
-            from datetime import datetime
-            from tkinter import filedialog
-
-            # Get data from databases
-            students = []
-            companies = []
-            placements = []
-
-            if self.student_manager.collection is not None:
-                students = list(self.student_manager.collection.find())
-            if self.company_manager.collection is not None:
-                companies = list(self.company_manager.collection.find())
-            if self.placed_student_manager.collection is not None:
-                placements = list(self.placed_student_manager.collection.find())
-
-            if not students and not companies and not placements:
-                messagebox.showwarning("No Data", "No data available to export.")
-                return
-
-            # Open Save As dialog
-            default_filename = f"home_dashboard_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                initialfile=default_filename,
-                title="Save Dashboard Data As"
-            )
-
-            if not filename:  # User cancelled
-                return
-
-            # Create workbook
-            wb = openpyxl.Workbook()
-
-            # Remove default sheet
-            if 'Sheet' in wb.sheetnames:
-                wb.remove(wb['Sheet'])
-
-            # Header styles
-            header_fill = PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=12)
-            thin_border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-
-            # Chart colors
-            chart_colors = ['3498DB', '2CC985', 'F39C12', 'E74C3C', '9B59B6', '1ABC9C', 'E67E22', '34495E']
-
-            # ========== Sheet 1: Students by Branch (Pie Chart) ==========
-            ws1 = wb.create_sheet("Students by Branch")
-            ws1.append(["Branch", "Count"])
-
-            for cell in ws1[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            branches_data = self.get_students_by_branch(students)
-            if branches_data:
-                labels, values = branches_data
-                for label, value in zip(labels, values):
-                    ws1.append([label, value])
-
-            # Style data cells
-            for row in ws1.iter_rows(min_row=2, max_row=ws1.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws1.column_dimensions['A'].width = 20
-            ws1.column_dimensions['B'].width = 15
-
-            # Create Pie Chart for Students by Branch
-            if branches_data and len(branches_data[0]) > 0:
-                pie_chart = PieChart()
-                pie_chart.title = "Students by Branch"
-                # Data starts from row 2 (skip header) to avoid header label in chart
-                data = Reference(ws1, min_col=2, min_row=2, max_row=len(branches_data[0]) + 1)
-                cats = Reference(ws1, min_col=1, min_row=2, max_row=len(branches_data[0]) + 1)
-                pie_chart.add_data(data, titles_from_data=False)
-                pie_chart.set_categories(cats)
-                pie_chart.dataLabels = DataLabelList()
-                pie_chart.dataLabels.showPercent = True
-                pie_chart.dataLabels.showCatName = True
-                pie_chart.dataLabels.showVal = False
-                pie_chart.dataLabels.showSerName = False
-                pie_chart.width = 15
-                pie_chart.height = 10
-                ws1.add_chart(pie_chart, "D2")
-
-            # ========== Sheet 2: Package Distribution (Bar Chart) ==========
-            ws2 = wb.create_sheet("Package Distribution")
-            ws2.append(["Package Range (LPA)", "Count"])
-
-            for cell in ws2[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            pkg_data = self.get_package_distribution(companies)
-            if pkg_data:
-                labels, values, _ = pkg_data
-                for label, value in zip(labels, values):
-                    ws2.append([label, value])
-
-            for row in ws2.iter_rows(min_row=2, max_row=ws2.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws2.column_dimensions['A'].width = 25
-            ws2.column_dimensions['B'].width = 15
-
-            # Create Bar Chart for Package Distribution
-            if pkg_data and len(pkg_data[0]) > 0:
-                bar_chart = BarChart()
-                bar_chart.title = "Company Package Ranges (LPA)"
-                bar_chart.type = "col"
-                bar_chart.style = 10
-                data = Reference(ws2, min_col=2, min_row=1, max_row=len(pkg_data[0]) + 1)
-                cats = Reference(ws2, min_col=1, min_row=2, max_row=len(pkg_data[0]) + 1)
-                bar_chart.add_data(data, titles_from_data=True)
-                bar_chart.set_categories(cats)
-                bar_chart.dataLabels = DataLabelList()
-                bar_chart.dataLabels.showVal = True
-                bar_chart.width = 15
-                bar_chart.height = 10
-                ws2.add_chart(bar_chart, "D2")
-
-            # ========== Sheet 3: Total Records (Bar Chart) ==========
-            ws3 = wb.create_sheet("Total Records")
-            ws3.append(["Category", "Count"])
-
-            for cell in ws3[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            records_data = self.get_records_count(students, companies, placements)
-            if records_data:
-                labels, values, _ = records_data
-                for label, value in zip(labels, values):
-                    ws3.append([label, value])
-
-            for row in ws3.iter_rows(min_row=2, max_row=ws3.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws3.column_dimensions['A'].width = 20
-            ws3.column_dimensions['B'].width = 15
-
-            # Create Bar Chart for Total Records
-            if records_data and len(records_data[0]) > 0:
-                bar_chart2 = BarChart()
-                bar_chart2.title = "Total Records Count"
-                bar_chart2.type = "col"
-                bar_chart2.style = 10
-                data = Reference(ws3, min_col=2, min_row=1, max_row=len(records_data[0]) + 1)
-                cats = Reference(ws3, min_col=1, min_row=2, max_row=len(records_data[0]) + 1)
-                bar_chart2.add_data(data, titles_from_data=True)
-                bar_chart2.set_categories(cats)
-                bar_chart2.dataLabels = DataLabelList()
-                bar_chart2.dataLabels.showVal = True
-                bar_chart2.width = 15
-                bar_chart2.height = 10
-                ws3.add_chart(bar_chart2, "D2")
-
-            # ========== Sheet 4: Students vs Placed (Grouped Bar Chart) ==========
-            ws4 = wb.create_sheet("Students vs Placed")
-            ws4.append(["Branch", "Total Students", "Placed Students", "Placement Rate (%)"])
-
-            for cell in ws4[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            vs_data = self.get_students_vs_placed_by_branch(students, placements)
-            if vs_data:
-                branches, total_students, placed_students = vs_data
-                for branch, total, placed in zip(branches, total_students, placed_students):
-                    rate = (placed / total * 100) if total > 0 else 0
-                    ws4.append([branch, total, placed, f"{rate:.1f}%"])
-
-            for row in ws4.iter_rows(min_row=2, max_row=ws4.max_row, min_col=1, max_col=4):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws4.column_dimensions['A'].width = 20
-            ws4.column_dimensions['B'].width = 18
-            ws4.column_dimensions['C'].width = 18
-            ws4.column_dimensions['D'].width = 20
-
-            # Create Grouped Bar Chart for Students vs Placed
-            if vs_data and len(vs_data[0]) > 0:
-                grouped_bar = BarChart()
-                grouped_bar.title = "Students vs Placed by Branch"
-                grouped_bar.type = "col"
-                grouped_bar.style = 10
-                grouped_bar.grouping = "clustered"
-                
-                # Add both data series (Total Students and Placed Students)
-                data = Reference(ws4, min_col=2, max_col=3, min_row=1, max_row=len(vs_data[0]) + 1)
-                cats = Reference(ws4, min_col=1, min_row=2, max_row=len(vs_data[0]) + 1)
-                grouped_bar.add_data(data, titles_from_data=True)
-                grouped_bar.set_categories(cats)
-                grouped_bar.dataLabels = DataLabelList()
-                grouped_bar.dataLabels.showVal = True
-                grouped_bar.width = 18
-                grouped_bar.height = 10
-                ws4.add_chart(grouped_bar, "F2")
-
-            # Save file
-            wb.save(filename)
-            
-            # Count charts added
-            chart_count = 0
-            for sheet in wb.sheetnames:
-                ws = wb[sheet]
-                chart_count += len(ws._charts)
-            
-            messagebox.showinfo("Success", 
-                f"Dashboard exported successfully to:\n{filename}\n\n"
-                f"📊 Charts added: {chart_count}\n"
-                f"📋 Sheets: {len(wb.sheetnames)}")
+        stats = getattr(self, 'current_stats', None)
+        if stats is not None and not (stats["student_total"] or stats["company_total"] or stats["placement_total"]):
+            messagebox.showwarning("No Data", "No data available to export.")
+            return
 
-        except ImportError:
-            messagebox.showerror("Error", "openpyxl library not installed. Install it using: pip install openpyxl")
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            messagebox.showerror("Error", f"Failed to export to Excel: {e}\n\nDetails:\n{error_details[:500]}")
+        def write(filename, job):
+            # Same aggregated counters as the dashboard, refreshed - no documents cross the wire
+            stats = dashboard_stats.compute()
+
+            branch_labels, branch_counts = self.get_students_by_branch(stats)
+            pkg_labels, pkg_counts, _ = self.get_package_distribution(stats)
+            record_labels, record_counts, _ = self.get_records_count(stats)
+            branches, total_students, placed_students = self.get_students_vs_placed_by_branch(stats)
+            vs_rows = [[branch, total, placed, f"{(placed / total * 100) if total > 0 else 0:.1f}%"]
+                       for branch, total, placed in zip(branches, total_students, placed_students)]
+
+            sheets = [
+                chart_sheet("Students by Branch", ["Branch", "Count"], list(zip(branch_labels, branch_counts)),
+                            "pie", "Students by Branch", [20, 15], titles_from_data=False,
+                            data_labels={"showPercent": True, "showCatName": True,
+                                         "showVal": False, "showSerName": False}),
+                chart_sheet("Package Distribution", ["Package Range (LPA)", "Count"], list(zip(pkg_labels, pkg_counts)),
+                            "col", "Company Package Ranges (LPA)", [25, 15]),
+                chart_sheet("Total Records", ["Category", "Count"], list(zip(record_labels, record_counts)),
+                            "col", "Total Records Count", [20, 15]),
+                chart_sheet("Students vs Placed", ["Branch", "Total Students", "Placed Students", "Placement Rate (%)"],
+                            vs_rows, "col", "Students vs Placed by Branch", [20, 18, 18, 20],
+                            anchor="F2", size=(18, 10), series_columns=(2, 3)),
+            ]
+            return write_chart_sheets(filename, sheets, job)
+
+        excel_exporter.export(self.root, "home_dashboard", "Save Dashboard Data As", write,
+                              "Dashboard exported successfully")
 
     def toggle_maximize(self):
         if self.is_maximized:
@@ -1199,18 +828,41 @@ class TP_Manager:
             messagebox.showerror("Error", f"Failed to open browser: {e}\n\n"
                                           "Please visit: https://cloud.mongodb.com")
 
+    def open_diagnostics(self):
+        """Per-operation Mongo latencies (p50/p95) and the slow query log"""
+        from diagnostics_panel import DiagnosticsPanel
+        if self.diagnostics_panel is not None and self.diagnostics_panel.exists():
+            self.diagnostics_panel.lift()
+            return
+        self.diagnostics_panel = DiagnosticsPanel(self.root)
+
     def close_window(self):
         if messagebox.askyesno("Exit", "Are you sure you want to exit the application?"):
+            cache_sync.stop()
+            local_store.stop()
+            async_db.shutdown()
+            chart_renderer.shutdown()
+            command_monitor.shutdown()
             self.root.destroy()
 
 
-def start_app():
+def start_app(argv=None):
     """Start the application"""
+    parser = argparse.ArgumentParser(description="TP_Manager - Training and Placement Management System")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print a per-phase timing breakdown of the cold start")
+    args, _ = parser.parse_known_args(argv)
+    startup_profile.enabled = args.startup_profile
+
+    startup_profile.begin("tk_init")
     root = ctk.CTk()
     app = TP_Manager(root)
     root.mainloop()
 
 
 if __name__ == "__main__":
+    # Chart render workers are spawned processes - required for frozen (PyInstaller) builds
+    import multiprocessing
+    multiprocessing.freeze_support()
 
     start_app()
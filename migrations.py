@@ -0,0 +1,293 @@
+"""
+One-time data migrations
+
+Usage:
+    python migrations.py backfill-package-lpa [--batch-size N]
+    python migrations.py migrate-pdfs-gridfs [--batch-size N]
+    python migrations.py build-search-tokens [--batch-size N] [--all]
+    python migrations.py normalize-schema [--batch-size N] [--collection NAME]
+    python migrations.py link-placement-students [--batch-size N]
+    python migrations.py report-duplicates [--limit N]
+    python migrations.py rebuild-stats [--batch-size N]
+"""
+
+import argparse
+from pymongo import UpdateOne
+from database_config import db_manager, ensure_indexes
+from package_utils import parse_package_lpa
+from pdf_manager import pdf_manager
+from search_utils import SEARCH_FIELDS, SEARCH_TOKENS_FIELD, search_tokens
+from schema_migrations import SCHEMA_VERSION_FIELD, SCHEMA_VERSIONS, upgrade
+from student_refs import STUDENT_ID_FIELD, student_id_map, lookup_student_id
+from unique_writes import NATURAL_KEYS
+from local_store import with_updated_at
+from stats_counters import stats_counters
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _flush(collection, operations):
+    if not operations:
+        return 0
+    result = collection.bulk_write(operations, ordered=False)
+    return result.modified_count
+
+
+def backfill_package_lpa(batch_size=DEFAULT_BATCH_SIZE):
+    """Store a canonical package_lpa float on every company and placement that lacks one"""
+    total_updated = 0
+    for collection_name in ("company", "placed_student"):
+        collection = db_manager.get_collection(collection_name)
+        if collection is None:
+            print(f"❌ {collection_name}: database connection failed")
+            return False
+
+        cursor = collection.find(
+            {"package_lpa": {"$exists": False}},
+            {"package": 1}
+        ).batch_size(batch_size)
+
+        operations = []
+        scanned = updated = 0
+        for doc in cursor:
+            scanned += 1
+            operations.append(UpdateOne(
+                {"_id": doc["_id"]},
+                with_updated_at({"$set": {"package_lpa": parse_package_lpa(doc.get("package"))}})
+            ))
+            if len(operations) >= batch_size:
+                updated += _flush(collection, operations)
+                operations = []
+                print(f"  {collection_name}: {scanned} scanned, {updated} updated")
+        updated += _flush(collection, operations)
+
+        print(f"✅ {collection_name}: {scanned} scanned, {updated} updated")
+        total_updated += updated
+
+    ensure_indexes()
+    print(f"✅ package_lpa backfill complete - {total_updated} documents updated")
+    return True
+
+
+def migrate_pdfs_gridfs(batch_size=50):
+    """Move inline offer letter blobs into GridFS and give shared GridFS files one letter per owner"""
+    placed_collection = db_manager.get_collection("placed_student")
+    if not pdf_manager.connect() or placed_collection is None:
+        print("❌ offer letters: database connection failed")
+        return False
+    pdf_manager.migrate_inline_to_gridfs(batch_size)
+    pdf_manager.adopt_legacy_files(placed_collection, batch_size)
+    return True
+
+
+def build_search_tokens(batch_size=DEFAULT_BATCH_SIZE, rebuild_all=False):
+    """Store the normalized search_tokens field used by the search boxes"""
+    total_updated = 0
+    for collection_name, keys in SEARCH_FIELDS.items():
+        collection = db_manager.get_collection(collection_name)
+        if collection is None:
+            print(f"❌ {collection_name}: database connection failed")
+            return False
+
+        query = {} if rebuild_all else {SEARCH_TOKENS_FIELD: {"$exists": False}}
+        projection = {field: 1 for fields in keys.values() for field in fields}
+        cursor = collection.find(query, projection).batch_size(batch_size)
+
+        operations = []
+        scanned = updated = 0
+        for doc in cursor:
+            scanned += 1
+            operations.append(UpdateOne(
+                {"_id": doc["_id"]},
+                with_updated_at({"$set": {SEARCH_TOKENS_FIELD: search_tokens(collection_name, doc)}})
+            ))
+            if len(operations) >= batch_size:
+                updated += _flush(collection, operations)
+                operations = []
+                print(f"  {collection_name}: {scanned} scanned, {updated} updated")
+        updated += _flush(collection, operations)
+
+        print(f"✅ {collection_name}: {scanned} scanned, {updated} updated")
+        total_updated += updated
+
+    ensure_indexes()
+    print(f"✅ search token build complete - {total_updated} documents updated")
+    return True
+
+
+def normalize_schema(batch_size=DEFAULT_BATCH_SIZE, collection_names=None):
+    """Rewrite legacy document shapes to the canonical schema and stamp schema_version
+
+    Only documents below the current version are read, so an interrupted run resumes where it stopped.
+    """
+    for collection_name in collection_names or SCHEMA_VERSIONS:
+        collection = db_manager.get_collection(collection_name)
+        if collection is None:
+            print(f"❌ {collection_name}: database connection failed")
+            return False
+
+        target = SCHEMA_VERSIONS[collection_name]
+        query = {SCHEMA_VERSION_FIELD: {"$not": {"$gte": target}}}
+        remaining = collection.count_documents(query)
+        print(f"🔄 {collection_name}: {remaining} documents below schema v{target}")
+
+        cursor = collection.find(query).sort("_id", 1).batch_size(batch_size)
+        operations = []
+        scanned = updated = 0
+        for doc in cursor:
+            scanned += 1
+            update = upgrade(collection_name, doc)
+            if update:
+                operations.append(UpdateOne({"_id": doc["_id"]}, with_updated_at(update)))
+            if len(operations) >= batch_size:
+                updated += _flush(collection, operations)
+                operations = []
+                print(f"  {collection_name}: {scanned}/{remaining} scanned, {updated} updated")
+        updated += _flush(collection, operations)
+
+        print(f"✅ {collection_name}: {scanned} scanned, {updated} updated to schema v{target}")
+
+    ensure_indexes()
+    print("✅ schema normalization complete")
+    return True
+
+
+def link_placement_students(batch_size=DEFAULT_BATCH_SIZE):
+    """Store student_id on placements by matching name and branch (run after normalize-schema)"""
+    student_collection = db_manager.get_collection("student")
+    placed_collection = db_manager.get_collection("placed_student")
+    if student_collection is None or placed_collection is None:
+        print("❌ database connection failed")
+        return False
+
+    id_map = student_id_map(student_collection)
+    print(f"🔄 {len(id_map)} students with a unique name and branch")
+
+    cursor = placed_collection.find(
+        {STUDENT_ID_FIELD: None},
+        {"student_name": 1, "student_branch": 1}
+    ).batch_size(batch_size)
+
+    operations = []
+    scanned = updated = unmatched = 0
+    for placement in cursor:
+        scanned += 1
+        student_id = lookup_student_id(id_map, placement)
+        if student_id is None:
+            unmatched += 1
+            continue
+        operations.append(UpdateOne({"_id": placement["_id"]},
+                                    with_updated_at({"$set": {STUDENT_ID_FIELD: student_id}})))
+        if len(operations) >= batch_size:
+            updated += _flush(placed_collection, operations)
+            operations = []
+            print(f"  placed_student: {scanned} scanned, {updated} linked")
+    updated += _flush(placed_collection, operations)
+
+    ensure_indexes()
+    print(f"✅ placed_student: {scanned} scanned, {updated} linked, {unmatched} without a unique student match")
+    return True
+
+
+def report_duplicates(limit=20):
+    """List records sharing a natural key - these block the unique indexes until merged or removed"""
+    total_groups = 0
+    for collection_name, keys in NATURAL_KEYS.items():
+        collection = db_manager.get_collection(collection_name)
+        if collection is None:
+            print(f"❌ {collection_name}: database connection failed")
+            return False
+
+        for fields in keys:
+            pipeline = [
+                {"$match": {field: {"$type": "string", "$gt": ""} for field in fields}},
+                {"$group": {"_id": {field: f"${field}" for field in fields},
+                            "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gt": 1}}},
+                {"$sort": {"count": -1}},
+            ]
+            groups = list(collection.aggregate(pipeline, allowDiskUse=True))
+            total_groups += len(groups)
+            label = " + ".join(fields)
+            if not groups:
+                print(f"✅ {collection_name} ({label}): no duplicates")
+                continue
+            print(f"⚠️ {collection_name} ({label}): {len(groups)} duplicated keys")
+            for group in groups[:limit]:
+                key = ", ".join(str(value) for value in group["_id"].values())
+                ids = ", ".join(str(_id) for _id in group["ids"])
+                print(f"  {key}: {group['count']} records ({ids})")
+            if len(groups) > limit:
+                print(f"  ... {len(groups) - limit} more")
+
+    if total_groups:
+        print("⚠️ Merge or delete the duplicates above, then restart the app to build the unique indexes")
+    else:
+        ensure_indexes()
+        print("✅ no duplicate natural keys")
+    return True
+
+
+def rebuild_stats(batch_size=DEFAULT_BATCH_SIZE):
+    """Recount the stats summary document (repairs drift left by failed counter updates)"""
+    if stats_counters.rebuild(batch_size) is None:
+        print("❌ stats: database connection failed")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TP_Manager data migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill = subparsers.add_parser("backfill-package-lpa",
+                                     help="Store numeric package_lpa on companies and placements")
+    backfill.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    gridfs_migration = subparsers.add_parser("migrate-pdfs-gridfs",
+                                             help="Move inline offer letter PDFs into GridFS")
+    gridfs_migration.add_argument("--batch-size", type=int, default=50)
+
+    search_migration = subparsers.add_parser("build-search-tokens",
+                                             help="Store indexed search tokens on companies and placements")
+    search_migration.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    search_migration.add_argument("--all", action="store_true",
+                                  help="Rebuild tokens on every document, not just those missing them")
+
+    normalize = subparsers.add_parser("normalize-schema",
+                                      help="Rewrite legacy field names to the canonical schema (resumable)")
+    normalize.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    normalize.add_argument("--collection", action="append", choices=sorted(SCHEMA_VERSIONS),
+                           help="Only migrate this collection (repeatable)")
+
+    link = subparsers.add_parser("link-placement-students",
+                                 help="Store the student _id on each placement")
+    link.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    duplicates = subparsers.add_parser("report-duplicates",
+                                       help="List records that block the unique natural-key indexes")
+    duplicates.add_argument("--limit", type=int, default=20, help="Groups shown per key")
+
+    stats = subparsers.add_parser("rebuild-stats",
+                                  help="Recount the dashboard and chart stats summary from scratch")
+    stats.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    args = parser.parse_args()
+    if args.command == "backfill-package-lpa":
+        backfill_package_lpa(args.batch_size)
+    elif args.command == "migrate-pdfs-gridfs":
+        migrate_pdfs_gridfs(args.batch_size)
+    elif args.command == "build-search-tokens":
+        build_search_tokens(args.batch_size, args.all)
+    elif args.command == "normalize-schema":
+        normalize_schema(args.batch_size, args.collection)
+    elif args.command == "link-placement-students":
+        link_placement_students(args.batch_size)
+    elif args.command == "report-duplicates":
+        report_duplicates(args.limit)
+    elif args.command == "rebuild-stats":
+        rebuild_stats(args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
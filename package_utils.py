@@ -0,0 +1,125 @@
+"""
+Package normalization - one canonical parser for salary package strings
+"""
+
+import re
+
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+_LAKH_RE = re.compile(r'LPA|LAKH|LAC|\d\s*L\b')
+_CRORE_RE = re.compile(r'(?:\d\s*|\b)CR')
+
+# Package tiers used for row color coding (in LPA)
+HIGH_PACKAGE_LPA = 10
+MEDIUM_PACKAGE_LPA = 5
+
+
+def parse_package_lpa(package):
+    """Convert a package value ("12 LPA", "1200000", "8.5LPA", 12) to a float in LPA.
+
+    Returns None when no number can be found.
+    """
+    if package is None or isinstance(package, bool):
+        return None
+
+    if isinstance(package, (int, float)):
+        value = float(package)
+        text = ""
+    else:
+        text = str(package).upper().replace(",", "")
+        match = _NUMBER_RE.search(text)
+        if not match:
+            return None
+        value = float(match.group())
+
+    if _CRORE_RE.search(text):
+        value *= 100  # 1 crore = 100 lakh
+    elif _LAKH_RE.search(text):
+        pass  # Already in lakhs
+    elif value >= 1000:
+        value /= 100000  # Plain rupee amount
+    return round(value, 2)
+
+
+def package_lpa_of(doc):
+    """Get the canonical package_lpa of a document, parsing the raw string for legacy records"""
+    value = doc.get("package_lpa")
+    if value is None:
+        value = parse_package_lpa(doc.get("package"))
+    return value
+
+
+def package_bucket(value):
+    """Dashboard package range for a value in LPA - same ranges as package_bucket_expr"""
+    value = value or 0
+    for upper, bucket in ((10, "5-10"), (15, "10-15"), (20, "15-20"), (25, "20-25")):
+        if value < upper:
+            return bucket
+    return "25-30"
+
+
+def package_lpa_expr(field="$package"):
+    """Aggregation expression equivalent of parse_package_lpa - same number, commas, crore/lakh
+    and rupee scaling and rounding, null when there is no number (needs MongoDB 4.4+)
+    """
+    number = {"$isNumber": field}
+    text = {"$replaceAll": {"input": {"$toUpper": {"$toString": {"$ifNull": [field, ""]}}},
+                            "find": ",", "replacement": ""}}
+    match = {"$regexFind": {"input": "$$text", "regex": _NUMBER_RE.pattern}}
+    scaled = {"$switch": {
+        "branches": [
+            {"case": {"$regexMatch": {"input": "$$text", "regex": _CRORE_RE.pattern}},
+             "then": {"$multiply": ["$$value", 100]}},  # 1 crore = 100 lakh
+            {"case": {"$regexMatch": {"input": "$$text", "regex": _LAKH_RE.pattern}}, "then": "$$value"},
+            {"case": {"$gte": ["$$value", 1000]}, "then": {"$divide": ["$$value", 100000]}},  # Plain rupees
+        ],
+        "default": "$$value"
+    }}
+    return {
+        "$let": {
+            # Numbers are used as they are, like parse_package_lpa does
+            "vars": {"text": {"$cond": [number, "", text]}},
+            "in": {"$let": {
+                "vars": {"value": {"$cond": [number, {"$toDouble": field}, {"$let": {
+                    "vars": {"m": match},
+                    "in": {"$cond": [{"$eq": ["$$m", None]}, None, {"$toDouble": "$$m.match"}]}
+                }}]}},
+                "in": {"$cond": [{"$eq": ["$$value", None]}, None, {"$round": [scaled, 2]}]}
+            }}
+        }
+    }
+
+
+def package_bucket_expr(value_expr=None):
+    """Aggregation expression mapping a numeric LPA value to its dashboard bucket
+
+    Defaults to the stored package_lpa, or package_lpa_expr() of the raw string for records
+    backfill-package-lpa has not reached - so it buckets exactly like package_bucket(package_lpa_of()).
+    """
+    if value_expr is None:
+        value_expr = {"$ifNull": ["$package_lpa", package_lpa_expr()]}
+    return {
+        "$let": {
+            "vars": {"lpa": {"$ifNull": [value_expr, 0]}},
+            "in": {"$switch": {
+                "branches": [
+                    {"case": {"$lt": ["$$lpa", 10]}, "then": "5-10"},
+                    {"case": {"$lt": ["$$lpa", 15]}, "then": "10-15"},
+                    {"case": {"$lt": ["$$lpa", 20]}, "then": "15-20"},
+                    {"case": {"$lt": ["$$lpa", 25]}, "then": "20-25"},
+                ],
+                "default": "25-30"
+            }}
+        }
+    }
+
+
+def package_tag(doc):
+    """Treeview row tag for a document's package tier, or None"""
+    value = package_lpa_of(doc)
+    if value is None:
+        return None
+    if value >= HIGH_PACKAGE_LPA:
+        return "high_package"
+    if value >= MEDIUM_PACKAGE_LPA:
+        return "medium_package"
+    return None
@@ -0,0 +1,113 @@
+"""
+Keyset Pagination - seek on (sort field, _id) instead of skip/limit
+"""
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def _after_condition(field, direction, value, doc_id):
+    """Filter matching documents that sort strictly after (value, doc_id) in the given direction
+
+    MongoDB sorts null/missing values first ascending and last descending, and comparison
+    operators never match null, so null values need their own branches.
+    """
+    op = "$gt" if direction == 1 else "$lt"
+    if field == "_id":
+        return {"_id": {op: doc_id}}
+
+    tie = {field: value, "_id": {op: doc_id}}
+    if value is None:
+        if direction == 1:
+            return {"$or": [tie, {field: {"$ne": None}}]}
+        return tie
+
+    conditions = [{field: {op: value}}, tie]
+    if direction == -1:
+        conditions.append({field: None})
+    return {"$or": conditions}
+
+
+class KeysetPager:
+    """Pages through collection.find(filter, projection) page_size documents at a time.
+
+    Each request is seeded by the first/last document of the current page, so every page
+    costs one indexed seek and only page_size documents are ever held in memory.
+    """
+
+    def __init__(self, collection, filter=None, projection=None, page_size=DEFAULT_PAGE_SIZE, sort=None):
+        self.collection = collection
+        self.filter = filter or {}
+        self.page_size = page_size
+        self.field, self.direction = sort or ("_id", -1)
+
+        self.projection = projection
+        if projection is not None and self.field != "_id":
+            self.projection = dict(projection, **{self.field: 1})
+
+        self.page_number = 0
+        self.has_next = True
+        self.has_prev = False
+        self._first = None
+        self._last = None
+
+    def _sort_spec(self, direction):
+        if self.field == "_id":
+            return [("_id", direction)]
+        return [(self.field, direction), ("_id", direction)]
+
+    def _query(self, anchor, direction):
+        if anchor is None:
+            return self.filter
+        seek = _after_condition(self.field, direction, anchor.get(self.field), anchor["_id"])
+        return {"$and": [self.filter, seek]} if self.filter else seek
+
+    def _fetch(self, anchor, direction):
+        # One extra document tells us whether another page exists
+        cursor = self.collection.find(self._query(anchor, direction), self.projection)
+        return list(cursor.sort(self._sort_spec(direction)).limit(self.page_size + 1))
+
+    def _set_bounds(self, page):
+        if page:
+            self._first, self._last = page[0], page[-1]
+
+    def next_page(self):
+        """Fetch the page after the current one ([] when there is none)"""
+        if not self.has_next:
+            return []
+        docs = self._fetch(self._last, self.direction)
+        self.has_next = len(docs) > self.page_size
+        page = docs[:self.page_size]
+        if page:
+            self.page_number += 1
+            self._set_bounds(page)
+        self.has_prev = self.page_number > 1
+        return page
+
+    def prev_page(self):
+        """Fetch the page before the current one ([] when there is none)"""
+        if not self.has_prev:
+            return []
+        docs = self._fetch(self._first, -self.direction)
+        page = list(reversed(docs[:self.page_size]))
+        if page:
+            self.page_number -= 1
+            self._set_bounds(page)
+            self.has_next = True
+        self.has_prev = self.page_number > 1
+        return page
+
+    def cursor(self, batch_size=None):
+        """Cursor over every matching document in page order - for streaming exports"""
+        cursor = self.collection.find(self.filter, self.projection).sort(self._sort_spec(self.direction))
+        return cursor.batch_size(batch_size) if batch_size else cursor
+
+    def count(self):
+        return self.collection.count_documents(self.filter)
+
+    def pages(self):
+        """Iterate over all remaining pages"""
+        while True:
+            page = self.next_page()
+            if not page:
+                return
+            yield page
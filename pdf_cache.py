@@ -0,0 +1,107 @@
+"""
+Local disk cache for offer letter PDFs - content addressed by SHA-256
+"""
+
+import os
+import shutil
+import threading
+
+PDF_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".tp_manager", "pdf_cache")
+PDF_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+
+class PDFCache:
+    """Size-bounded LRU cache of PDF files named <sha256>.pdf
+
+    File mtime is the recency clock - every hit touches the file, eviction removes the oldest first.
+    """
+
+    def __init__(self, cache_dir=PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, sha256):
+        return os.path.join(self.cache_dir, f"{sha256}.pdf")
+
+    def get(self, sha256):
+        """Return the cached file path for a hash and mark it recently used, or None"""
+        if not sha256:
+            return None
+        path = self._path(sha256)
+        try:
+            os.utime(path)
+            return path
+        except OSError:
+            return None
+
+    def put_file(self, sha256, source_path):
+        """Copy a local file into the cache"""
+        return self._put(sha256, lambda f: self._copy(source_path, f))
+
+    def put_stream(self, sha256, write_to):
+        """Cache content produced by write_to(file_obj) - used to stream downloads straight to disk"""
+        return self._put(sha256, write_to)
+
+    def put_bytes(self, sha256, data):
+        return self._put(sha256, lambda f: f.write(data))
+
+    @staticmethod
+    def _copy(source_path, target):
+        with open(source_path, 'rb') as source:
+            shutil.copyfileobj(source, target)
+
+    def _put(self, sha256, write_to):
+        if not sha256:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(sha256)
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+
+        # Write under a temporary name so a half-written file is never served
+        partial_path = f"{path}.{threading.get_ident()}.part"
+        try:
+            with open(partial_path, 'wb') as f:
+                write_to(f)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.unlink(partial_path)
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Remove least recently used files until the cache fits in max_bytes"""
+        with self._lock:
+            try:
+                entries = []
+                for name in os.listdir(self.cache_dir):
+                    if not name.endswith(".pdf"):
+                        continue
+                    path = os.path.join(self.cache_dir, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                return
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass  # Open in a viewer on Windows - try again next time
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+# Create global PDF cache instance
+pdf_cache = PDFCache()
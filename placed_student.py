@@ -1,28 +1,112 @@
 import customtkinter as ctk
 from tkinter import messagebox
-from database_config import get_placed_student_collection, get_offer_letters_collection
-from pdf_manager import pdf_manager
-import datetime
-import os
+from database_config import db_manager, get_placed_student_collection, get_student_collection
 from utils import (
-    validate_email, validate_phone, uppercase_entry_handler,
-    build_search_query, batch_clear_widgets, safe_int_convert, 
-    safe_float_convert, format_filter_info, create_autopct_function,
-    extract_numeric_value, COLORS, CHART_COLORS, invalidate_cache,
-    performance_monitor
+    uppercase_entry_handler, batch_clear_widgets, safe_int_convert,
+    format_filter_info, COLORS
 )
+from package_utils import parse_package_lpa, package_tag
+from async_db import async_db
+from virtual_table import VirtualTreeview, PageNavigator, PAGE_SIZE, pager_source
+from pagination import KeysetPager
+from search_utils import build_search_query, with_search_tokens
+from schema_migrations import SCHEMA_VERSION_FIELD, SCHEMA_VERSIONS
+from student_refs import batch_placements_pipeline, with_student_id
+from facets import facet_service
+from cache_sync import cache_sync
+from local_store import local_store, with_updated_at
+from stats_counters import stats_counters, top_counts
+from chart_render import chart_renderer
+from csv_export import csv_exporter
+from bulk_import import bulk_importer
+from pymongo.errors import DuplicateKeyError
+from excel_export import excel_exporter, write_table, write_chart_sheets, chart_sheet, EXPORT_CHUNK_SIZE
+import re
+
+
+def offer_letter_status(placement):
+    """Yes / No / Missing, after mark_offer_letters() has checked the placement's page or chunk"""
+    if not placement.get("offer_letter_pdf_key"):
+        return "No"
+    return "Yes" if placement.get("_offer_letter_exists") else "Missing"
+
+
+# (header, field or callable, column width) of the placements Excel/CSV export - includes every
+# field bulk_import requires, so an exported sheet imports back
+PLACED_EXPORT_COLUMNS = [
+    ("Student Name", "student_name", 25),
+    ("Branch", "student_branch", 15),
+    ("Batch", "batch", 12),
+    ("Company", "company_name", 25),
+    ("Position", "position", 20),
+    ("Year of Placement", "year_of_placement", 15),
+    ("Package", "package", 15),
+    ("HR Name", "hr_name", 20),
+    ("Contact", "contact_info", 15),
+    ("Email", "email", 25),
+    ("Address", "address", 30),
+    ("Offer Letter", offer_letter_status, 15),
+    ("Placement Suggestion", "placement_suggestion", 25),
+    ("Company Levels", "company_levels", 20),
+    ("Skills Required", "skills_required", 30),
+    ("Important Notes", "important_suggestions", 30),
+]
+
+# Fields the advanced search table shows
+PLACED_SEARCH_PROJECTION = {
+    "student_name": 1, "student_branch": 1, "batch": 1, "company_name": 1,
+    "position": 1, "year_of_placement": 1, "package": 1, "package_lpa": 1, "hr_name": 1,
+    "contact_info": 1, "email": 1, "address": 1,
+    "offer_letter_pdf_key": 1, "placement_suggestion": 1, "company_levels": 1,
+    "skills_required": 1, "important_suggestions": 1, "has_offer_letter": 1,
+    "created_date": 1
+}
 
 
 class PlacedStudentManager:
     def __init__(self):
-        self.collection = self.connect_db()
-        self.offer_letters_collection = self.connect_offer_letters_db()
+        self._collection = None
+
+    @property
+    def collection(self):
+        """Bound on first use, so building the manager never waits on the DB handshake
+
+        Only read it on a worker thread - the first read may wait on that handshake.
+        """
+        if self._collection is None:
+            self._collection = self.connect_db()
+        return self._collection
+
+    @property
+    def pdf_manager(self):
+        """Offer letter storage - imported on first use to keep GridFS off the startup path"""
+        from pdf_manager import pdf_manager
+        return pdf_manager
 
     def connect_db(self):
         return get_placed_student_collection()
 
-    def connect_offer_letters_db(self):
-        return get_offer_letters_collection()
+    def connecting(self):
+        """True until the main DB handshake has finished - the first worker call will wait on it"""
+        return not db_manager.is_connected()
+
+    def reader(self):
+        """Collection the views read from - the local replica once synced, otherwise Atlas (worker thread)"""
+        return local_store.collection("placed_student") or self.collection
+
+    def writer(self):
+        """The Atlas collection for writes (worker thread) - raises when the database is unreachable"""
+        collection = self.collection
+        if collection is None:
+            raise ConnectionError("Database connection failed")
+        return collection
+
+    def find_all(self, query):
+        """Every placement matching query, from reader() (worker thread)"""
+        source = self.reader()
+        if source is None:
+            raise ConnectionError("Database connection failed")
+        return list(source.find(query))
 
     def uppercase_entry(self, entry_widget):
         return uppercase_entry_handler(entry_widget)
@@ -59,6 +143,8 @@ class PlacedStudentManager:
 
     def setup_placed_charts_tab(self, parent):
         """Setup placed student analytics charts"""
+        self.placed_charts_parent = parent
+
         # Header with title and export button
         header_frame = ctk.CTkFrame(parent, fg_color=COLORS["content_frame"])
         header_frame.pack(fill='x', padx=5, pady=3)
@@ -93,24 +179,17 @@ class PlacedStudentManager:
         if not hasattr(self, 'placed_branch_filter_var'):
             self.placed_branch_filter_var = ctk.StringVar(value="All Branches")
 
-        branch_options = ["All Branches"]
-        if self.collection is not None:
-            try:
-                all_placements = list(self.collection.find())
-                branches = set()
-                for placement in all_placements:
-                    branch = placement.get("student_branch", "")
-                    if branch:
-                        branches.add(branch)
-                branch_options.extend(sorted(branches))
-            except:
-                pass
-
         branch_dropdown = ctk.CTkOptionMenu(input_frame, variable=self.placed_branch_filter_var, 
-                                            values=branch_options, width=130, height=32,
+                                            values=["All Branches"], width=130, height=32,
                                             font=("Arial", 11))
         branch_dropdown.pack(side='left', padx=3, pady=5)
 
+        async_db.submit(branch_dropdown, facet_service.get, "branches",
+                        on_success=lambda branches: branch_dropdown.configure(
+                            values=["All Branches"] + branches),
+                        on_error=lambda e: None,
+                        key="placed_branch_options")
+
         search_btn = ctk.CTkButton(input_frame, text="🔍 SEARCH",
                                    command=lambda: self.refresh_placed_charts(parent),
                                    height=32, width=100, font=("Arial", 11, "bold"),
@@ -125,26 +204,73 @@ class PlacedStudentManager:
         loading_label = ctk.CTkLabel(charts_container, text="⏳ Loading analytics...",
                                      font=("Arial", 14), text_color=COLORS["info"])
         loading_label.pack(pady=50)
-        charts_container.update()
 
+        selected_year = self.placed_batch_year_var.get().strip()
         try:
-            # Get all placements with pagination and projection
-            all_placements = []
-            if self.collection is not None:
+            year_int = int(selected_year) if selected_year else None
+        except ValueError:
+            year_int = None
+
+        def on_error(e):
+            loading_label.destroy()
+            ctk.CTkLabel(charts_container, text=f"Error loading analytics: {e}",
+                         font=("Arial", 14), text_color=COLORS["error"]).pack(pady=50)
+
+        selected_branch = self.placed_branch_filter_var.get()
+        async_db.submit(charts_container, self.fetch_chart_placements, year_int, selected_branch,
+                        on_success=lambda result: self.render_placed_charts(
+                            charts_container, loading_label, *result),
+                        on_error=on_error,
+                        key="placed_charts")
+
+    def fetch_chart_placements(self, year_int, branch="All Branches"):
+        """Get the chart counters, only the batch year's / branch's when given (runs on a worker thread)
+
+        Returns (counters, batch_filtered). Unfiltered charts read the stats summary document;
+        filtered ones count the matching placements.
+        """
+        placements, batch_filtered = [], False
+        if branch in ("", "All Branches"):
+            branch = None
+        if year_int is None and branch is None:
+            summary = stats_counters.summary()
+            if summary is not None:
+                return summary, False
+
+        projection = {
+            "student_name": 1, "student_branch": 1, "company_name": 1,
+            "package": 1, "package_lpa": 1, "hr_name": 1, "placement_date": 1
+        }
+
+        if year_int is not None:
+            # One indexed join: admission_year index on students, student_id index on placements
+            student_collection = get_student_collection()
+            if student_collection is not None:
                 try:
-                    projection = {
-                        "student_name": 1, "student_branch": 1, "company_name": 1,
-                        "package": 1, "hr_name": 1, "placement_date": 1
-                    }
-                    all_placements = list(self.collection.find({}, projection)
-                                        .sort([("_id", -1)])
-                                        .limit(500))  # Limit for performance
+                    pipeline = batch_placements_pipeline(year_int, projection, limit=500, branch=branch)
+                    placements, batch_filtered = list(student_collection.aggregate(pipeline)), True
                 except Exception as e:
-                    print(f"Error fetching placements: {e}")
-                    all_placements = []
+                    print(f"Error fetching batch placements: {e}")
+                    batch_filtered = True
 
-            # Filter placements
-            placements = all_placements
+        # Get the branch's (or all) placements with pagination and projection - indexed: student_branch_1
+        source = self.reader()
+        if not batch_filtered and source is not None:
+            try:
+                query = {"student_branch": branch} if branch else {}
+                placements = list(source.find(query, projection)
+                                  .sort([("_id", -1)])
+                                  .limit(500))  # Limit for performance
+            except Exception as e:
+                print(f"Error fetching placements: {e}")
+                placements = []
+
+        return stats_counters.summarize("placed_student", placements), batch_filtered
+
+    def render_placed_charts(self, charts_container, loading_label, counters, batch_filtered):
+        """Draw the analytics charts from the fetched counters"""
+        try:
+            placement_count = counters.get("placement_total", 0)
             selected_year = self.placed_batch_year_var.get().strip()
             selected_branch = self.placed_branch_filter_var.get() if hasattr(self, 'placed_branch_filter_var') else "All Branches"
             filter_parts = []
@@ -154,43 +280,25 @@ class PlacedStudentManager:
             if selected_year:
                 try:
                     year_int = int(selected_year)
-                    year_str = str(year_int)
-                    
-                    # Get students from that batch
-                    from database_config import get_student_collection
-                    student_collection = get_student_collection()
-                    if student_collection is not None:
-                        # Find students with matching admission year (check both int and string)
-                        batch_student_names = set()
-                        all_students = list(student_collection.find())
-                        for s in all_students:
-                            admission_year = s.get("admission_year") or s.get("personal_info", {}).get("admission_year")
-                            if admission_year is not None:
-                                if str(admission_year) == year_str or admission_year == year_int:
-                                    name = s.get("name") or s.get("personal_info", {}).get("name", "")
-                                    if name:
-                                        batch_student_names.add(name.upper())
-                        
-                        placements = [p for p in placements if p.get("student_name", "").upper() in batch_student_names]
+                    if batch_filtered:
                         filter_parts.append(f"Batch {year_int}")
                 except ValueError:
                     filter_parts.append("Invalid year")
                     status_color = COLORS["error"]
 
-            # Apply branch filter
+            # Branch filter (already applied by fetch_chart_placements)
             if selected_branch and selected_branch != "All Branches":
-                placements = [p for p in placements if p.get("student_branch", "").upper() == selected_branch.upper()]
                 filter_parts.append(f"Branch: {selected_branch}")
 
             # Build filter status message
             if filter_parts:
-                filter_status = f"{' | '.join(filter_parts)} - {len(placements)} placements"
-                if len(placements) > 0:
+                filter_status = f"{' | '.join(filter_parts)} - {placement_count} placements"
+                if placement_count > 0:
                     status_color = COLORS["success"]
                 else:
                     status_color = COLORS["warning"]
             else:
-                filter_status = f"All Data - {len(all_placements)} placements"
+                filter_status = f"All Data - {placement_count} placements"
                 status_color = COLORS["info"]
 
             # Remove loading label
@@ -201,43 +309,44 @@ class PlacedStudentManager:
                                         font=("Arial", 13, "bold"), text_color=status_color)
             status_label.pack(pady=10)
 
-            if not placements:
+            if not placement_count:
                 error_label = ctk.CTkLabel(charts_container, text="❌ No placement data to display.",
                                            font=("Arial", 12), text_color=COLORS["error"])
                 error_label.pack(pady=50)
                 return
 
-            import matplotlib.pyplot as plt
-            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-            from matplotlib.figure import Figure
-
             # Row 1: 2 charts
             row1_frame = ctk.CTkFrame(charts_container, fg_color=COLORS["content_frame"])
             row1_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
+            branches = self.get_placements_by_branch(counters)
+            packages = self.get_placements_by_package(counters)
+            top_companies = self.get_top_companies(counters)
+            hr_names = self.get_placements_by_hr(counters)
+
             # Chart 1: Placements by Branch
-            self.create_placed_chart(row1_frame, "Placements by Branch",
-                                     self.get_placements_by_branch(placements), "pie", row1_frame)
+            self.create_placed_chart(row1_frame, "Placements by Branch", branches, "pie", row1_frame)
 
             # Chart 2: Placements by Package
-            self.create_placed_chart(row1_frame, "Placements by Package",
-                                     self.get_placements_by_package(placements), "bar", row1_frame)
+            self.create_placed_chart(row1_frame, "Placements by Package", packages, "bar", row1_frame)
 
             # Row 2: 2 charts
             row2_frame = ctk.CTkFrame(charts_container, fg_color=COLORS["content_frame"])
             row2_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
             # Chart 3: Top Companies
-            self.create_placed_chart(row2_frame, "Top 10 Companies by Placements",
-                                     self.get_top_companies(placements), "bar", row2_frame)
+            self.create_placed_chart(row2_frame, "Top 10 Companies by Placements", top_companies, "bar", row2_frame)
 
             # Chart 4: Placements by HR
-            self.create_placed_chart(row2_frame, "Placements by HR",
-                                     self.get_placements_by_hr(placements), "pie", row2_frame)
+            self.create_placed_chart(row2_frame, "Placements by HR", hr_names, "pie", row2_frame)
 
-            # Store chart data for export
+            # Store the aggregated series (not the documents) for export
             self.current_chart_data = {
-                'placements': placements,
+                'count': placement_count,
+                'branches': branches,
+                'packages': packages,
+                'top_companies': top_companies,
+                'hr_names': hr_names,
                 'filter_status': filter_status
             }
 
@@ -255,10 +364,6 @@ class PlacedStudentManager:
 
     def create_placed_chart(self, parent, title, data, chart_type, row_frame):
         """Create a placement chart"""
-        import matplotlib.pyplot as plt
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        from matplotlib.figure import Figure
-
         frame = ctk.CTkFrame(row_frame, fg_color=COLORS["section_frame"], corner_radius=10)
         frame.pack(side='left', fill='both', expand=True, padx=5, pady=5)
 
@@ -267,111 +372,30 @@ class PlacedStudentManager:
         title_label.pack(pady=10)
 
         try:
-            fig = Figure(figsize=(6.5, 5), dpi=100, facecolor='#2b2b2b', edgecolor='none')
-            ax = fig.add_subplot(111)
-            ax.set_facecolor('#1e1e1e')
-            fig.subplots_adjust(left=0.12, right=0.95, top=0.88, bottom=0.18)
-
-            if chart_type == "pie" and data:
-                labels, sizes = data
-                colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6', '#1ABC9C', '#E67E22', '#34495E']
-                # Custom autopct function to show both value and percentage
-                def make_autopct(values):
-                    def autopct(pct):
-                        total = sum(values)
-                        val = int(round(pct * total / 100.0))
-                        return f'{val}\n({pct:.1f}%)'
-                    return autopct
-                ax.pie(sizes, labels=labels, autopct=make_autopct(sizes), colors=colors[:len(labels)],
-                       textprops={'color': 'white', 'fontsize': 9, 'weight': 'bold'})
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-
-            elif chart_type == "bar" and data:
-                labels, values = data
-                colors = ['#3498DB', '#2CC985', '#F39C12', '#E74C3C', '#9B59B6']
-                bars = ax.bar(range(len(labels)), values, color=colors[:len(labels)])
-
-                # Add value labels in the middle of bars for better visibility
-                for i, bar in enumerate(bars):
-                    height = bar.get_height()
-                    if height > 0:  # Only add label if bar has height
-                        # Position text in the middle of the bar
-                        y_pos = height / 2
-                        x_pos = bar.get_x() + bar.get_width() / 2.
-                        
-                        # Adjust font size based on bar height for better fit
-                        font_size = min(12, max(8, int(height / 5)))
-                        
-                        ax.text(x_pos, y_pos, f'{int(height)}',
-                                ha='center', va='center', color='white', 
-                                fontsize=font_size, weight='bold',
-                                bbox=dict(boxstyle='round,pad=0.3', facecolor='black', alpha=0.8))
-
-                ax.set_xticks(range(len(labels)))
-                ax.set_xticklabels(labels, rotation=45, ha='right', color='white', fontsize=11, weight='bold')
-                ax.tick_params(axis='y', colors='white', labelsize=10)
-                ax.set_title(title, color='white', fontsize=14, fontweight='bold', pad=20)
-                ax.grid(axis='y', alpha=0.3, color='white')
-
-            canvas = FigureCanvasTkAgg(fig, master=frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill='both', expand=True, padx=5, pady=5)
+            # Drawn in a worker process; the Tk thread only shows the finished image
+            chart_renderer.show(f"placed:{title}", frame, "placed", title, chart_type, data,
+                                figsize=(6.5, 5), dpi=100)
 
         except Exception as e:
             error_label = ctk.CTkLabel(frame, text=f"Error: {str(e)[:50]}",
                                        font=("Arial", 10), text_color=COLORS["error"])
             error_label.pack(pady=10)
 
-    def get_placements_by_branch(self, placements):
+    def get_placements_by_branch(self, counters):
         """Get placements by branch"""
-        branches = {}
-        for placement in placements:
-            branch = placement.get("student_branch", "Unknown")
-            branches[branch] = branches.get(branch, 0) + 1
-
-        if not branches:
-            return (["No Data"], [0])
+        return top_counts(counters.get("placed_branches", {}))
 
-        return (list(branches.keys()), list(branches.values()))
-
-    def get_placements_by_package(self, placements):
+    def get_placements_by_package(self, counters):
         """Get placements by package"""
-        packages = {}
-        for placement in placements:
-            pkg = placement.get("package", "Unknown")
-            packages[pkg] = packages.get(pkg, 0) + 1
-
-        if not packages:
-            return (["No Data"], [0])
+        return top_counts(counters.get("placed_package_buckets", {}))
 
-        sorted_pkg = sorted(packages.items(), key=lambda x: x[1], reverse=True)[:8]
-        return (list(dict(sorted_pkg).keys()), list(dict(sorted_pkg).values()))
-
-    def get_top_companies(self, placements):
+    def get_top_companies(self, counters):
         """Get top companies by placement count"""
-        companies = {}
-        for placement in placements:
-            company = placement.get("company_name", "Unknown")
-            companies[company] = companies.get(company, 0) + 1
-
-        if not companies:
-            return (["No Data"], [0])
+        return top_counts(counters.get("placed_companies", {}), 10)
 
-        sorted_comp = sorted(companies.items(), key=lambda x: x[1], reverse=True)[:10]
-        return (list(dict(sorted_comp).keys()), list(dict(sorted_comp).values()))
-
-    def get_placements_by_hr(self, placements):
+    def get_placements_by_hr(self, counters):
         """Get placements by HR"""
-        hrs = {}
-        for placement in placements:
-            hr = placement.get("hr_name", "Unknown")
-            hrs[hr] = hrs.get(hr, 0) + 1
-
-        if not hrs:
-            return (["No Data"], [0])
-
-        sorted_hr = sorted(hrs.items(), key=lambda x: x[1], reverse=True)[:8]
-        return (list(dict(sorted_hr).keys()), list(dict(sorted_hr).values()))
+        return top_counts(counters.get("placed_hr", {}), 8)
 
     def setup_add_placed_student_tab(self, tab):
         # Title
@@ -382,6 +406,7 @@ class PlacedStudentManager:
         # Placed Student Information Section - Compact 2-column layout
         placed_frame = ctk.CTkFrame(tab, fg_color=COLORS["section_frame"], corner_radius=10)
         placed_frame.pack(fill='x', padx=10, pady=5)
+        self.placed_form_anchor = placed_frame
 
         ctk.CTkLabel(placed_frame, text="🎓 PLACED STUDENT INFORMATION",
                      font=("Arial", 14, "bold"), text_color=COLORS["info"]).pack(pady=8)
@@ -481,7 +506,7 @@ class PlacedStudentManager:
         upload_grid = ctk.CTkFrame(upload_frame, fg_color=COLORS["section_frame"])
         upload_grid.pack(fill='x', padx=15, pady=8)
 
-        ctk.CTkLabel(upload_grid, text="Offer Letter (PDF, max 100KB):", font=("Arial", 11, "bold")).grid(row=0, column=0, sticky='w', padx=5, pady=4)
+        ctk.CTkLabel(upload_grid, text=f"Offer Letter (PDF, max {self.pdf_manager.max_pdf_size // 1024}KB):", font=("Arial", 11, "bold")).grid(row=0, column=0, sticky='w', padx=5, pady=4)
         
         upload_row = ctk.CTkFrame(upload_grid, fg_color=COLORS["section_frame"])
         upload_row.grid(row=0, column=1, columnspan=3, sticky='w', padx=5, pady=4)
@@ -535,7 +560,20 @@ class PlacedStudentManager:
         # Submit button - compact
         submit_btn = ctk.CTkButton(tab, text="➕ ADD PLACED STUDENT", command=self.add_placed_student,
                                    fg_color=COLORS["success"], font=("Arial", 14, "bold"), height=40, width=180)
-        submit_btn.pack(pady=15)
+        submit_btn.pack(pady=(15, 5))
+
+        # Many records at once from a spreadsheet
+        import_btn = ctk.CTkButton(tab, text="📥 BULK IMPORT (CSV/XLSX)", command=self.bulk_import_placements,
+                                   fg_color=COLORS["info"], font=("Arial", 12, "bold"), height=35, width=220)
+        import_btn.pack(pady=(0, 15))
+
+    def bulk_import_placements(self):
+        """Import placements from a CSV/XLSX file - upserted on student and company name"""
+        def on_done(result):
+            cache_sync.notify_write("placed_student")
+            local_store.request_sync(["placed_student"])  # Pull the imported rows into the local replica
+
+        bulk_importer.import_from_dialog(self.placed_form_anchor, "placed_student", "Import Placements", on_done=on_done)
 
     def browse_offer_letter(self):
         """Browse and select offer letter PDF file"""
@@ -549,11 +587,12 @@ class PlacedStudentManager:
         )
         
         if file_path:
-            # Check file size (max 100KB = 102400 bytes)
+            # Check file size against the PDF manager's configured limit
             file_size = os.path.getsize(file_path)
-            if file_size > 150000:
+            max_size = self.pdf_manager.max_pdf_size
+            if file_size > max_size:
                 messagebox.showerror("File Too Large", 
-                    f"File size is {file_size/1500:.1f} KB. Maximum allowed is 150 KB.\n"
+                    f"File size is {file_size/1024:.1f} KB. Maximum allowed is {max_size/1024:.0f} KB.\n"
                     "Please compress the PDF or select a smaller file.")
                 return
             
@@ -576,40 +615,6 @@ class PlacedStudentManager:
                 f"Unique Key: {unique_key}\n\n"
                 f"Note: PDF will be stored in separate database when you submit the form.")
 
-    def store_offer_letter_in_db(self, pdf_key, file_path, student_name, company_name):
-        """Store offer letter PDF in separate database with linking key"""
-        try:
-            if not self.offer_letters_collection:
-                return False
-                
-            # Read PDF file as binary data
-            with open(file_path, 'rb') as pdf_file:
-                pdf_data = pdf_file.read()
-            
-            # Create offer letter document with linking information
-            offer_letter_doc = {
-                "pdf_key": pdf_key,  # Unique key to link with placement record
-                "student_name": student_name,
-                "company_name": company_name,
-                "filename": os.path.basename(file_path),
-                "file_size": len(pdf_data),
-                "pdf_data": pdf_data,  # Binary PDF data
-                "upload_date": datetime.datetime.now(),
-                "file_type": "application/pdf"
-            }
-            
-            # Store in offer letters database
-            result = self.offer_letters_collection.insert_one(offer_letter_doc)
-            
-            if result.inserted_id:
-                return True
-            else:
-                return False
-                
-        except Exception as e:
-            messagebox.showerror("Storage Error", f"Failed to store offer letter: {e}")
-            return False
-
     def clear_offer_letter(self):
         """Clear selected offer letter"""
         self.offer_letter_path_var.set("")
@@ -620,7 +625,7 @@ class PlacedStudentManager:
         """Store offer letter PDF in separate database using PDF manager"""
         try:
             # Use the PDF manager to store the PDF
-            stored_pdf_key = pdf_manager.store_pdf(file_path, student_name, company_name)
+            stored_pdf_key = self.pdf_manager.store_pdf(file_path, student_name, company_name)
             
             if stored_pdf_key:
                 # Update the pdf_key variable to use the generated key
@@ -635,36 +640,42 @@ class PlacedStudentManager:
 
     def verify_offer_letter_exists(self, pdf_key):
         """Verify if offer letter exists in the separate database"""
-        return pdf_manager.pdf_exists(pdf_key)
+        return self.pdf_manager.pdf_exists(pdf_key)
+
+    def verify_offer_letters_exist(self, placements):
+        """Bulk-verify offer letters for a list of placements, returns the set of existing keys"""
+        pdf_keys = [p.get("offer_letter_pdf_key") for p in placements if p.get("offer_letter_pdf_key")]
+        if not pdf_keys:
+            return set()
+        return self.pdf_manager.pdf_exists_many(pdf_keys)
 
     def view_offer_letter(self, student_name, company_name):
         """View offer letter PDF for a specific student and company"""
-        try:
+        def fetch_and_open():
             # Find the placement record to get PDF key
-            placement = self.collection.find_one({
+            placement = self.writer().find_one({
                 "student_name": student_name,
                 "company_name": company_name
             })
-            
+
             if not placement or not placement.get("offer_letter_pdf_key"):
-                messagebox.showwarning("No Offer Letter", "No offer letter found for this placement.")
-                return
-            
-            pdf_key = placement["offer_letter_pdf_key"]
-            
+                return None
+
             # Use PDF manager to view the PDF
-            result = pdf_manager.view_pdf(pdf_key)
-            
-            if result['success']:
+            return self.pdf_manager.view_pdf(placement["offer_letter_pdf_key"])
+
+        def on_done(result):
+            if result is None:
+                messagebox.showwarning("No Offer Letter", "No offer letter found for this placement.")
+            elif result['success']:
                 messagebox.showinfo("PDF Opened", result['message'])
             else:
                 messagebox.showerror("Error Opening PDF", result['message'])
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to view offer letter: {e}")
+
+        async_db.submit(self.placed_results_frame, fetch_and_open, on_success=on_done,
+                        on_error=lambda e: messagebox.showerror("Error", f"Failed to view offer letter: {e}"))
 
     def add_placed_student(self):
-        import os
         import datetime
         # Validate required fields
         if not all([self.student_name_var.get(), self.student_branch_var.get(),
@@ -678,30 +689,7 @@ class PlacedStudentManager:
         # Prepare placed student data
         student_name = self.student_name_var.get().upper()
         company_name = self.placed_company_name_var.get().upper()
-        
-        # Handle PDF storage using PDF manager
-        pdf_key = None
-        pdf_stored = False
-        
-        if self.offer_letter_path_var.get():
-            try:
-                # Use PDF manager to store the PDF
-                pdf_key = pdf_manager.store_pdf(
-                    self.offer_letter_path_var.get(),
-                    student_name,
-                    company_name
-                )
-                pdf_stored = True
-                
-            except Exception as e:
-                result = messagebox.askyesno("PDF Storage Failed", 
-                    f"Failed to store the offer letter PDF:\n{str(e)}\n\n"
-                    "Do you want to continue saving the placement record without the PDF?")
-                if not result:
-                    return
-                pdf_key = None
-                pdf_stored = False
-            
+
         placed_student_data = {
             "student_name": student_name,
             "student_branch": self.student_branch_var.get().upper(),
@@ -710,30 +698,46 @@ class PlacedStudentManager:
             "position": self.position_var.get().upper(),
             "year_of_placement": self.year_of_placement_var.get(),
             "package": self.placed_package_var.get().upper(),
+            "package_lpa": parse_package_lpa(self.placed_package_var.get()),
             "email": self.placed_email_var.get(),  # Keep email in original format
             "contact_info": self.placed_contact_info_var.get(),
             "hr_name": self.placed_hr_name_var.get().upper(),
             "address": self.placed_address_var.get().upper(),
             # New fields
-            "offer_letter_pdf_key": pdf_key,  # Key to link with offer letters database
+            "offer_letter_pdf_key": None,  # Key to link with offer letters database
             "placement_suggestion": self.placement_suggestion_var.get().upper(),
             "company_levels": self.company_levels_var.get().upper(),
             "skills_required": self.skills_required_var.get().upper(),
             "important_suggestions": self.important_suggestions_var.get().upper(),
             "created_date": datetime.datetime.now(),
-            "has_offer_letter": pdf_stored
+            "has_offer_letter": False,
+            SCHEMA_VERSION_FIELD: SCHEMA_VERSIONS["placed_student"]
         }
 
-        try:
-            if self.collection is not None:
-                # Check for duplicate
-                existing = self.collection.find_one({
-                    "$and": [
-                        {"student_name": placed_student_data["student_name"]},
-                        {"company_name": placed_student_data["company_name"]}
-                    ]
-                })
+        def save_record(pdf_key, pdf_stored):
+            placed_student_data["offer_letter_pdf_key"] = pdf_key
+            placed_student_data["has_offer_letter"] = pdf_stored
+            # The new letter is stored pending - it replaces the previous one only once a placement
+            # points at it, and is discarded if the save is abandoned
+            saved = {"placement": False}
+
+            def activate_letter():
+                saved["placement"] = True
+                if pdf_stored:
+                    self.pdf_manager.activate_pdf(pdf_key)
+
+            def discard_letter():
+                if pdf_stored and not saved["placement"]:
+                    async_db.submit(self.placed_form_anchor, self.pdf_manager.discard_pdf, pdf_key)
+
+            def on_error(e):
+                discard_letter()
+                if isinstance(e, DuplicateKeyError):
+                    messagebox.showerror("Duplicate Found", "This student already has a placement record for this company.")
+                    return
+                messagebox.showerror("Error", f"Failed to add placed student: {e}")
 
+            def on_duplicate_checked(existing):
                 if existing:
                     # Ask user if they want to update existing record
                     existing_student = existing.get("student_name", "Unknown")
@@ -743,39 +747,73 @@ class PlacedStudentManager:
                         f"Student: {existing_student}\n"
                         f"Company: {existing_company}\n\n"
                         f"Do you want to UPDATE the existing record with new data?")
-                    
+
                     if result:
                         # Update existing record
-                        self.collection.update_one(
-                            {"_id": existing["_id"]},
-                            {"$set": placed_student_data}
-                        )
-                        # Invalidate cache after updating placement
-                        invalidate_cache('placements')
                         success_msg = f"Placement record for '{existing_student}' updated successfully!"
                         if pdf_stored:
                             success_msg += f"\n📄 Offer letter stored with key: {pdf_key}"
-                        messagebox.showinfo("Success", success_msg)
-                        self.clear_placed_student_form()
+
+                        def update_placement():
+                            local_store.write_through("placed_student", {"_id": existing["_id"]},
+                                                      stats_counters.update_one, self.writer(),
+                                                      "placed_student", {"_id": existing["_id"]},
+                                                      with_updated_at({"$set": with_search_tokens(
+                                                          "placed_student", placed_student_data)}))
+                            activate_letter()
+
+                        async_db.submit(self.placed_form_anchor, update_placement,
+                                        on_success=lambda _: on_saved(success_msg), on_error=on_error)
+                    else:
+                        # The existing record keeps its letter
+                        discard_letter()
                     return
 
-                # Insert new record
-                result = self.collection.insert_one(placed_student_data)
-                if result.inserted_id:
-                    # Invalidate cache after adding new placement
-                    invalidate_cache('placements')
-                    success_msg = "Placed student added successfully!"
-                    if pdf_stored:
-                        success_msg += f"\n📄 Offer letter stored with key: {pdf_key}"
-                        success_msg += f"\n🔗 PDF linked to placement record"
-                    messagebox.showinfo("Success", success_msg)
-                    self.clear_placed_student_form()
-                else:
-                    messagebox.showerror("Error", "Failed to add placement record")
-            else:
-                messagebox.showerror("Error", "Database connection failed")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add placed student: {e}")
+                # Nothing matched - the record was inserted by the same call
+                success_msg = "Placed student added successfully!"
+                if pdf_stored:
+                    success_msg += f"\n📄 Offer letter stored with key: {pdf_key}"
+                    success_msg += f"\n🔗 PDF linked to placement record"
+                on_saved(success_msg)
+
+            def on_saved(success_msg):
+                # Invalidate cache here and on the other clients after adding/updating placement
+                cache_sync.notify_write("placed_student")
+                messagebox.showinfo("Success", success_msg)
+                self.clear_placed_student_form()
+
+            def insert_placement():
+                # Resolve the stable student reference in the same worker call as the insert
+                with_student_id(placed_student_data)
+                owner = {"student_name": placed_student_data["student_name"],
+                         "company_name": placed_student_data["company_name"]}
+                existing = local_store.write_through("placed_student", owner, stats_counters.insert_unless_exists,
+                                                     self.writer(), "placed_student",
+                                                     with_search_tokens("placed_student", placed_student_data))
+                if not existing:
+                    activate_letter()
+                return existing
+
+            # Insert unless this student-company pair exists - one atomic round trip on the unique index
+            async_db.submit(self.placed_form_anchor, insert_placement,
+                            on_success=on_duplicate_checked, on_error=on_error, busy=self.connecting())
+
+        # Handle PDF storage using PDF manager
+        offer_letter_path = self.offer_letter_path_var.get()
+        if offer_letter_path:
+            def on_pdf_failed(e):
+                result = messagebox.askyesno("PDF Storage Failed", 
+                    f"Failed to store the offer letter PDF:\n{str(e)}\n\n"
+                    "Do you want to continue saving the placement record without the PDF?")
+                if result:
+                    save_record(None, False)
+
+            async_db.submit(self.placed_form_anchor, self.pdf_manager.store_pdf,
+                            offer_letter_path, student_name, company_name, raise_errors=True, pending=True,
+                            on_success=lambda pdf_key: save_record(pdf_key, True),
+                            on_error=on_pdf_failed)
+        else:
+            save_record(None, False)
 
     def clear_placed_student_form(self):
         # Clear all form fields
@@ -858,7 +896,7 @@ class PlacedStudentManager:
         search_row2 = ctk.CTkFrame(search_frame, fg_color=COLORS["section_frame"])
         search_row2.pack(fill='x', padx=10, pady=4)
 
-        ctk.CTkLabel(search_row2, text="Show:", font=("Arial", 11, "bold")).pack(side='left', padx=5)
+        ctk.CTkLabel(search_row2, text="Per Page:", font=("Arial", 11, "bold")).pack(side='left', padx=5)
         self.placed_result_limit_var = ctk.StringVar(value="50")
         limit_options = ["10", "20", "50", "100", "All"]
         ctk.CTkOptionMenu(search_row2, variable=self.placed_result_limit_var, values=limit_options,
@@ -916,14 +954,22 @@ class PlacedStudentManager:
         """Optimized advanced search with multiple filters"""
         batch_clear_widgets(self.placed_results_frame)
 
-        # Show loading indicator
-        loading_label = ctk.CTkLabel(self.placed_results_frame, text="⏳ Searching placements...",
+        # Show loading indicator - the first search may still be waiting on the DB handshake
+        text = "⏳ Connecting to database..." if self.connecting() else "⏳ Searching placements..."
+        loading_label = ctk.CTkLabel(self.placed_results_frame, text=text,
                                      font=("Arial", 16, "bold"), text_color=COLORS["info"])
         loading_label.pack(pady=50)
-        self.placed_results_frame.update()
 
+        # Bind the collection on a worker, then build the table here
+        async_db.submit(self.placed_results_frame, self.reader,
+                        on_success=lambda source: self.show_placed_search(source, loading_label),
+                        on_error=lambda e: self.show_placed_search_error(e, loading_label),
+                        key="placed_search_source")
+
+    def show_placed_search(self, source, loading_label):
+        """Run the advanced search against source once it is bound"""
         try:
-            if self.collection is None:
+            if source is None:
                 loading_label.destroy()
                 ctk.CTkLabel(self.placed_results_frame, text="Database connection failed",
                              font=("Arial", 14)).pack(pady=20)
@@ -937,97 +983,71 @@ class PlacedStudentManager:
                 "hr_name": self.search_placed_hr_var.get().strip()
             }
             
-            query_conditions = []
-            for field, value in filters.items():
-                if value:
-                    query_conditions.append({field: {"$regex": value, "$options": "i"}})
-
-            # Package filter with optimized numeric extraction
             package = self.search_placed_package_var.get().strip()
-            if package:
-                package_num = extract_numeric_value(package)
-                if package_num > 0:
-                    query_conditions.append({"package": {"$regex": str(int(package_num)), "$options": "i"}})
-                else:
-                    query_conditions.append({"package": {"$regex": package, "$options": "i"}})
-
-            query = {"$and": query_conditions} if query_conditions else {}
+            query = self.placed_search_query(filters, package)
 
             # Get result limit efficiently
             limit_str = self.placed_result_limit_var.get()
             limit = None if limit_str == "All" else safe_int_convert(limit_str, 50)
 
-            # Optimized database query with projection - Include ALL fields for new functionality
-            projection = {
-                "student_name": 1, "student_branch": 1, "batch": 1, "company_name": 1,
-                "position": 1, "year_of_placement": 1, "package": 1, "hr_name": 1,
-                "contact_info": 1, "email": 1, "address": 1,
-                # Include new fields
-                "offer_letter_pdf_key": 1, "placement_suggestion": 1, "company_levels": 1,
-                "skills_required": 1, "important_suggestions": 1, "has_offer_letter": 1,
-                "created_date": 1
-            }
-            
-            cursor = self.collection.find(query, projection).sort("_id", -1)
-            if limit:
-                cursor = cursor.limit(limit)
-            
-            placed_students = list(cursor)
-
-            # Client-side package filtering if numeric threshold provided
-            if package:
-                package_threshold = extract_numeric_value(package)
-                if package_threshold > 0:
-                    placed_students = self._filter_placements_by_package(placed_students, package_threshold)
-
-            loading_label.destroy()
-
-            if not placed_students:
-                ctk.CTkLabel(self.placed_results_frame, text="❌ No placements found matching your criteria",
-                             font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
-                return
+            def placed_source(sort):
+                # "All" streams keyset pages on scroll, otherwise one page at a time with Prev/Next
+                self.placed_pager = KeysetPager(source, query, PLACED_SEARCH_PROJECTION,
+                                                page_size=limit or PAGE_SIZE, sort=sort)
+                return pager_source(self.placed_pager, transform=self.mark_offer_letters, single=bool(limit))
 
             # Format filter info efficiently
             filter_text = format_filter_info(filters)
             if package:
                 filter_text += f" | Package: {package}"
 
-            # Store current placements for export
-            self.current_placements = placed_students
+            self.current_placements = []
 
-            # Create professional table
-            self.create_professional_placed_table(placed_students, filter_text)
+            # Create professional table - rows are paged in as the user scrolls
+            self.create_professional_placed_table(placed_source, filter_text, loading_label, paged=bool(limit))
 
         except Exception as e:
-            if 'loading_label' in locals():
-                loading_label.destroy()
-            ctk.CTkLabel(self.placed_results_frame, text=f"Error searching placements: {e}",
-                         font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
+            self.show_placed_search_error(e, loading_label)
+
+    def placed_search_query(self, filters, package=""):
+        """Query for the advanced search filters and package text"""
+        # Indexed token prefix search on the normalized search_tokens field
+        query_conditions = []
+        text_query = build_search_query("placed_student", filters)
+        if text_query:
+            query_conditions.append(text_query)
+
+        # Package filter - indexed range query on the normalized package_lpa field
+        if package:
+            package_lpa = parse_package_lpa(package)
+            if package_lpa:
+                query_conditions.append({"package_lpa": {"$gte": package_lpa}})
+            else:
+                query_conditions.append({"package": {"$regex": re.escape(package), "$options": "i"}})
+
+        return {"$and": query_conditions} if query_conditions else {}
 
-    def _filter_placements_by_package(self, placements, threshold):
-        """Efficiently filter placements by package threshold - O(n) single pass"""
-        filtered = []
+    def mark_offer_letters(self, placements):
+        """Flag each placement whose offer letter exists - one batched lookup per page"""
+        existing_pdf_keys = self.verify_offer_letters_exist(placements)
         for placed in placements:
-            placed_package = placed.get("package", "")
-            if placed_package:
-                placed_package_num = extract_numeric_value(placed_package)
-                # Convert LPA to actual amount if needed
-                if "lpa" in str(placed_package).lower():
-                    placed_package_num *= 100000
-                if placed_package_num >= threshold:
-                    filtered.append(placed)
-            else:
-                filtered.append(placed)  # Include placements without package info
-        return filtered
+            placed["_offer_letter_exists"] = placed.get("offer_letter_pdf_key") in existing_pdf_keys
+        return placements
+
+    def show_placed_search_error(self, error, loading_label):
+        if loading_label.winfo_exists():
+            loading_label.destroy()
+        ctk.CTkLabel(self.placed_results_frame, text=f"Error searching placements: {error}",
+                     font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
 
-    def create_professional_placed_table(self, placements, filter_text=""):
-        """Create a high-performance professional table using ttk.Treeview for placements"""
-        import tkinter as tk
+    def create_professional_placed_table(self, placed_source, filter_text="", loading_label=None, paged=False):
+        """Create a virtualized professional table using ttk.Treeview for placements"""
         from tkinter import ttk
 
+        self.placed_table_paged = paged
+
         # Create table container
         table_container = ctk.CTkFrame(self.placed_results_frame, fg_color=COLORS["content_frame"])
-        table_container.pack(fill='both', expand=True, padx=5, pady=5)
 
         # Configure ttk style for dark theme
         style = ttk.Style()
@@ -1055,33 +1075,6 @@ class PlacedStudentManager:
             background=[("active", "#2980b9")]
         )
 
-        # Define columns with new fields
-        columns = ("idx", "student_name", "branch", "batch", "company", "position", "year", "package", "hr_name", "contact", "email", "address", "offer_letter", "suggestion", "levels", "skills", "notes")
-
-        # Create Treeview with scrollbars
-        tree_frame = tk.Frame(table_container, bg="#1e1e1e")
-        tree_frame.pack(fill='both', expand=True)
-
-        # Scrollbars
-        v_scroll = ttk.Scrollbar(tree_frame, orient="vertical")
-        v_scroll.pack(side="right", fill="y")
-
-        h_scroll = ttk.Scrollbar(tree_frame, orient="horizontal")
-        h_scroll.pack(side="bottom", fill="x")
-
-        # Create Treeview
-        self.placed_tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show="headings",
-            style="Placed.Treeview",
-            yscrollcommand=v_scroll.set,
-            xscrollcommand=h_scroll.set
-        )
-
-        v_scroll.config(command=self.placed_tree.yview)
-        h_scroll.config(command=self.placed_tree.xview)
-
         # Define column headings and widths with new fields
         col_config = [
             ("idx", "#", 50),
@@ -1103,80 +1096,92 @@ class PlacedStudentManager:
             ("notes", "Important Notes", 200)
         ]
 
-        for col_id, heading, width in col_config:
-            self.placed_tree.heading(col_id, text=heading, anchor="center")
-            self.placed_tree.column(col_id, width=width, minwidth=width, anchor="center")
-
-        self.placed_tree.pack(fill='both', expand=True)
+        # Header click sorts on the server by these fields
+        sort_fields = {
+            "student_name": "student_name", "branch": "student_branch", "batch": "batch",
+            "company": "company_name", "position": "position", "year": "year_of_placement",
+            "package": "package_lpa", "hr_name": "hr_name"
+        }
 
-        # Configure row tags for alternating colors
-        self.placed_tree.tag_configure("oddrow", background="#2b2b2b")
-        self.placed_tree.tag_configure("evenrow", background="#1e1e1e")
-        self.placed_tree.tag_configure("high_package", foreground="#2CC985")
-        self.placed_tree.tag_configure("medium_package", foreground="#F39C12")
+        def format_row(placed, idx):
+            # New fields - Enhanced offer letter handling
+            offer_letter = "No"
+            if placed.get("offer_letter_pdf_key"):
+                offer_letter = "📄 Click to View" if placed.get("_offer_letter_exists") else "❌ Missing"
+
+            values = (
+                idx,
+                placed.get("student_name", "N/A"),
+                placed.get("student_branch", "N/A"),
+                placed.get("batch", "N/A"),
+                placed.get("company_name", "N/A"),
+                placed.get("position", "N/A"),
+                placed.get("year_of_placement", "N/A"),
+                placed.get("package", "N/A"),
+                placed.get("hr_name", "N/A"),
+                placed.get("contact_info", "N/A"),
+                placed.get("email", "N/A"),
+                placed.get("address", "N/A"),
+                offer_letter,
+                placed.get("placement_suggestion", "N/A"),
+                placed.get("company_levels", "N/A"),
+                placed.get("skills_required", "N/A"),
+                placed.get("important_suggestions", "N/A")
+            )
+            # Color code by package tier
+            package_tier = package_tag(placed)
+            return values, [package_tier] if package_tier else []
 
-        # Insert data
-        for idx, placed in enumerate(placements, 1):
-            try:
-                student_name = placed.get("student_name", "N/A")
-                branch = placed.get("student_branch", "N/A")
-                batch = placed.get("batch", "N/A")
-                company = placed.get("company_name", "N/A")
-                position = placed.get("position", "N/A")
-                year = placed.get("year_of_placement", "N/A")
-                package = placed.get("package", "N/A")
-                hr_name = placed.get("hr_name", "N/A")
-                contact = placed.get("contact_info", "N/A")
-                email = placed.get("email", "N/A")
-                address = placed.get("address", "N/A")
-                
-                # New fields - Enhanced offer letter handling
-                pdf_key = placed.get("offer_letter_pdf_key")
-                offer_letter = "No"
-                
-                if pdf_key:
-                    # Verify PDF exists in offer letters database using PDF manager
-                    if self.verify_offer_letter_exists(pdf_key):
-                        offer_letter = "📄 Click to View"
-                    else:
-                        offer_letter = "❌ Missing"
-                
-                suggestion = placed.get("placement_suggestion", "N/A")
-                levels = placed.get("company_levels", "N/A")
-                skills = placed.get("skills_required", "N/A")
-                notes = placed.get("important_suggestions", "N/A")
+        # Info bar at bottom
+        info_frame = ctk.CTkFrame(self.placed_results_frame, fg_color=COLORS["section_frame"], height=40)
+        info_label = ctk.CTkLabel(info_frame, text="", font=("Arial", 10, "bold"), text_color=COLORS["success"])
+        info_label.pack(side='left', padx=10, pady=8)
+        navigator = None
 
-                values = (idx, student_name, branch, batch, company, position, year, package, hr_name, contact, email, address, offer_letter, suggestion, levels, skills, notes)
+        def on_page(table):
+            if loading_label is not None and loading_label.winfo_exists():
+                loading_label.destroy()
+            if table.exhausted and not table.docs:
+                table_container.destroy()
+                info_frame.destroy()
+                ctk.CTkLabel(self.placed_results_frame, text="❌ No placements found matching your criteria",
+                             font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
+                return
+            if not table_container.winfo_ismapped():
+                table_container.pack(fill='both', expand=True, padx=5, pady=5)
+                info_frame.pack(fill='x', padx=5, pady=3)
+                info_frame.pack_propagate(False)
 
-                # Determine row tags
-                tags = ["oddrow"] if idx % 2 == 1 else ["evenrow"]
+            # Store current placements for export
+            self.current_placements = table.docs
+            if navigator:
+                navigator.update()
+                count_text = f"Showing {len(table.docs)}"
+            else:
+                count_text = f"Found {len(table.docs)}" if table.exhausted else f"Loaded {len(table.docs)}"
+            info_label.configure(
+                text=f"📊 {count_text} placements | Filters: {filter_text} | Scroll with mouse wheel, click a heading to sort"
+            )
 
-                # Color code by package
-                try:
-                    import re
-                    numbers = re.findall(r'\d+\.?\d*', str(package))
-                    if numbers:
-                        pkg_val = float(numbers[0])
-                        if "lpa" in str(package).lower():
-                            pkg_val = pkg_val * 100000
-                        if pkg_val >= 1000000:  # >= 10 LPA
-                            tags.append("high_package")
-                        elif pkg_val >= 500000:  # >= 5 LPA
-                            tags.append("medium_package")
-                except:
-                    pass
-
-                self.placed_tree.insert("", "end", values=values, tags=tags)
+        self.placed_table = VirtualTreeview(
+            table_container, col_config, "Placed.Treeview", 35, format_row, placed_source,
+            sort_fields=sort_fields, on_page=on_page,
+            on_error=lambda e: self.show_placed_search_error(e, loading_label)
+        )
+        self.placed_table.pack(fill='both', expand=True)
+        self.placed_tree = self.placed_table.tree
 
-            except Exception as e:
-                pass  # Skip problematic records silently
+        if paged:
+            navigator = PageNavigator(info_frame, self.placed_table, lambda: self.placed_pager,
+                                      transform=self.mark_offer_letters)
+            navigator.pack(side='right', padx=10)
 
-        # Mouse wheel scrolling
-        def on_mousewheel(event):
-            self.placed_tree.yview_scroll(int(-1*(event.delta/120)), "units")
+        # Configure row tags for alternating colors
+        self.placed_tree.tag_configure("oddrow", background="#2b2b2b")
+        self.placed_tree.tag_configure("evenrow", background="#1e1e1e")
+        self.placed_tree.tag_configure("high_package", foreground="#2CC985")
+        self.placed_tree.tag_configure("medium_package", foreground="#F39C12")
 
-        self.placed_tree.bind("<MouseWheel>", on_mousewheel)
-        
         # Double-click event to view offer letter
         def on_double_click(event):
             try:
@@ -1244,18 +1249,6 @@ class PlacedStudentManager:
         
         self.placed_tree.bind("<Button-3>", on_right_click)  # Right-click
 
-        # Info bar at bottom
-        info_frame = ctk.CTkFrame(self.placed_results_frame, fg_color=COLORS["section_frame"], height=40)
-        info_frame.pack(fill='x', padx=5, pady=3)
-        info_frame.pack_propagate(False)
-
-        ctk.CTkLabel(
-            info_frame,
-            text=f"📊 Found {len(placements)} placements | Filters: {filter_text} | Scroll with mouse wheel",
-            font=("Arial", 10, "bold"),
-            text_color=COLORS["success"]
-        ).pack(side='left', padx=10, pady=8)
-
     def setup_edit_placed_student_tab(self, tab):
         # Title
         title_label = ctk.CTkLabel(tab, text="✏️ EDIT PLACED STUDENT",
@@ -1303,54 +1296,39 @@ class PlacedStudentManager:
         for widget in self.edit_placed_form_frame.winfo_children():
             widget.destroy()
 
-        try:
-            if self.collection is not None:
-                # Build query based on inputs
-                if student_name and company_name:
-                    # Both fields - more specific search
-                    placements = list(self.collection.find({
-                        "student_name": {"$regex": student_name, "$options": "i"},
-                        "company_name": {"$regex": company_name, "$options": "i"}
-                    }))
-                elif student_name:
-                    # Only student name - show all matching
-                    placements = list(self.collection.find({
-                        "student_name": {"$regex": student_name, "$options": "i"}
-                    }))
-                else:
-                    # Only company name
-                    placements = list(self.collection.find({
-                        "company_name": {"$regex": company_name, "$options": "i"}
-                    }))
-
-                if not placements:
-                    ctk.CTkLabel(self.edit_placed_form_frame, text="❌ No placement records found",
-                                 font=("Arial", 12), text_color=COLORS["error"]).pack(pady=20)
-                    return
+        # Build query based on inputs - whichever fields were filled must match
+        query = build_search_query("placed_student", {"student_name": student_name, "company_name": company_name})
 
-                if len(placements) == 1:
-                    # Single result - show edit form directly
-                    self.show_edit_placed_student_form(placements[0])
-                else:
-                    # Multiple results - show list to select
-                    ctk.CTkLabel(self.edit_placed_form_frame, 
-                                 text=f"📋 Found {len(placements)} records - Click to edit:",
-                                 font=("Arial", 12, "bold"), text_color=COLORS["info"]).pack(pady=5)
+        async_db.submit(self.edit_placed_form_frame, self.find_all, query,
+                        on_success=self.show_placements_for_edit,
+                        on_error=lambda e: messagebox.showerror("Error", f"Failed to search placed student: {e}"),
+                        key="placed_edit_search", busy=self.connecting())
 
-                    for placed in placements:
-                        row = ctk.CTkFrame(self.edit_placed_form_frame, fg_color=COLORS["section_frame"], corner_radius=8)
-                        row.pack(fill='x', padx=5, pady=2)
+    def show_placements_for_edit(self, placements):
+        if not placements:
+            ctk.CTkLabel(self.edit_placed_form_frame, text="❌ No placement records found",
+                         font=("Arial", 12), text_color=COLORS["error"]).pack(pady=20)
+            return
 
-                        info = f"👤 {placed.get('student_name', 'N/A')}  |  🏢 {placed.get('company_name', 'N/A')}  |  📚 {placed.get('student_branch', 'N/A')}  |  💰 {placed.get('package', 'N/A')}"
-                        ctk.CTkLabel(row, text=info, font=("Arial", 10)).pack(side='left', padx=10, pady=5)
+        if len(placements) == 1:
+            # Single result - show edit form directly
+            self.show_edit_placed_student_form(placements[0])
+        else:
+            # Multiple results - show list to select
+            ctk.CTkLabel(self.edit_placed_form_frame, 
+                         text=f"📋 Found {len(placements)} records - Click to edit:",
+                         font=("Arial", 12, "bold"), text_color=COLORS["info"]).pack(pady=5)
 
-                        ctk.CTkButton(row, text="✏️ EDIT", command=lambda p=placed: self.show_edit_placed_student_form(p),
-                                      fg_color=COLORS["warning"], font=("Arial", 10, "bold"), 
-                                      height=28, width=70).pack(side='right', padx=5, pady=3)
-            else:
-                messagebox.showerror("Error", "Database connection failed")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to search placed student: {e}")
+            for placed in placements:
+                row = ctk.CTkFrame(self.edit_placed_form_frame, fg_color=COLORS["section_frame"], corner_radius=8)
+                row.pack(fill='x', padx=5, pady=2)
+
+                info = f"👤 {placed.get('student_name', 'N/A')}  |  🏢 {placed.get('company_name', 'N/A')}  |  📚 {placed.get('student_branch', 'N/A')}  |  💰 {placed.get('package', 'N/A')}"
+                ctk.CTkLabel(row, text=info, font=("Arial", 10)).pack(side='left', padx=10, pady=5)
+
+                ctk.CTkButton(row, text="✏️ EDIT", command=lambda p=placed: self.show_edit_placed_student_form(p),
+                              fg_color=COLORS["warning"], font=("Arial", 10, "bold"), 
+                              height=28, width=70).pack(side='right', padx=5, pady=3)
 
     def show_edit_placed_student_form(self, placed_student):
         # Clear previous form
@@ -1513,31 +1491,41 @@ class PlacedStudentManager:
             "contact_info": self.edit_placed_contact_info_var.get(),
             "hr_name": self.edit_placed_hr_name_var.get().upper(),
             "package": self.edit_placed_package_var.get().upper(),
+            "package_lpa": parse_package_lpa(self.edit_placed_package_var.get()),
             "address": self.edit_placed_address_var.get().upper(),
             # New fields
             "placement_suggestion": self.edit_placement_suggestion_var.get().upper(),
             "company_levels": self.edit_company_levels_var.get().upper(),
             "skills_required": self.edit_skills_required_var.get().upper(),
-            "important_suggestions": self.edit_important_suggestions_var.get().upper()
+            "important_suggestions": self.edit_important_suggestions_var.get().upper(),
+            SCHEMA_VERSION_FIELD: SCHEMA_VERSIONS["placed_student"]
         }
 
-        try:
-            if self.collection is not None:
-                self.collection.update_one(
-                    {"_id": self.current_edit_placed_id},
-                    {"$set": updated_data}
-                )
-                messagebox.showinfo("Success", "Placed student record updated successfully!")
-                # Clear edit form
-                for widget in self.edit_placed_form_frame.winfo_children():
-                    widget.destroy()
-                self.edit_placed_search_var.set("")
-                self.edit_placed_company_var.set("")
-            else:
-                messagebox.showerror("Error", "Database connection failed")
-        except Exception as e:
+        def on_updated(_):
+            cache_sync.notify_write("placed_student")
+            messagebox.showinfo("Success", "Placed student record updated successfully!")
+            # Clear edit form
+            for widget in self.edit_placed_form_frame.winfo_children():
+                widget.destroy()
+            self.edit_placed_search_var.set("")
+            self.edit_placed_company_var.set("")
+
+        def save_update(placed_id):
+            with_student_id(updated_data)
+            return local_store.write_through(
+                "placed_student", {"_id": placed_id}, stats_counters.update_one, self.writer(), "placed_student", {"_id": placed_id},
+                with_updated_at({"$set": with_search_tokens("placed_student", updated_data)})
+            )
+
+        def on_error(e):
+            if isinstance(e, DuplicateKeyError):
+                messagebox.showerror("Duplicate Found", "This student already has a placement record for this company.")
+                return
             messagebox.showerror("Error", f"Failed to update placed student: {e}")
 
+        async_db.submit(self.edit_placed_form_frame, save_update, self.current_edit_placed_id,
+                        on_success=on_updated, on_error=on_error, busy=self.connecting())
+
     def setup_delete_placed_student_tab(self, tab):
         # Title
         title_label = ctk.CTkLabel(tab, text="🗑️ DELETE PLACED STUDENT",
@@ -1582,436 +1570,128 @@ class PlacedStudentManager:
             messagebox.showerror("Error", "Please enter at least Student Name or Company Name")
             return
 
-        try:
-            if self.collection is not None:
-                # Build query
-                query_conditions = []
-                if student_name:
-                    query_conditions.append({"student_name": {"$regex": student_name, "$options": "i"}})
-                if company_name:
-                    query_conditions.append({"company_name": {"$regex": company_name, "$options": "i"}})
-
-                if len(query_conditions) == 2:
-                    query = {"$and": query_conditions}
-                else:
-                    query = query_conditions[0]
+        # Build query
+        query = build_search_query("placed_student", {"student_name": student_name, "company_name": company_name})
 
-                placed_students = list(self.collection.find(query))
+        async_db.submit(self.delete_placed_results_frame, self.find_all, query, busy=self.connecting(),
+                        on_success=self.show_placements_for_delete,
+                        on_error=lambda e: messagebox.showerror("Error", f"Search failed: {e}"),
+                        key="placed_delete_search")
 
-                # Clear previous results efficiently
-                batch_clear_widgets(self.delete_placed_results_frame)
-
-                if not placed_students:
-                    ctk.CTkLabel(self.delete_placed_results_frame,
-                                 text="❌ No placement records found matching criteria",
-                                 font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
-                    return
+    def show_placements_for_delete(self, placed_students):
+        # Clear previous results efficiently
+        batch_clear_widgets(self.delete_placed_results_frame)
 
-                # Display found records - compact horizontal layout
-                for placed in placed_students:
-                    placed_card = ctk.CTkFrame(self.delete_placed_results_frame, fg_color=COLORS["section_frame"],
-                                               corner_radius=8)
-                    placed_card.pack(fill='x', padx=5, pady=3)
-
-                    info_row = ctk.CTkFrame(placed_card, fg_color=COLORS["section_frame"])
-                    info_row.pack(fill='x', padx=10, pady=5)
-
-                    ctk.CTkLabel(info_row, text=f"👤 {placed['student_name']}", font=("Arial", 11, "bold"),
-                                 width=150).pack(side='left', padx=3)
-                    ctk.CTkLabel(info_row, text=f"🏢 {placed['company_name']}", font=("Arial", 11),
-                                 width=150).pack(side='left', padx=3)
-                    ctk.CTkLabel(info_row, text=f"📚 {placed['student_branch']}", font=("Arial", 11),
-                                 width=80).pack(side='left', padx=3)
-                    ctk.CTkLabel(info_row, text=f"💰 {placed['package']}", font=("Arial", 11),
-                                 width=100).pack(side='left', padx=3)
-                    ctk.CTkLabel(info_row, text=f"👔 {placed['hr_name']}", font=("Arial", 11),
-                                 width=120).pack(side='left', padx=3)
-
-                    ctk.CTkButton(info_row, text="🗑️ DELETE",
-                                  command=lambda p=placed: self.confirm_delete_placed_student(p),
-                                  fg_color=COLORS["error"], font=("Arial", 10, "bold"), height=28, width=80).pack(side='right', padx=5)
+        if not placed_students:
+            ctk.CTkLabel(self.delete_placed_results_frame,
+                         text="❌ No placement records found matching criteria",
+                         font=("Arial", 14), text_color=COLORS["error"]).pack(pady=20)
+            return
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed: {e}")
+        # Display found records - compact horizontal layout
+        for placed in placed_students:
+            placed_card = ctk.CTkFrame(self.delete_placed_results_frame, fg_color=COLORS["section_frame"],
+                                       corner_radius=8)
+            placed_card.pack(fill='x', padx=5, pady=3)
+
+            info_row = ctk.CTkFrame(placed_card, fg_color=COLORS["section_frame"])
+            info_row.pack(fill='x', padx=10, pady=5)
+
+            ctk.CTkLabel(info_row, text=f"👤 {placed['student_name']}", font=("Arial", 11, "bold"),
+                         width=150).pack(side='left', padx=3)
+            ctk.CTkLabel(info_row, text=f"🏢 {placed['company_name']}", font=("Arial", 11),
+                         width=150).pack(side='left', padx=3)
+            ctk.CTkLabel(info_row, text=f"📚 {placed['student_branch']}", font=("Arial", 11),
+                         width=80).pack(side='left', padx=3)
+            ctk.CTkLabel(info_row, text=f"💰 {placed['package']}", font=("Arial", 11),
+                         width=100).pack(side='left', padx=3)
+            ctk.CTkLabel(info_row, text=f"👔 {placed['hr_name']}", font=("Arial", 11),
+                         width=120).pack(side='left', padx=3)
+
+            ctk.CTkButton(info_row, text="🗑️ DELETE",
+                          command=lambda p=placed: self.confirm_delete_placed_student(p),
+                          fg_color=COLORS["error"], font=("Arial", 10, "bold"), height=28, width=80).pack(side='right', padx=5)
 
     def confirm_delete_placed_student(self, placed):
         """Confirm and delete placed student record"""
-        if messagebox.askyesno("Confirm Delete",
-                               f"Are you sure you want to delete:\n{placed['student_name']} at {placed['company_name']}?\n\nThis action cannot be undone!"):
-            try:
-                if self.collection is not None:
-                    self.collection.delete_one({"_id": placed["_id"]})
-                    messagebox.showinfo("Success", "Placement record deleted successfully!")
-                    self.delete_placed_search_var.set("")
-                    self.delete_placed_company_var.set("")
-                    # Refresh results efficiently
-                    batch_clear_widgets(self.delete_placed_results_frame)
-                else:
-                    messagebox.showerror("Error", "Database connection failed")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete record: {e}")
+        if not messagebox.askyesno("Confirm Delete",
+                                   f"Are you sure you want to delete:\n{placed['student_name']} at {placed['company_name']}?\n\nThis action cannot be undone!"):
+            return
+
+        def on_deleted(_):
+            cache_sync.notify_write("placed_student")
+            messagebox.showinfo("Success", "Placement record deleted successfully!")
+            self.delete_placed_search_var.set("")
+            self.delete_placed_company_var.set("")
+            # Refresh results efficiently
+            batch_clear_widgets(self.delete_placed_results_frame)
+
+        async_db.submit(self.delete_placed_results_frame, lambda: local_store.delete_through(
+                            "placed_student", stats_counters.delete_one, self.writer(), "placed_student",
+                            {"_id": placed["_id"]}),
+                        on_success=on_deleted, busy=self.connecting(),
+                        on_error=lambda e: messagebox.showerror("Error", f"Failed to delete record: {e}"))
+
+    def placed_export_source(self):
+        """(rows, count) for exports - the page on screen when paged, else a cursor over the whole search
+
+        count() is called on the worker thread.
+        """
+        if self.placed_table_paged:
+            docs = list(self.current_placements)
+            return docs, lambda: len(docs)
+        return self.placed_pager.cursor(batch_size=EXPORT_CHUNK_SIZE), self.placed_pager.count
 
     def export_placed_students_excel(self):
         """Export placed students to Excel file"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from datetime import datetime
-
-            # Get placements from stored data
-            if not hasattr(self, 'current_placements') or not self.current_placements:
-                messagebox.showwarning("No Data", "No placements to export. Please search first.")
-                return
-
-            placements = self.current_placements
-
-            # Create workbook
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Placements"
-
-            # Add headers
-            headers = ["Student Name", "Branch", "Company", "Package", "HR Name", "Contact", "Email", "Address", "Offer Letter", "Placement Suggestion", "Company Levels", "Skills Required", "Important Notes"]
-            ws.append(headers)
-
-            # Style header
-            header_fill = PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            # Add data
-            for placement in placements:
-                pdf_key = placement.get("offer_letter_pdf_key")
-                offer_letter_status = "No"
-                if pdf_key and self.verify_offer_letter_exists(pdf_key):
-                    offer_letter_status = "Yes"
-                elif pdf_key:
-                    offer_letter_status = "Missing"
-                
-                ws.append([
-                    placement.get("student_name", ""),
-                    placement.get("student_branch", ""),
-                    placement.get("company_name", ""),
-                    placement.get("package", ""),
-                    placement.get("hr_name", ""),
-                    placement.get("contact_info", ""),
-                    placement.get("email", ""),
-                    placement.get("address", ""),
-                    offer_letter_status,
-                    placement.get("placement_suggestion", ""),
-                    placement.get("company_levels", ""),
-                    placement.get("skills_required", ""),
-                    placement.get("important_suggestions", "")
-                ])
-
-            # Adjust column widths
-            ws.column_dimensions['A'].width = 25
-            ws.column_dimensions['B'].width = 15
-            ws.column_dimensions['C'].width = 25
-            ws.column_dimensions['D'].width = 15
-            ws.column_dimensions['E'].width = 20
-            ws.column_dimensions['F'].width = 15
-            ws.column_dimensions['G'].width = 25
-            ws.column_dimensions['H'].width = 30
-            ws.column_dimensions['I'].width = 15
-            ws.column_dimensions['J'].width = 25
-            ws.column_dimensions['K'].width = 20
-            ws.column_dimensions['L'].width = 30
-            ws.column_dimensions['M'].width = 30
-            ws.column_dimensions['H'].width = 30
-
-            # Open Save As dialog
-            from tkinter import filedialog
-            default_filename = f"placements_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                initialfile=default_filename,
-                title="Save Placements As"
-            )
-            
-            if not filename:  # User cancelled
-                return
-                
-            wb.save(filename)
-            messagebox.showinfo("Success", f"Placements exported to:\n{filename}")
-        except ImportError:
-            messagebox.showerror("Error", "openpyxl library not installed. Install it using: pip install openpyxl")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export to Excel: {e}")
+        # Get placements from stored data
+        if not hasattr(self, 'current_placements') or not self.current_placements:
+            messagebox.showwarning("No Data", "No placements to export. Please search first.")
+            return
 
-    def export_placed_students_csv(self):
-        """Export placed students to CSV file"""
-        try:
-            import csv
-            from datetime import datetime
-            from tkinter import filedialog
+        rows, count = self.placed_export_source()
 
-            # Get placements from stored data
-            if not hasattr(self, 'current_placements') or not self.current_placements:
-                messagebox.showwarning("No Data", "No placements to export. Please search first.")
-                return
+        def write(filename, job):
+            job.total = count()
+            # Offer letters are verified with one batched lookup per chunk
+            return write_table(filename, "Placements", PLACED_EXPORT_COLUMNS, rows, job,
+                               prepare=self.mark_offer_letters)
 
-            placements = self.current_placements
+        excel_exporter.export(self.placed_results_frame, "placements", "Save Placements As", write,
+                              "Placements exported")
 
-            # Open Save As dialog
-            default_filename = f"placements_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                initialfile=default_filename,
-                title="Save Placements As"
-            )
-            
-            if not filename:  # User cancelled
-                return
-
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ["Student Name", "Branch", "Company", "Package", "HR Name", "Contact", "Email", "Address", 
-                             "Offer Letter", "Placement Suggestion", "Company Levels", "Skills Required", "Important Notes"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                for placement in placements:
-                    pdf_key = placement.get("offer_letter_pdf_key")
-                    offer_letter_status = "No"
-                    if pdf_key and self.verify_offer_letter_exists(pdf_key):
-                        offer_letter_status = "Yes"
-                    elif pdf_key:
-                        offer_letter_status = "Missing"
-                    
-                    writer.writerow({
-                        "Student Name": placement.get("student_name", ""),
-                        "Branch": placement.get("student_branch", ""),
-                        "Company": placement.get("company_name", ""),
-                        "Package": placement.get("package", ""),
-                        "HR Name": placement.get("hr_name", ""),
-                        "Contact": placement.get("contact_info", ""),
-                        "Email": placement.get("email", ""),
-                        "Address": placement.get("address", ""),
-                        "Offer Letter": offer_letter_status,
-                        "Placement Suggestion": placement.get("placement_suggestion", ""),
-                        "Company Levels": placement.get("company_levels", ""),
-                        "Skills Required": placement.get("skills_required", ""),
-                        "Important Notes": placement.get("important_suggestions", "")
-                    })
-
-            messagebox.showinfo("Success", f"Placements exported to:\n{filename}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export to CSV: {e}")
+    def export_placed_students_csv(self):
+        """Export placed students to CSV - streamed from the database, not the rows loaded in the table"""
+        pager = getattr(self, 'placed_pager', None)
+        # The last search's query and order, or every placement when nothing has been searched yet
+        query = pager.filter if pager is not None else {}
+        sort = [(pager.field, pager.direction)] if pager is not None else [("_id", -1)]
+        csv_exporter.export_query(self.placed_results_frame, "placements", "Save Placements As",
+                                  self.writer, query, PLACED_EXPORT_COLUMNS, "Placements exported", sort=sort,
+                                  prepare=self.mark_offer_letters, extra_fields=("offer_letter_pdf_key",))
 
     def export_placed_charts_to_excel(self):
         """Export placement chart data to Excel with charts"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-            from openpyxl.chart import PieChart, BarChart, Reference
-            from openpyxl.chart.label import DataLabelList
-            from datetime import datetime
-            from tkinter import filedialog
-
-            if not hasattr(self, 'current_chart_data') or not self.current_chart_data:
-                messagebox.showwarning("No Data", "No chart data to export. Please load charts first.")
-                return
-
-            placements = self.current_chart_data.get('placements', [])
-            if not placements:
-                messagebox.showwarning("No Data", "No placement data to export.")
-                return
-
-            # Open Save As dialog
-            default_filename = f"placement_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                initialfile=default_filename,
-                title="Save Placement Analytics As"
-            )
-
-            if not filename:  # User cancelled
-                return
-
-            # Create workbook
-            wb = openpyxl.Workbook()
-
-            # Styles
-            header_fill = PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=12)
-            thin_border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
+        if not hasattr(self, 'current_chart_data') or not self.current_chart_data:
+            messagebox.showwarning("No Data", "No chart data to export. Please load charts first.")
+            return
 
-            # ========== Sheet 1: Placements by Branch (Pie Chart) ==========
-            ws1 = wb.active
-            ws1.title = "Placements by Branch"
-            ws1.append(["Branch", "Number of Placements"])
-
-            branch_labels, branch_counts = self.get_placements_by_branch(placements)
-            for i in range(len(branch_labels)):
-                ws1.append([branch_labels[i], branch_counts[i]])
-
-            for cell in ws1[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            for row in ws1.iter_rows(min_row=2, max_row=ws1.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws1.column_dimensions['A'].width = 20
-            ws1.column_dimensions['B'].width = 22
-
-            # Create Pie Chart
-            if len(branch_labels) > 0:
-                pie_chart = PieChart()
-                pie_chart.title = "Placements by Branch"
-                data = Reference(ws1, min_col=2, min_row=1, max_row=len(branch_labels) + 1)
-                cats = Reference(ws1, min_col=1, min_row=2, max_row=len(branch_labels) + 1)
-                pie_chart.add_data(data, titles_from_data=True)
-                pie_chart.set_categories(cats)
-                pie_chart.dataLabels = DataLabelList()
-                pie_chart.dataLabels.showPercent = True
-                pie_chart.width = 15
-                pie_chart.height = 10
-                ws1.add_chart(pie_chart, "D2")
-
-            # ========== Sheet 2: Placements by Package (Bar Chart) ==========
-            ws2 = wb.create_sheet("Placements by Package")
-            ws2.append(["Package", "Number of Placements"])
-
-            package_labels, package_counts = self.get_placements_by_package(placements)
-            for i in range(len(package_labels)):
-                ws2.append([package_labels[i], package_counts[i]])
-
-            for cell in ws2[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            for row in ws2.iter_rows(min_row=2, max_row=ws2.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws2.column_dimensions['A'].width = 20
-            ws2.column_dimensions['B'].width = 22
-
-            # Create Bar Chart
-            if len(package_labels) > 0:
-                bar_chart = BarChart()
-                bar_chart.title = "Placements by Package"
-                bar_chart.type = "col"
-                bar_chart.style = 10
-                data = Reference(ws2, min_col=2, min_row=1, max_row=len(package_labels) + 1)
-                cats = Reference(ws2, min_col=1, min_row=2, max_row=len(package_labels) + 1)
-                bar_chart.add_data(data, titles_from_data=True)
-                bar_chart.set_categories(cats)
-                bar_chart.dataLabels = DataLabelList()
-                bar_chart.dataLabels.showVal = True
-                bar_chart.width = 15
-                bar_chart.height = 10
-                ws2.add_chart(bar_chart, "D2")
-
-            # ========== Sheet 3: Top Companies (Bar Chart) ==========
-            ws3 = wb.create_sheet("Top Companies")
-            ws3.append(["Company Name", "Number of Placements"])
-
-            company_names, company_counts = self.get_top_companies(placements)
-            for i in range(len(company_names)):
-                ws3.append([company_names[i], company_counts[i]])
-
-            for cell in ws3[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            for row in ws3.iter_rows(min_row=2, max_row=ws3.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws3.column_dimensions['A'].width = 30
-            ws3.column_dimensions['B'].width = 22
-
-            # Create Bar Chart
-            if len(company_names) > 0:
-                bar_chart2 = BarChart()
-                bar_chart2.title = "Top 10 Companies by Placements"
-                bar_chart2.type = "col"
-                bar_chart2.style = 10
-                data = Reference(ws3, min_col=2, min_row=1, max_row=min(len(company_names) + 1, 11))
-                cats = Reference(ws3, min_col=1, min_row=2, max_row=min(len(company_names) + 1, 11))
-                bar_chart2.add_data(data, titles_from_data=True)
-                bar_chart2.set_categories(cats)
-                bar_chart2.dataLabels = DataLabelList()
-                bar_chart2.dataLabels.showVal = True
-                bar_chart2.width = 15
-                bar_chart2.height = 10
-                ws3.add_chart(bar_chart2, "D2")
-
-            # ========== Sheet 4: Placements by HR (Pie Chart) ==========
-            ws4 = wb.create_sheet("Placements by HR")
-            ws4.append(["HR Name", "Number of Placements"])
-
-            hr_names, hr_counts = self.get_placements_by_hr(placements)
-            for i in range(len(hr_names)):
-                ws4.append([hr_names[i], hr_counts[i]])
-
-            for cell in ws4[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = thin_border
-
-            for row in ws4.iter_rows(min_row=2, max_row=ws4.max_row, min_col=1, max_col=2):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            ws4.column_dimensions['A'].width = 25
-            ws4.column_dimensions['B'].width = 22
-
-            # Create Pie Chart
-            if len(hr_names) > 0:
-                pie_chart2 = PieChart()
-                pie_chart2.title = "Placements by HR"
-                data = Reference(ws4, min_col=2, min_row=1, max_row=len(hr_names) + 1)
-                cats = Reference(ws4, min_col=1, min_row=2, max_row=len(hr_names) + 1)
-                pie_chart2.add_data(data, titles_from_data=True)
-                pie_chart2.set_categories(cats)
-                pie_chart2.dataLabels = DataLabelList()
-                pie_chart2.dataLabels.showPercent = True
-                pie_chart2.width = 15
-                pie_chart2.height = 10
-                ws4.add_chart(pie_chart2, "D2")
-
-            # Save file
-            wb.save(filename)
-            
-            # Count charts added
-            chart_count = 0
-            for sheet in wb.sheetnames:
-                ws = wb[sheet]
-                chart_count += len(ws._charts)
-            
-            messagebox.showinfo("Success", 
-                f"Placement analytics exported successfully to:\n{filename}\n\n"
-                f"📊 Charts added: {chart_count}\n"
-                f"📋 Sheets: {len(wb.sheetnames)}")
+        chart_data = self.current_chart_data
+        if not chart_data.get('count'):
+            messagebox.showwarning("No Data", "No placement data to export.")
+            return
 
-        except ImportError:
-            messagebox.showerror("Error", "openpyxl library not installed. Install it using: pip install openpyxl")
-        except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            messagebox.showerror("Error", f"Failed to export to Excel: {e}\n\nDetails:\n{error_details[:500]}")
+        sheets = [
+            chart_sheet("Placements by Branch", ["Branch", "Number of Placements"],
+                        list(zip(*chart_data['branches'])), "pie", "Placements by Branch", [20, 22]),
+            chart_sheet("Placements by Package", ["Package", "Number of Placements"],
+                        list(zip(*chart_data['packages'])), "col", "Placements by Package", [20, 22]),
+            chart_sheet("Top Companies", ["Company Name", "Number of Placements"],
+                        list(zip(*chart_data['top_companies'])), "col", "Top 10 Companies by Placements",
+                        [30, 22], max_rows=10),
+            chart_sheet("Placements by HR", ["HR Name", "Number of Placements"],
+                        list(zip(*chart_data['hr_names'])), "pie", "Placements by HR", [25, 22]),
+        ]
+        excel_exporter.export(self.placed_charts_parent, "placement_analytics", "Save Placement Analytics As",
+                              lambda filename, job: write_chart_sheets(filename, sheets, job),
+                              "Placement analytics exported successfully")
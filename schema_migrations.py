@@ -0,0 +1,112 @@
+"""
+Schema Versions - steps that rewrite legacy document shapes to the canonical schema
+"""
+
+from package_utils import parse_package_lpa
+from search_utils import SEARCH_TOKENS_FIELD, search_tokens
+
+SCHEMA_VERSION_FIELD = "schema_version"
+
+# Flat student fields that older records keep under personal_info
+STUDENT_FLAT_FIELDS = ("name", "branch", "admission_year")
+
+
+def _rename(doc, old, new, sets, unsets):
+    if old in doc:
+        if doc.get(new) in (None, ""):
+            sets[new] = doc[old]
+        unsets.append(old)
+
+
+def company_v1(doc):
+    """company_Name -> company_name, contact_no -> contact_info, plus package_lpa"""
+    sets, unsets = {}, []
+    _rename(doc, "company_Name", "company_name", sets, unsets)
+    _rename(doc, "contact_no", "contact_info", sets, unsets)
+    if "package_lpa" not in doc:
+        sets["package_lpa"] = parse_package_lpa(doc.get("package"))
+    return sets, unsets
+
+
+def placed_student_v1(doc):
+    """package_lpa on every placement"""
+    sets = {}
+    if "package_lpa" not in doc:
+        sets["package_lpa"] = parse_package_lpa(doc.get("package"))
+    return sets, []
+
+
+def student_v1(doc):
+    """Flatten personal_info.name/branch/admission_year and store admission_year as an int"""
+    sets, unsets = {}, []
+    personal_info = doc.get("personal_info")
+    if isinstance(personal_info, dict):
+        for field in STUDENT_FLAT_FIELDS:
+            if field in personal_info:
+                if doc.get(field) in (None, ""):
+                    sets[field] = personal_info[field]
+                unsets.append(f"personal_info.{field}")
+
+    admission_year = sets.get("admission_year", doc.get("admission_year"))
+    if isinstance(admission_year, str) and admission_year.strip().isdigit():
+        sets["admission_year"] = int(admission_year.strip())
+    return sets, unsets
+
+
+def search_tokens_step(collection_name):
+    def step(doc):
+        return {SEARCH_TOKENS_FIELD: search_tokens(collection_name, doc)}, []
+    step.__doc__ = "Rebuild search_tokens from the canonical fields"
+    return step
+
+
+# Ordered (version, step) pairs per collection - append new versions, never edit shipped ones
+MIGRATIONS = {
+    "company": [
+        (1, company_v1),
+        (2, search_tokens_step("company")),
+    ],
+    "placed_student": [
+        (1, placed_student_v1),
+        (2, search_tokens_step("placed_student")),
+    ],
+    "student": [
+        (1, student_v1),
+    ],
+}
+
+SCHEMA_VERSIONS = {name: steps[-1][0] for name, steps in MIGRATIONS.items()}
+
+
+def upgrade(collection_name, doc):
+    """Build the update that brings doc to the latest schema version, or None if it is current"""
+    current = doc.get(SCHEMA_VERSION_FIELD) or 0
+    target = SCHEMA_VERSIONS[collection_name]
+    if current >= target:
+        return None
+
+    doc = dict(doc)
+    sets, unsets = {}, set()
+    for version, step in MIGRATIONS[collection_name]:
+        if version <= current:
+            continue
+        step_sets, step_unsets = step(doc)
+        # Later steps see the result of earlier ones
+        for field in step_unsets:
+            if "." in field:
+                parent, child = field.split(".", 1)
+                if isinstance(doc.get(parent), dict):
+                    doc[parent] = {k: v for k, v in doc[parent].items() if k != child}
+            else:
+                doc.pop(field, None)
+            sets.pop(field, None)
+        doc.update(step_sets)
+        sets.update(step_sets)
+        unsets.update(step_unsets)
+        unsets.difference_update(step_sets)
+
+    sets[SCHEMA_VERSION_FIELD] = target
+    update = {"$set": sets}
+    if unsets:
+        update["$unset"] = {field: "" for field in sorted(unsets)}
+    return update
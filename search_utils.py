@@ -0,0 +1,81 @@
+"""
+Search tokens - indexed prefix search instead of unanchored case-insensitive regex
+"""
+
+import re
+
+SEARCH_TOKENS_FIELD = "search_tokens"
+
+# Searchable keys per collection and the document fields they cover
+SEARCH_FIELDS = {
+    "company": {
+        "company_name": ("company_name",),
+        "email": ("email",),
+        "hr_name": ("hr_name",),
+        "contact_info": ("contact_info",),
+    },
+    "placed_student": {
+        "student_name": ("student_name",),
+        "company_name": ("company_name",),
+        "student_branch": ("student_branch",),
+        "hr_name": ("hr_name",),
+    },
+}
+
+# Phone numbers are searched as one run of digits ("98765 43210" == "9876543210")
+DIGIT_KEYS = {"contact_info"}
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_DIGIT_RE = re.compile(r'\D')
+
+
+def tokenize(value, key=None):
+    """Split a value into lower-cased alphanumeric tokens"""
+    if value is None:
+        return []
+    text = str(value).lower()
+    if key in DIGIT_KEYS:
+        digits = _DIGIT_RE.sub("", text)
+        return [digits] if digits else []
+    return _TOKEN_RE.findall(text)
+
+
+def search_tokens(collection_name, doc):
+    """All "key:token" entries for a document - stored in SEARCH_TOKENS_FIELD with a multikey index"""
+    tokens = set()
+    for key, fields in SEARCH_FIELDS[collection_name].items():
+        for field in fields:
+            for token in tokenize(doc.get(field), key):
+                tokens.add(f"{key}:{token}")
+    return sorted(tokens)
+
+
+def with_search_tokens(collection_name, doc):
+    """Set SEARCH_TOKENS_FIELD on a document about to be inserted or $set (modifies doc in place)"""
+    doc[SEARCH_TOKENS_FIELD] = search_tokens(collection_name, doc)
+    return doc
+
+
+def search_condition(collection_name, key, value):
+    """Query condition matching documents whose key field has a word starting with each word of value
+
+    Anchored, case-sensitive regexes on the lower-cased tokens are answered from the index bounds.
+    Input with no alphanumerics falls back to an escaped regex over the raw fields.
+    """
+    tokens = tokenize(value, key)
+    if not tokens:
+        pattern = re.escape(str(value))
+        fields = SEARCH_FIELDS[collection_name][key]
+        conditions = [{field: {"$regex": pattern, "$options": "i"}} for field in fields]
+        return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
+    conditions = [{SEARCH_TOKENS_FIELD: {"$regex": f"^{re.escape(f'{key}:{token}')}"}} for token in tokens]
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def build_search_query(collection_name, filters):
+    """Combine {key: value} search box values into one query (empty values are ignored)"""
+    conditions = [search_condition(collection_name, key, value) for key, value in filters.items() if value]
+    if not conditions:
+        return {}
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
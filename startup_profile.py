@@ -0,0 +1,59 @@
+"""
+Startup Profile - per-phase cold start timings, printed by python main.py --startup-profile
+"""
+
+import threading
+import time
+
+# Phases reported once all of them have finished, in this order
+STARTUP_PHASES = ("imports", "tk_init", "login_screen", "first_paint", "db_handshake")
+
+
+class StartupProfile:
+    """Records when each start-up phase began and ended, in seconds since main.py started.
+
+    Phases may overlap - the DB handshake runs on a background thread while the login screen is
+    built and painted. Nothing is printed unless enabled.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self._phases = {}  # phase -> [start, end, note]
+        self._lock = threading.Lock()
+        self._reported = False
+
+    def _now(self):
+        return time.perf_counter() - self.started
+
+    def begin(self, phase):
+        with self._lock:
+            self._phases[phase] = [self._now(), None, ""]
+
+    def end(self, phase, note=""):
+        """Finish phase (started at launch if begin() was never called) - thread safe"""
+        with self._lock:
+            entry = self._phases.setdefault(phase, [0.0, None, ""])
+            entry[1], entry[2] = self._now(), note
+            done = all(self._phases.get(name, [0, None])[1] is not None for name in STARTUP_PHASES)
+        if done:
+            self.report()
+
+    def report(self):
+        with self._lock:
+            if not self.enabled or self._reported:
+                return
+            self._reported = True
+            phases = dict(self._phases)
+        print("⏱️ Startup profile (seconds since launch)")
+        for phase in sorted(phases, key=lambda name: phases[name][0]):
+            start, end, note = phases[phase]
+            if end is None:
+                print(f"  {phase:<14} {start:7.3f} →     ...")
+                continue
+            suffix = f"  {note}" if note else ""
+            print(f"  {phase:<14} {start:7.3f} → {end:7.3f}  ({end - start:.3f}s){suffix}")
+
+
+# Create global startup profile instance
+startup_profile = StartupProfile()
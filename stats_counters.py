@@ -0,0 +1,284 @@
+"""
+Stats Counters - pre-aggregated dashboard and chart counters kept in step with every write
+"""
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import PyMongoError
+from database_config import db_manager
+from package_utils import package_lpa_of, package_bucket, package_bucket_expr
+from unique_writes import insert_unless_exists
+
+SUMMARY_ID = "summary"
+UNKNOWN = "Unknown"
+KEYED_TOP = 20  # Largest keys read back per keyed counter - the charts show at most 10
+
+# Per collection: total field, then counter map -> the document value it counts by.
+# Every map has a handful of keys, so they all fit in the one summary document.
+COUNTERS = {
+    "company": ("company_total", {
+        "company_sectors": lambda doc: doc.get("sector"),
+        "company_package_buckets": lambda doc: package_bucket(package_lpa_of(doc)),
+    }),
+    "placed_student": ("placement_total", {
+        "placed_branches": lambda doc: doc.get("student_branch"),
+        "placed_batches": lambda doc: doc.get("batch"),
+        "placed_package_buckets": lambda doc: package_bucket(package_lpa_of(doc)),
+    }),
+}
+
+# Per collection: counter -> the field it counts by. These grow with every new company or HR
+# name, so each key is its own {counter, key, count} document instead of a summary field.
+KEYED_COUNTERS = {
+    "company": {"company_hr": "hr_name"},
+    "placed_student": {"placed_companies": "company_name", "placed_hr": "hr_name"},
+}
+
+# Server-side equivalent of each summary map, for the facet fallback
+COUNTER_EXPRESSIONS = {
+    "company_sectors": "$sector",
+    "company_package_buckets": package_bucket_expr(),
+    "placed_branches": "$student_branch",
+    "placed_batches": "$batch",
+    "placed_package_buckets": package_bucket_expr(),
+}
+
+# Projection covering every field the counters read
+COUNTER_FIELDS = {
+    "company": {"sector": 1, "package": 1, "package_lpa": 1, "hr_name": 1},
+    "placed_student": {"student_branch": 1, "batch": 1, "package": 1, "package_lpa": 1,
+                       "company_name": 1, "hr_name": 1},
+}
+
+
+def _text(value):
+    return str(value) if value not in (None, "") else UNKNOWN
+
+
+def _encode(value):
+    # Counter names are field names - "." would nest and a leading "$" is rejected
+    return _text(value).replace(".", "．").replace("$", "＄")
+
+
+def _decode(key):
+    return key.replace("．", ".").replace("＄", "$")
+
+
+def _keyed_id(counter, key):
+    return f"{counter}:{key}"
+
+
+def top_counts(counts, limit=None):
+    """(labels, values) of a counter map, largest first - ["No Data"] when empty"""
+    items = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+    if not items:
+        return (["No Data"], [0])
+    return ([label for label, _ in items], [value for _, value in items])
+
+
+class StatsCounters:
+    """One small summary document in the stats collection, updated with $inc on every write.
+
+    Counters are only incremented once the summary exists. Until migrations.py rebuild-stats has
+    seeded it, summary() answers with a $facet aggregation instead; rebuild-stats also repairs any
+    drift left by a write whose counter update failed.
+    """
+
+    def __init__(self):
+        self._missing_reported = False
+
+    def contributions(self, collection_name, doc):
+        """{counter path: 1} for everything one document adds - (counter, key) for keyed counters"""
+        if doc is None:
+            return {}
+        total, maps = COUNTERS[collection_name]
+        paths = {total: 1}
+        for field, value_of in maps.items():
+            paths[f"{field}.{_encode(value_of(doc))}"] = 1
+        for counter, field in KEYED_COUNTERS[collection_name].items():
+            paths[(counter, _text(doc.get(field)))] = 1
+        return paths
+
+    def delta(self, collection_name, before, after):
+        """The difference between a document's old and new contributions"""
+        delta = self.contributions(collection_name, after)
+        for path, count in self.contributions(collection_name, before).items():
+            delta[path] = delta.get(path, 0) - count
+        return {path: count for path, count in delta.items() if count}
+
+    def apply(self, collection_name, before, after):
+        """$inc the difference between a document's old and new contributions"""
+        self._inc(self.delta(collection_name, before, after))
+
+    def apply_many(self, collection_name, changes):
+        """apply() for a list of (before, after) pairs, in one summary and one keyed update"""
+        total = {}
+        for before, after in changes:
+            for path, count in self.delta(collection_name, before, after).items():
+                total[path] = total.get(path, 0) + count
+        self._inc({path: count for path, count in total.items() if count})
+
+    def _inc(self, delta):
+        if not delta:
+            return
+        stats = db_manager.get_stats_collection()
+        if stats is None:
+            return
+        summary = {path: count for path, count in delta.items() if not isinstance(path, tuple)}
+        keyed = [(path, count) for path, count in delta.items() if isinstance(path, tuple)]
+        try:
+            if summary and not stats.update_one({"_id": SUMMARY_ID}, {"$inc": summary}).matched_count:
+                return  # Not built yet - rebuild-stats seeds the keyed counters as well
+            if keyed:
+                stats.bulk_write([
+                    UpdateOne({"_id": _keyed_id(counter, key)},
+                              {"$inc": {"count": count}, "$setOnInsert": {"counter": counter, "key": key}},
+                              upsert=True)
+                    for (counter, key), count in keyed
+                ], ordered=False)
+                emptied = [_keyed_id(counter, key) for (counter, key), count in keyed if count < 0]
+                if emptied:
+                    stats.delete_many({"_id": {"$in": emptied}, "count": {"$lte": 0}})
+        except PyMongoError as e:
+            print(f"⚠️ Stats counters not updated ({e}) - run: python migrations.py rebuild-stats")
+
+    # ---- writes that keep the counters in step ----
+
+    def insert_unless_exists(self, collection, collection_name, doc):
+        """unique_writes.insert_unless_exists, counting the document when it was inserted"""
+        existing = insert_unless_exists(collection, collection_name, doc)
+        if existing is None:
+            self.apply(collection_name, None, doc)
+        return existing
+
+    def update_one(self, collection, collection_name, query, update):
+        """Apply a $set update and move the counters; returns the document as it was"""
+        before = collection.find_one_and_update(query, update, return_document=ReturnDocument.BEFORE)
+        if before is not None:
+            self.apply(collection_name, before, dict(before, **update.get("$set", {})))
+        return before
+
+    def delete_one(self, collection, collection_name, query):
+        """Delete a document and take it off the counters; returns the deleted document"""
+        before = collection.find_one_and_delete(query)
+        if before is not None:
+            self.apply(collection_name, before, None)
+        return before
+
+    # ---- reads ----
+
+    def _count(self, collection_name, docs):
+        """(summary fields, {keyed counter: {key: count}}) for docs"""
+        total, maps = COUNTERS[collection_name]
+        summary = {total: 0, **{field: {} for field in maps}}
+        keyed = {counter: {} for counter in KEYED_COUNTERS[collection_name]}
+        for doc in docs:
+            summary[total] += 1
+            for field, value_of in maps.items():
+                key = _encode(value_of(doc))
+                summary[field][key] = summary[field].get(key, 0) + 1
+            for counter, field in KEYED_COUNTERS[collection_name].items():
+                key = _text(doc.get(field))
+                keyed[counter][key] = keyed[counter].get(key, 0) + 1
+        return summary, keyed
+
+    def summarize(self, collection_name, docs):
+        """Summary-shaped counters for a list of documents - used by the filtered charts"""
+        summary, keyed = self._count(collection_name, docs)
+        decoded = self.decode(summary)
+        decoded.update(keyed)
+        return decoded
+
+    def read(self):
+        """The decoded summary with the top KEYED_TOP keys per keyed counter, or None when not built yet"""
+        stats = db_manager.get_stats_collection()
+        if stats is None:
+            return None
+        doc = stats.find_one({"_id": SUMMARY_ID})
+        if doc is None:
+            return None
+        summary = self.decode(doc)
+        for counters in KEYED_COUNTERS.values():
+            for counter in counters:
+                # Indexed: counter_count
+                rows = (stats.find({"counter": counter, "count": {"$gt": 0}}, {"key": 1, "count": 1})
+                        .sort([("count", -1)]).limit(KEYED_TOP))
+                summary[counter] = {row["key"]: row["count"] for row in rows}
+        return summary
+
+    @staticmethod
+    def decode(summary):
+        decoded = {}
+        for field, value in summary.items():
+            if isinstance(value, dict):
+                decoded[field] = {_decode(key): count for key, count in value.items() if count > 0}
+            elif field != "_id":
+                decoded[field] = value
+        return decoded
+
+    def aggregate(self):
+        """Summary-shaped counters from one $facet aggregation per collection (None if offline)"""
+        summary = {}
+        for collection_name, (total, maps) in COUNTERS.items():
+            collection = db_manager.get_collection(collection_name)
+            if collection is None:
+                return None
+            facets = {total: [{"$count": "n"}]}
+            for field in maps:
+                facets[field] = [{"$group": {"_id": COUNTER_EXPRESSIONS[field], "count": {"$sum": 1}}}]
+            for counter, field in KEYED_COUNTERS[collection_name].items():
+                facets[counter] = [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                                   {"$sort": {"count": -1}}, {"$limit": KEYED_TOP}]
+            result = list(collection.aggregate([{"$facet": facets}], allowDiskUse=True))
+            result = result[0] if result else {}
+            summary[total] = result[total][0]["n"] if result.get(total) else 0
+            for field in facets:
+                if field == total:
+                    continue
+                summary[field] = {}
+                for row in result.get(field, []):
+                    key = _text(row["_id"])
+                    summary[field][key] = summary[field].get(key, 0) + row["count"]
+        return summary
+
+    def summary(self):
+        """Read the summary, or aggregate it while it has not been built (None if offline)"""
+        try:
+            summary = self.read()
+            if summary is None:
+                if not self._missing_reported:
+                    self._missing_reported = True
+                    print("⚠️ No stats summary yet - aggregating instead; run: python migrations.py rebuild-stats")
+                summary = self.aggregate()
+            return summary
+        except PyMongoError as e:
+            print(f"⚠️ Stats summary unavailable: {e}")
+            return None
+
+    def rebuild(self, batch_size=1000):
+        """Recount everything from the collections and replace the summary and keyed counters"""
+        stats = db_manager.get_stats_collection()
+        if stats is None:
+            return None
+        summary, keyed = {}, {}
+        for collection_name, fields in COUNTER_FIELDS.items():
+            collection = db_manager.get_collection(collection_name)
+            if collection is None:
+                return None
+            counts, keys = self._count(collection_name, collection.find({}, fields).batch_size(batch_size))
+            summary.update(counts)
+            keyed.update(keys)
+
+        stats.delete_many({"counter": {"$exists": True}})
+        for counter, counts in keyed.items():
+            rows = [{"_id": _keyed_id(counter, key), "counter": counter, "key": key, "count": count}
+                    for key, count in counts.items()]
+            for start in range(0, len(rows), batch_size):
+                stats.insert_many(rows[start:start + batch_size], ordered=False)
+        stats.replace_one({"_id": SUMMARY_ID}, summary, upsert=True)
+        print(f"✅ Stats summary rebuilt: {summary['company_total']} companies, "
+              f"{summary['placement_total']} placements")
+        return self.read()
+
+
+# Create global stats counters instance
+stats_counters = StatsCounters()
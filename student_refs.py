@@ -0,0 +1,96 @@
+"""
+Student References - link placements to their student record by _id instead of by name
+"""
+
+from database_config import get_student_collection, COLLECTIONS
+
+STUDENT_ID_FIELD = "student_id"
+
+# Case-insensitive match, same collation as the student name_branch index
+NAME_COLLATION = {"locale": "en", "strength": 2}
+
+
+def _student_key(name, branch):
+    return (str(name or "").strip().upper(), str(branch or "").strip().upper())
+
+
+def find_student_id(student_name, student_branch):
+    """_id of the one student with this name and branch, or None when missing or ambiguous"""
+    student_collection = get_student_collection()
+    if student_collection is None or not student_name:
+        return None
+    query = {"name": student_name.strip()}
+    if student_branch:
+        query["branch"] = student_branch.strip()
+    matches = list(student_collection.find(query, {"_id": 1}, collation=NAME_COLLATION).limit(2))
+    return matches[0]["_id"] if len(matches) == 1 else None
+
+
+def with_student_id(placement):
+    """Set student_id on a placement about to be inserted or $set (modifies placement in place)"""
+    placement[STUDENT_ID_FIELD] = find_student_id(placement.get("student_name"),
+                                                  placement.get("student_branch"))
+    return placement
+
+
+def student_id_map(student_collection, names=None):
+    """{(NAME, BRANCH): _id} for every unambiguous student - used by bulk backfills and imports
+
+    names restricts the map to those student names (matched case-insensitively).
+    """
+    ids = {}
+    if names is None:
+        cursor = student_collection.find({}, {"name": 1, "branch": 1})
+    else:
+        cursor = student_collection.find({"name": {"$in": sorted(names)}}, {"name": 1, "branch": 1},
+                                         collation=NAME_COLLATION)
+    for student in cursor:
+        key = _student_key(student.get("name"), student.get("branch"))
+        ids[key] = None if key in ids else student["_id"]
+    return {key: student_id for key, student_id in ids.items() if student_id is not None}
+
+
+def lookup_student_id(id_map, placement):
+    return id_map.get(_student_key(placement.get("student_name"), placement.get("student_branch")))
+
+
+def batch_placements_pipeline(admission_year, projection, limit=None, branch=None):
+    """Placements of students admitted in admission_year (and placed from branch), newest first.
+
+    Runs on the student collection: the admission_year index narrows the batch, then each
+    student's placements are joined through the placed_student student_id index. Placements
+    link-placement-students has not linked yet are joined by name and branch instead.
+    """
+    pipeline = [
+        # Years stored as strings match too, until python migrations.py normalize-schema has
+        # converted every admission_year to an int
+        {"$match": {"admission_year": {"$in": [int(admission_year), str(admission_year)]}}},
+        {"$project": {"name": {"$toUpper": "$name"}, "branch": {"$toUpper": "$branch"}}},
+        {"$lookup": {
+            "from": COLLECTIONS["placed_student"],
+            "localField": "_id",
+            "foreignField": STUDENT_ID_FIELD,
+            "as": "linked"
+        }},
+        # Unlinked placements (student_id missing or None) through the student_company index
+        {"$lookup": {
+            "from": COLLECTIONS["placed_student"],
+            "localField": "name",
+            "foreignField": "student_name",
+            "let": {"branch": "$branch"},
+            "pipeline": [{"$match": {
+                STUDENT_ID_FIELD: None,
+                "$expr": {"$eq": [{"$toUpper": "$student_branch"}, "$$branch"]}
+            }}],
+            "as": "unlinked"
+        }},
+        {"$project": {"placements": {"$concatArrays": ["$linked", "$unlinked"]}}},
+        {"$unwind": "$placements"},
+        {"$replaceRoot": {"newRoot": "$placements"}},
+        *([{"$match": {"student_branch": branch}}] if branch else []),
+        {"$project": projection},
+        {"$sort": {"_id": -1}},
+    ]
+    if limit:
+        pipeline.append({"$limit": limit})
+    return pipeline
@@ -0,0 +1,50 @@
+"""
+Unique Writes - atomic insert-or-find on natural keys backed by unique indexes
+"""
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# Natural keys per collection, first one is the upsert key; each has a unique index in database_config.INDEXES
+NATURAL_KEYS = {
+    "company": [("company_name",), ("email",)],
+    "placed_student": [("student_name", "company_name")],
+}
+
+
+def key_filter(fields, doc):
+    return {field: doc.get(field) for field in fields}
+
+
+def find_duplicate(collection, collection_name, doc, exclude_id=None):
+    """First existing record sharing any natural key with doc (other than exclude_id)"""
+    for fields in NATURAL_KEYS[collection_name]:
+        query = key_filter(fields, doc)
+        if any(value in (None, "") for value in query.values()):
+            continue
+        if exclude_id is not None:
+            query["_id"] = {"$ne": exclude_id}
+        existing = collection.find_one(query)
+        if existing:
+            return existing
+    return None
+
+
+def insert_unless_exists(collection, collection_name, doc):
+    """Insert doc unless a record with the same natural key exists - one atomic round trip
+
+    Returns None when doc was inserted, otherwise the existing record (doc is not written).
+    """
+    try:
+        return collection.find_one_and_update(
+            key_filter(NATURAL_KEYS[collection_name][0], doc),
+            {"$setOnInsert": doc},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        # Another unique key (e.g. the email) already belongs to a record
+        existing = find_duplicate(collection, collection_name, doc)
+        if existing is None:
+            raise
+        return existing
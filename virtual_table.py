@@ -0,0 +1,353 @@
+"""
+Virtual Treeview - only the visible rows exist as Treeview items, data is paged in on scroll
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+import customtkinter as ctk
+from async_db import async_db
+from utils import COLORS
+
+PAGE_SIZE = 200
+OVERSCAN_ROWS = 3
+PREFETCH_ROWS = 100  # Request the next page when the window gets this close to the loaded end
+
+
+def pager_source(pager, transform=None, single=False):
+    """Build a next_page() callable from a KeysetPager
+
+    transform(page) may enrich each page on the worker thread (e.g. batch lookups).
+    With single=True only the pager's first page is returned - Prev/Next controls move on from there.
+    """
+    state = {"served": False}
+
+    def next_page():
+        if single and state["served"]:
+            return []
+        state["served"] = True
+        page = pager.next_page()
+        if page and transform:
+            page = transform(page)
+        return page
+
+    return next_page
+
+
+class VirtualTreeview:
+    """ttk.Treeview that materializes only the visible window plus a small overscan.
+
+    source_factory(sort) returns a next_page() callable; sort is None or (field, direction).
+    next_page() runs on a worker thread and returns a list of documents, empty when exhausted.
+    format_row(doc, idx) returns (values, tags) for one row.
+    """
+
+    def __init__(self, parent, columns, style, row_height, format_row, source_factory,
+                 sort_fields=None, on_page=None, on_error=None, overscan=OVERSCAN_ROWS):
+        self.format_row = format_row
+        self.source_factory = source_factory
+        self.sort_fields = sort_fields or {}
+        self.on_page = on_page
+        self.on_error = on_error
+        self.row_height = row_height
+        self.overscan = overscan
+
+        self.docs = []
+        self.offset = 0
+        self.exhausted = False
+        self.sort = None
+        self._next_page = None
+        self._loading = False
+        self._inflight = None
+        self._generation = 0
+        self._source_lock = threading.Lock()
+        self._items = []
+        self._selected_key = None
+        self._refreshing = False
+
+        self.frame = tk.Frame(parent, bg="#1e1e1e")
+
+        self.v_scroll = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.v_scroll.pack(side="right", fill="y")
+
+        self.h_scroll = ttk.Scrollbar(self.frame, orient="horizontal")
+        self.h_scroll.pack(side="bottom", fill="x")
+
+        self.tree = ttk.Treeview(
+            self.frame,
+            columns=[col_id for col_id, _, _ in columns],
+            show="headings",
+            style=style,
+            xscrollcommand=self.h_scroll.set
+        )
+        self.h_scroll.config(command=self.tree.xview)
+
+        for col_id, heading, width in columns:
+            self.tree.heading(col_id, text=heading, anchor="center",
+                              command=lambda c=col_id: self.sort_by(c))
+            self.tree.column(col_id, width=width, minwidth=width, anchor="center")
+
+        self.tree.pack(fill='both', expand=True)
+
+        self.tree.bind("<Configure>", lambda e: self.refresh())
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(int(-1*(e.delta/120)) * 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible_rows()))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible_rows()))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+        self._reset_source()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    # ---- data ----
+
+    def _reset_source(self):
+        self._generation += 1
+        self._next_page = self.source_factory(self.sort)
+        self.docs = []
+        self.offset = 0
+        self.exhausted = False
+        self._loading = False
+        self._request_page()
+
+    def _fetch_page(self, next_page):
+        with self._source_lock:
+            return next_page()
+
+    def _request_page(self):
+        if self._loading or self.exhausted:
+            return
+        self._loading = True
+        generation = self._generation
+        self._inflight = async_db.submit(
+            self.tree, self._fetch_page, self._next_page,
+            on_success=lambda page: self._on_page_loaded(page, generation),
+            on_error=lambda e: self._on_page_failed(e, generation)
+        )
+
+    def _on_page_loaded(self, page, generation):
+        if generation != self._generation:
+            return  # Sort changed while this page was in flight
+        self._loading = False
+        if page:
+            self.docs.extend(page)
+        else:
+            self.exhausted = True
+        self.refresh()
+        if self.on_page:
+            self.on_page(self)
+
+    def _on_page_failed(self, error, generation):
+        if generation != self._generation:
+            return
+        self._loading = False
+        self.exhausted = True
+        if self.on_error:
+            self.on_error(error)
+        else:
+            print(f"❌ Error loading table page: {error}")
+
+    def show_page(self, docs):
+        """Replace the rows with one already-fetched page"""
+        self._generation += 1
+        self._loading = False
+        self.docs = list(docs)
+        self.offset = 0
+        self.exhausted = True
+        self.refresh()
+        if self.on_page:
+            self.on_page(self)
+
+    def row_at(self, item):
+        """Document shown in a Treeview item, or None"""
+        if item not in self._items:
+            return None
+        row = self.offset + self._items.index(item)
+        return self.docs[row] if row < len(self.docs) else None
+
+    # ---- sorting and selection ----
+
+    def sort_by(self, col_id):
+        field = self.sort_fields.get(col_id)
+        if not field:
+            return
+        if self.sort and self.sort[0] == field:
+            direction = -self.sort[1]
+        else:
+            direction = 1
+        self.sort = (field, direction)
+        for heading_col, sort_field in self.sort_fields.items():
+            text = self.tree.heading(heading_col, "text").rstrip(" ▲▼")
+            if sort_field == field:
+                text += " ▲" if direction == 1 else " ▼"
+            self.tree.heading(heading_col, text=text)
+        self._reset_source()
+
+    @staticmethod
+    def _doc_key(doc):
+        return doc.get("_id", id(doc))
+
+    def _on_select(self, event=None):
+        if self._refreshing:
+            return
+        # Rows scrolled out of the window keep their selection
+        selection = self.tree.selection()
+        doc = self.row_at(selection[0]) if selection else None
+        if doc is not None:
+            self._selected_key = self._doc_key(doc)
+
+    def _selected_row(self):
+        if self._selected_key is None:
+            return None
+        for row in range(self.offset, min(self.offset + len(self._items), len(self.docs))):
+            if self._doc_key(self.docs[row]) == self._selected_key:
+                return row
+        return None
+
+    def _move_selection(self, delta):
+        row = self._selected_row()
+        row = 0 if row is None else max(0, min(len(self.docs) - 1, row + delta))
+        if not self.docs:
+            return "break"
+        self._selected_key = self._doc_key(self.docs[row])
+        visible = self._visible_rows()
+        if row < self.offset:
+            self.offset = row
+        elif row >= self.offset + visible:
+            self.offset = row - visible + 1
+        self._after_scroll()
+        return "break"
+
+    # ---- windowing ----
+
+    def _visible_rows(self):
+        height = self.tree.winfo_height()
+        # One row's worth of height goes to the heading
+        return max(1, height // self.row_height - 1)
+
+    def scroll(self, rows):
+        self.offset += rows
+        self._after_scroll()
+
+    def _after_scroll(self):
+        max_offset = max(0, len(self.docs) - self._visible_rows())
+        self.offset = max(0, min(self.offset, max_offset))
+        if len(self.docs) - (self.offset + self._visible_rows()) < PREFETCH_ROWS:
+            self._request_page()
+        self.refresh()
+
+    def _on_scrollbar(self, action, *args):
+        total = max(1, len(self.docs))
+        if action == "moveto":
+            self.offset = int(float(args[0]) * total)
+        elif action == "scroll":
+            amount = int(args[0])
+            if args[1] == "pages":
+                amount *= self._visible_rows()
+            self.offset += amount
+        self._after_scroll()
+
+    def refresh(self):
+        """Rewrite the window's Treeview items for the current offset"""
+        needed = max(0, min(self._visible_rows() + self.overscan, len(self.docs) - self.offset))
+
+        while len(self._items) < needed:
+            self._items.append(self.tree.insert("", "end"))
+        while len(self._items) > needed:
+            self.tree.delete(self._items.pop())
+
+        self._refreshing = True
+        try:
+            selected_item = None
+            for i, item in enumerate(self._items):
+                row = self.offset + i
+                doc = self.docs[row]
+                try:
+                    values, tags = self.format_row(doc, row + 1)
+                except Exception as e:
+                    print(f"Error formatting row {row + 1}: {e}")
+                    values, tags = (row + 1,), []
+                row_tags = ["oddrow" if (row + 1) % 2 == 1 else "evenrow"] + list(tags)
+                self.tree.item(item, values=values, tags=row_tags)
+                if self._selected_key is not None and self._doc_key(doc) == self._selected_key:
+                    selected_item = item
+
+            if selected_item:
+                self.tree.selection_set(selected_item)
+            elif self.tree.selection():
+                self.tree.selection_remove(*self.tree.selection())
+        finally:
+            self._refreshing = False
+
+        self.tree.yview_moveto(0)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        # While more pages exist, leave room past the loaded rows so the thumb never hits the bottom
+        total = len(self.docs) + (0 if self.exhausted else PAGE_SIZE)
+        if total == 0:
+            self.v_scroll.set(0, 1)
+            return
+        visible = self._visible_rows()
+        self.v_scroll.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+
+
+class PageNavigator:
+    """Prev/Next controls for a VirtualTreeview that shows one keyset page at a time"""
+
+    def __init__(self, parent, table, get_pager, transform=None):
+        self.table = table
+        self.get_pager = get_pager
+        self.transform = transform
+
+        self.frame = ctk.CTkFrame(parent, fg_color=COLORS["section_frame"])
+        self.prev_button = ctk.CTkButton(self.frame, text="◀ PREV", width=90, height=30,
+                                         font=("Arial", 11, "bold"), fg_color=COLORS["info"],
+                                         command=lambda: self._go(-1))
+        self.prev_button.pack(side='left', padx=5, pady=5)
+        self.page_label = ctk.CTkLabel(self.frame, text="Page 1", font=("Arial", 11, "bold"))
+        self.page_label.pack(side='left', padx=10)
+        self.next_button = ctk.CTkButton(self.frame, text="NEXT ▶", width=90, height=30,
+                                         font=("Arial", 11, "bold"), fg_color=COLORS["info"],
+                                         command=lambda: self._go(1))
+        self.next_button.pack(side='left', padx=5, pady=5)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def update(self):
+        pager = self.get_pager()
+        if pager is None:
+            return
+        self.page_label.configure(text=f"Page {max(1, pager.page_number)}")
+        self.prev_button.configure(state="normal" if pager.has_prev else "disabled")
+        self.next_button.configure(state="normal" if pager.has_next else "disabled")
+
+    def _go(self, step):
+        pager = self.get_pager()
+        if pager is None:
+            return
+        self.prev_button.configure(state="disabled")
+        self.next_button.configure(state="disabled")
+
+        def fetch():
+            page = pager.next_page() if step > 0 else pager.prev_page()
+            if page and self.transform:
+                page = self.transform(page)
+            return page
+
+        def on_loaded(page):
+            if page:
+                self.table.show_page(page)
+            self.update()
+
+        def on_error(e):
+            print(f"❌ Error loading page: {e}")
+            self.update()
+
+        async_db.submit(self.frame, fetch, on_success=on_loaded, on_error=on_error)